@@ -1,6 +1,7 @@
-from src.gui import App
-
 def main():
+    # Imported here, not at module level: image pool workers are spawned and re-run this
+    # module's top level, and must not load Qt/QtWebEngine
+    from src.gui import App
     app = App()
     return app.run()
 
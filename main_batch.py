@@ -0,0 +1,45 @@
+import sys
+import asyncio
+import argparse
+from src.core.settings import Settings
+from src.core.api_client import APIClient
+from src.core.image_processing import shutdown_image_pool
+from src.features.batch import BatchRunner, VisionBatchRunner
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run a JSONL file of prompts (or a folder of images) through the configured provider.")
+    parser.add_argument("input", help="Input JSONL file (one request per line: {\"prompt\": ...} or {\"messages\": [...]}), "
+                                      "or with --vision a directory or glob of images (quote globs, e.g. \"photos/**/*.jpg\")")
+    parser.add_argument("output", help="Output JSONL file. Also used as the checkpoint when resuming.")
+    parser.add_argument("--concurrency", type=int, help="Maximum in-flight requests (default: batch_settings.concurrency)")
+    parser.add_argument("--restart", action="store_true", help="Ignore existing output and start from scratch")
+    parser.add_argument("--vision", action="store_true", help="Analyze every image matched by the input with the vision model")
+    parser.add_argument("--prompt", default="Describe this image.", help="Vision prompt applied to every image (with --vision)")
+    parser.add_argument("--detail", choices=["auto", "low", "high"], help="Vision detail level (default: vision_settings.detail)")
+    return parser.parse_args()
+
+async def run_batch(args) -> int:
+    settings = Settings.shared()
+    api_client = APIClient(settings)
+    if args.vision:
+        runner: BatchRunner = VisionBatchRunner(api_client, settings, args.prompt, args.detail, concurrency=args.concurrency)
+    else:
+        runner = BatchRunner(api_client, settings, concurrency=args.concurrency)
+    try:
+        report = await runner.run(args.input, args.output, resume=not args.restart)
+    finally:
+        await api_client.close()
+        shutdown_image_pool()
+    print(report.format())
+    return 0 if report.failed == 0 else 1
+
+def main():
+    args = parse_args()
+    try:
+        return asyncio.run(run_batch(args))
+    except KeyboardInterrupt:
+        print("\nBatch interrupted. Re-run the same command to resume from the output file.")
+        return 130
+
+if __name__ == "__main__":
+    sys.exit(main())
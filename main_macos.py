@@ -1,11 +1,11 @@
 import sys
 import os
-from PyQt6.QtWidgets import QApplication
-from PyQt6.QtCore import Qt
-from src.gui import App
 
 def init_macos_specific():
     """Initialize macOS-specific settings."""
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import Qt
+
     # Set platform specific attributes
     QApplication.setAttribute(Qt.ApplicationAttribute.AA_DontUseNativeMenuBar)
     
@@ -16,6 +16,9 @@ def init_macos_specific():
     # Removed pynput import and related checks
 
 def main():
+    # Qt is imported inside the functions: image pool workers are spawned and re-run this module's top level
+    from src.gui import App
+
     # Initialize macOS specific settings
     init_macos_specific()
     
@@ -0,0 +1,69 @@
+import os
+import sys
+import signal
+import socket
+import asyncio
+import argparse
+import multiprocessing
+from aiohttp import web
+from src.core.settings import Settings
+from src.features.controllers import MainController
+from src.server import ChatServer
+
+def parse_args(settings: Settings):
+    parser = argparse.ArgumentParser(description="Serve the configured providers as an OpenAI-compatible HTTP API.")
+    parser.add_argument("--host", default=settings.get("server_settings", "host") or "127.0.0.1")
+    parser.add_argument("--port", type=int, default=settings.get("server_settings", "port") or 8080)
+    parser.add_argument("--workers", type=int, default=settings.get("server_settings", "workers") or 1,
+                        help="Number of pre-forked worker processes sharing the listening socket")
+    return parser.parse_args()
+
+async def create_app(settings: Settings) -> web.Application:
+    controller = MainController(settings, asyncio.get_running_loop())
+    return ChatServer(controller).create_app()
+
+def serve_worker(sock: socket.socket):
+    """Run one server process on an already-bound socket inherited from the parent."""
+    settings = Settings.shared()
+    web.run_app(create_app(settings), sock=sock, print=None, handle_signals=True)
+
+def serve_prefork(host: str, port: int, workers: int):
+    """Bind once in the parent, then fork `workers` processes that all accept on that socket."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(1024)
+    sock.setblocking(False)
+
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=serve_worker, args=(sock,), daemon=True) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    print(f"Serving on http://{host}:{port} with {workers} worker processes (parent pid {os.getpid()})")
+
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        print("Shutting down workers...")
+    finally:
+        for process in processes:
+            if process.is_alive() and process.pid is not None:
+                os.kill(process.pid, signal.SIGINT) # Lets aiohttp run its cleanup hooks
+        for process in processes:
+            process.join(timeout=10)
+        sock.close()
+
+def main():
+    settings = Settings.shared()
+    args = parse_args(settings)
+    if args.workers > 1 and hasattr(os, "fork"):
+        serve_prefork(args.host, args.port, args.workers)
+    else:
+        if args.workers > 1:
+            print("Warning: pre-forked workers need fork(); running a single process instead.")
+        web.run_app(create_app(settings), host=args.host, port=args.port)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,18 @@
-from .core.settings import Settings
-from .core.api_client import APIClient
-from .features.chat import ChatManager
-from .features.image import ImageManager
+# Resolve exports lazily: spawned image pool workers import src.core.image_processing
+# and should not pay for the API client, aiohttp and the feature modules
+__all__ = ['Settings', 'APIClient', 'ChatManager', 'ImageManager']
 
-__all__ = ['Settings', 'APIClient', 'ChatManager', 'ImageManager'] 
\ No newline at end of file
+def __getattr__(name):
+    if name == 'Settings':
+        from .core.settings import Settings
+        return Settings
+    if name == 'APIClient':
+        from .core.api_client import APIClient
+        return APIClient
+    if name == 'ChatManager':
+        from .features.chat import ChatManager
+        return ChatManager
+    if name == 'ImageManager':
+        from .features.image import ImageManager
+        return ImageManager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -1,4 +1,11 @@
-from .settings import Settings
-from .api_client import APIClient
+# Resolved lazily, like the package root (see src/__init__.py)
+__all__ = ['Settings', 'APIClient']
 
-__all__ = ['Settings', 'APIClient'] 
\ No newline at end of file
+def __getattr__(name):
+    if name == 'Settings':
+        from .settings import Settings
+        return Settings
+    if name == 'APIClient':
+        from .api_client import APIClient
+        return APIClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
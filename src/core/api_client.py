@@ -1,8 +1,8 @@
 import os
-from typing import Optional, Dict, Any, Union, Literal, TypedDict, List, cast
+from typing import TYPE_CHECKING, Optional, Dict, Any, Union, Literal, TypedDict, List, AsyncIterator, Tuple, cast
 # from openai import AsyncOpenAI # 이제 사용 안 함
 # from openai.types.chat import ChatCompletion # 이제 사용 안 함
-from openai.types.chat import ChatCompletionMessageParam # 이건 계속 사용 (타입 힌트용)
+import asyncio
 import aiohttp # aiohttp 임포트
 import json # JSON 처리를 위해 임포트
 from dotenv import load_dotenv
@@ -11,7 +11,15 @@ from dotenv import load_dotenv
 # from pathlib import Path
 # from PIL import Image
 # from io import BytesIO
-from .settings import Settings
+from .settings import Settings, SettingsChange
+from .rate_limiter import RateLimiter
+from .disk_cache import DiskCache, get_shared_cache
+from .image_store import ImageStore
+from .image_processing import get_image_pool, encode_for_vision, file_sha256, base64_length, iter_base64_chunks
+
+if TYPE_CHECKING:
+    # Type hints only: importing the openai package at runtime costs noticeable startup time
+    from openai.types.chat import ChatCompletionMessageParam
 
 # ImageUrlContent, ImageUrl, TextContent, UserMessage TypedDict는 일단 유지 (채팅 메시지 구조에 필요할 수 있음)
 class ImageUrlContent(TypedDict):
@@ -30,23 +38,64 @@ class UserMessage(TypedDict):
     role: Literal['user']
     content: List[Union[TextContent, ImageUrl]]
 
+# Stands in for the base64 image data while the vision request body is serialized
+_IMAGE_DATA_PLACEHOLDER = "__IMAGE_DATA__"
+
 class APIClient:
-    def __init__(self):
-        self.settings = Settings()
-        current_provider_name = self.settings.get("api_settings", "current_provider")
+    def __init__(self, settings: Optional[Settings] = None):
+        # Share the process-wide settings instead of re-reading settings.json
+        self.settings = settings if settings is not None else Settings.shared()
+        snapshot = self.settings.snapshot
+        current_provider_name = snapshot.provider
         
         provider_settings = self.settings.get("api_settings", "providers", current_provider_name)
         
         if not provider_settings:
             raise ValueError(f"Configuration for provider '{current_provider_name}' not found in settings.")
 
-        self.base_url = provider_settings.get("base_url")
-        self.api_key_env_name = provider_settings.get("api_key_env")
+        self.base_url = snapshot.base_url
+        self.api_key_env_name = snapshot.api_key_env
         
         if not self.base_url or not self.api_key_env_name:
             raise ValueError(f"base_url or api_key_env not configured for provider '{current_provider_name}'.")
             
         self.api_key = self._load_api_key(self.api_key_env_name)
+        # Optional per-provider request budget, shared by every caller of this client
+        self.rate_limiter = RateLimiter(snapshot.requests_per_minute)
+        # Pooled HTTP session, created lazily inside the running event loop and shared by all callers
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._vision_store: Optional[ImageStore] = None
+
+        # Optional response cache shared with other processes (server workers, batch runs)
+        ttl_setting = self.settings.get("cache_settings", "response_cache_ttl")
+        self.response_cache_ttl = float(ttl_setting) if isinstance(ttl_setting, (int, float)) and ttl_setting > 0 else 0.0
+        self.response_cache: Optional[DiskCache] = get_shared_cache(self.settings) if self.response_cache_ttl else None
+
+        # Apply provider and rate-limit edits from a hot-reloaded settings.json
+        self.settings.subscribe(self._on_settings_change)
+
+    def _on_settings_change(self, change: SettingsChange):
+        """Switch provider/base_url/key and rate limit in place.
+
+        The pooled session is kept: aiohttp pools connections per host, so
+        connections to providers that did not change stay warm.
+        """
+        new = change.new
+        if change.provider_changed:
+            if not new.base_url or not new.api_key_env:
+                print(f"Warning: provider '{new.provider}' is missing base_url or api_key_env; keeping '{change.old.provider}'.")
+                return
+            try:
+                api_key = self._load_api_key(new.api_key_env)
+            except ValueError as e:
+                print(f"Warning: {e}; keeping provider '{change.old.provider}'.")
+                return
+            self.base_url = new.base_url
+            self.api_key_env_name = new.api_key_env
+            self.api_key = api_key
+            print(f"APIClient switched to provider '{new.provider}' ({new.base_url})")
+        if change.rate_limit_changed:
+            self.rate_limiter.update_rate(new.requests_per_minute)
         
     def _load_api_key(self, api_key_env_name: str) -> str:
         """Load the API key from .env file using the specified environment variable name."""
@@ -56,17 +105,33 @@ class APIClient:
             raise ValueError(f"Please set {api_key_env_name} in .env file or environment variables")
         return api_key
 
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared keep-alive session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=100, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    def _headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+
+    async def close(self):
+        """Close the pooled HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
     async def chat_completion(
         self,
-        messages: List[ChatCompletionMessageParam],
+        messages: List['ChatCompletionMessageParam'],
         model: str,
         temperature: float
     ) -> Optional[Dict[str, Any]]: # 반환 타입을 Dict로 변경 (JSON 응답 직접 처리)
         """Get chat completion from OpenAI asynchronously using aiohttp."""
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
+        headers = self._headers()
         payload = {
             "model": model,
             "messages": messages,
@@ -76,11 +141,22 @@ class APIClient:
         # chat_completions_url = "https://api.openai.com/v1/chat/completions"
         chat_completions_url = f"{self.base_url}/chat/completions"
 
+        cache_key = None
+        if self.response_cache is not None:
+            cache_key = DiskCache.make_key(chat_completions_url, payload)
+            cached = await self.response_cache.aget("responses", cache_key)
+            if cached is not None:
+                return cached
+
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(chat_completions_url, headers=headers, json=payload) as response:
-                    response.raise_for_status()  # Will raise an HTTPError if the HTTP request returned an unsuccessful status code
-                    return await response.json() # JSON 응답 반환
+            await self.rate_limiter.acquire()
+            session = self._get_session()
+            async with session.post(chat_completions_url, headers=headers, json=payload) as response:
+                response.raise_for_status()  # Will raise an HTTPError if the HTTP request returned an unsuccessful status code
+                response_json = await response.json() # JSON 응답 반환
+            if self.response_cache is not None and cache_key is not None:
+                await self.response_cache.aset("responses", cache_key, response_json, ttl=self.response_cache_ttl)
+            return response_json
         except aiohttp.ClientResponseError as e:
             # HTTP 에러 (4xx, 5xx)
             error_content = e.message # 에러 응답 내용 확인 시도
@@ -98,6 +174,56 @@ class APIClient:
             print(f"\nUnexpected error in chat completion: {str(e)}")
             return None
 
+    async def chat_completion_stream(
+        self,
+        messages: List['ChatCompletionMessageParam'],
+        model: str,
+        temperature: float
+    ) -> AsyncIterator[str]:
+        """Stream chat completion content deltas (server-sent events) from the provider.
+
+        Unlike chat_completion, failures are logged and re-raised: a caller relaying
+        the stream has to tell a failed request from an empty reply.
+        """
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "stream": True
+        }
+        chat_completions_url = f"{self.base_url}/chat/completions"
+
+        try:
+            await self.rate_limiter.acquire()
+            session = self._get_session()
+            async with session.post(chat_completions_url, headers=self._headers(), json=payload) as response:
+                response.raise_for_status()
+                async for raw_line in response.content:
+                    line = raw_line.decode("utf-8").strip()
+                    if not line.startswith("data:"):
+                        continue # Blank separators and SSE comments (keep-alives)
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    chunk = json.loads(data)
+                    choices = chunk.get("choices") or []
+                    delta = choices[0].get("delta", {}) if choices else {}
+                    content = delta.get("content")
+                    if content:
+                        yield content
+        except aiohttp.ClientResponseError as e:
+            print(f"\nHTTP Error in streaming chat completion: {e.status} {e.message}")
+            raise
+        except aiohttp.ClientConnectionError as e:
+            print(f"\nConnection Error in streaming chat completion: {str(e)}")
+            raise
+        except asyncio.TimeoutError:
+            print("\nTimeout in streaming chat completion")
+            raise
+        except json.JSONDecodeError as e:
+            print(f"\nJSON Decode Error in streaming chat completion: {str(e)}")
+            raise
+
     async def transcribe_audio(self, audio_file_path: str, model: str, language: str) -> Optional[str]:
         """Transcribe audio using OpenAI's Whisper API."""
         raise NotImplementedError("음성 처리 기능은 현재 비활성화되어 있습니다.")
@@ -107,16 +233,170 @@ class APIClient:
         prompt: str,
         model_name: str,
         size: Literal['256x256', '512x512', '1024x1024', '1792x1024', '1024x1792'],
-        quality: Literal['standard', 'hd']
-    ) -> Optional[str]:
-        """Generate image using DALL-E."""
-        raise NotImplementedError("이미지 생성 기능은 현재 비활성화되어 있습니다.")
-
-    # _prepare_image 와 _encode_local_image는 이미지 관련이므로 일단 주석 처리 또는 나중에 제거
-    # def _prepare_image(self, image_source: str) -> Dict[str, str]:
-    #     ...
-    # def _encode_local_image(self, image_path: str) -> str:
-    #     ...
+        quality: Literal['standard', 'hd'],
+        n: int = 1
+    ) -> AsyncIterator[Tuple[int, Optional[str]]]:
+        """Generate `n` image variants, yielding (variant index, image URL) as each one finishes.
+
+        Every variant is its own `/images/generations` request (dall-e-3 only accepts n=1),
+        sent concurrently through the pooled session and the rate limiter. A failed
+        variant yields None instead of a URL.
+        """
+        tasks = [
+            asyncio.ensure_future(self._request_image(index, prompt, model_name, size, quality))
+            for index in range(max(1, n))
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # The caller stopped early (cancel/force stop): drop the requests still in flight
+            for task in tasks:
+                task.cancel()
+
+    async def _request_image(self, index: int, prompt: str, model_name: str, size: str, quality: str) -> Tuple[int, Optional[str]]:
+        """Request a single image and return (index, URL or data URL)."""
+        payload = {
+            "model": model_name,
+            "prompt": prompt,
+            "size": size,
+            "quality": quality,
+            "n": 1
+        }
+        image_generations_url = f"{self.base_url}/images/generations"
+
+        try:
+            await self.rate_limiter.acquire()
+            session = self._get_session()
+            async with session.post(image_generations_url, headers=self._headers(), json=payload) as response:
+                response.raise_for_status()
+                response_json = await response.json()
+            # Error bodies and unexpected shapes must not escape: one failed variant would end the whole generation
+            data = response_json.get("data") if isinstance(response_json, dict) else None
+            image = data[0] if isinstance(data, list) and data and isinstance(data[0], dict) else {}
+            if isinstance(image.get("url"), str) and image["url"]:
+                return index, image["url"]
+            if isinstance(image.get("b64_json"), str) and image["b64_json"]:
+                # Models such as gpt-image-1 only return base64 data
+                return index, f"data:image/png;base64,{image['b64_json']}"
+            print(f"\nNo image in image generation response: {str(response_json)[:500]}")
+            return index, None
+        except aiohttp.ClientResponseError as e:
+            print(f"\nHTTP Error in image generation: {e.status} {e.message}")
+            return index, None
+        except aiohttp.ClientConnectionError as e:
+            print(f"\nConnection Error in image generation: {str(e)}")
+            return index, None
+        except asyncio.TimeoutError:
+            print("\nTimeout in image generation")
+            return index, None
+        except json.JSONDecodeError as e:
+            print(f"\nJSON Decode Error in image generation: {str(e)}")
+            return index, None
+
+    async def download_image(self, url: str, max_bytes: int = 50 * 1024 * 1024) -> Optional[bytes]:
+        """Download a generated image through the pooled session (no provider auth header)."""
+        try:
+            session = self._get_session()
+            async with session.get(url) as response:
+                response.raise_for_status()
+                if response.content_length is not None and response.content_length > max_bytes:
+                    print(f"\nImage too large to download ({response.content_length} bytes): {url[:60]}")
+                    return None
+                chunks = []
+                received = 0
+                async for chunk in response.content.iter_chunked(65536):
+                    received += len(chunk)
+                    if received > max_bytes:
+                        print(f"\nImage too large to download (over {max_bytes} bytes): {url[:60]}")
+                        return None
+                    chunks.append(chunk)
+                return b"".join(chunks)
+        except aiohttp.ClientResponseError as e:
+            print(f"\nHTTP Error downloading image: {e.status} {e.message}")
+            return None
+        except aiohttp.ClientConnectionError as e:
+            print(f"\nConnection Error downloading image: {str(e)}")
+            return None
+        except asyncio.TimeoutError:
+            print(f"\nTimeout downloading image: {url[:60]}")
+            return None
+
+    def _get_vision_store(self) -> ImageStore:
+        """Return the store of encoded vision uploads (created on first use)."""
+        if self._vision_store is None:
+            directory = self.settings.get("vision_settings", "cache_directory") or os.path.join(".cache", "vision")
+            max_mb = self.settings.get("vision_settings", "cache_max_mb")
+            max_bytes = int(max_mb * 1024 * 1024) if isinstance(max_mb, (int, float)) and max_mb > 0 else 200 * 1024 * 1024
+            self._vision_store = ImageStore(directory, max_bytes, get_shared_cache(self.settings))
+        return self._vision_store
+
+    async def _encode_local_image(self, image_path: str, detail: str) -> Tuple[str, str]:
+        """Return (path, MIME type) of the upload for a local image at `detail`.
+
+        The image is downscaled to what `detail` uses and re-encoded in the image
+        process pool. Results are cached by content hash, and the file stat is
+        remembered so an unchanged file is not even re-hashed.
+        """
+        store = self._get_vision_store()
+        index = store.index
+        # "auto" is sent at the "high" bounds, so both share one cached upload
+        size_class = "low" if detail == "low" else "high"
+        stat = os.stat(image_path)
+        stat_key = DiskCache.make_key("vision-stat", os.path.abspath(image_path), stat.st_size, stat.st_mtime_ns, size_class)
+        loop = asyncio.get_running_loop()
+
+        def cached_upload(key: str) -> Optional[List[str]]:
+            entry = index.get("vision", key) if index is not None else None
+            return entry if isinstance(entry, list) and store.path_for(entry[0]) is not None else None
+
+        upload = cached_upload(stat_key)
+        if upload is None:
+            content_hash = await loop.run_in_executor(None, file_sha256, image_path)
+            content_key = DiskCache.make_key("vision-content", content_hash, size_class)
+            upload = cached_upload(content_key)
+            if upload is None:
+                encoded_name = f"{content_hash}-{size_class}"
+                encoded_path = os.path.join(store.directory, encoded_name)
+                mime = await loop.run_in_executor(get_image_pool(), encode_for_vision, image_path, encoded_path, size_class)
+                store.track(encoded_path)
+                upload = [encoded_name, mime]
+                if index is not None:
+                    index.set("vision", content_key, upload)
+            if index is not None:
+                index.set("vision", stat_key, upload)
+        encoded_name, mime = upload
+        return os.path.join(store.directory, encoded_name), mime
+
+    async def _prepare_image(self, image_source: str, detail: str) -> Tuple[ImageUrl, Optional[str]]:
+        """Return the image_url content part and, for local files, the encoded upload to stream into it.
+
+        For a local file the URL is a placeholder that the request body replaces
+        with the base64 data of the returned path.
+        """
+        if image_source.startswith(("http://", "https://", "data:")):
+            return {"type": "image_url", "image_url": {"url": image_source, "detail": detail}}, None
+        encoded_path, mime = await self._encode_local_image(image_source, detail)
+        url = f"data:{mime};base64,{_IMAGE_DATA_PLACEHOLDER}"
+        return {"type": "image_url", "image_url": {"url": url, "detail": detail}}, encoded_path
+
+    def _streamed_json_body(self, payload: Dict[str, Any], encoded_path: str) -> Tuple[AsyncIterator[bytes], int]:
+        """Serialize `payload`, streaming the base64 of `encoded_path` in place of the data placeholder.
+
+        Returns the body iterator and its exact length, so the request is sent with a
+        Content-Length and the base64 text is never assembled in memory.
+        """
+        # rsplit: the image part comes after the prompt text, which could contain the placeholder itself
+        prefix, suffix = json.dumps(payload).encode("utf-8").rsplit(_IMAGE_DATA_PLACEHOLDER.encode("ascii"), 1)
+        length = len(prefix) + base64_length(os.path.getsize(encoded_path)) + len(suffix)
+
+        async def body() -> AsyncIterator[bytes]:
+            yield prefix
+            for chunk in iter_base64_chunks(encoded_path):
+                yield chunk
+            yield suffix
+
+        return body(), length
     
     async def analyze_image(
         self,
@@ -124,5 +404,45 @@ class APIClient:
         prompt: str = "이 이미지를 설명해주세요",
         detail: Optional[Literal['auto', 'low', 'high']] = None
     ) -> Optional[str]:
-        """Analyze image using GPT-4 Vision."""
-        raise NotImplementedError("이미지 비전 기능은 현재 비활성화되어 있습니다.") 
\ No newline at end of file
+        """Analyze an image (URL or local file) with the vision model."""
+        resolved_detail = detail or self.settings.get("vision_settings", "detail") or "auto"
+        max_tokens = self.settings.get("vision_settings", "max_tokens")
+        image_part, encoded_path = await self._prepare_image(image_source, resolved_detail)
+        text_part: TextContent = {"type": "text", "text": prompt}
+        message: UserMessage = {"role": "user", "content": [text_part, image_part]}
+        payload: Dict[str, Any] = {
+            "model": self.settings.get("vision_settings", "model") or "gpt-4o",
+            "messages": [message],
+            "max_tokens": max_tokens if isinstance(max_tokens, int) and max_tokens > 0 else 1000
+        }
+        chat_completions_url = f"{self.base_url}/chat/completions"
+
+        headers = self._headers()
+        if encoded_path is not None:
+            body, length = self._streamed_json_body(payload, encoded_path)
+            request_kwargs: Dict[str, Any] = {"data": body}
+            headers["Content-Length"] = str(length)
+        else:
+            request_kwargs = {"json": payload}
+
+        try:
+            await self.rate_limiter.acquire()
+            session = self._get_session()
+            async with session.post(chat_completions_url, headers=headers, **request_kwargs) as response:
+                response.raise_for_status()
+                response_json = await response.json()
+            choices = response_json.get("choices") or []
+            content = choices[0].get("message", {}).get("content") if choices else None
+            if not isinstance(content, str):
+                print(f"\nNo content in vision response: {response_json}")
+                return None
+            return content
+        except aiohttp.ClientResponseError as e:
+            print(f"\nHTTP Error in image analysis: {e.status} {e.message}")
+            return None
+        except aiohttp.ClientConnectionError as e:
+            print(f"\nConnection Error in image analysis: {str(e)}")
+            return None
+        except json.JSONDecodeError as e:
+            print(f"\nJSON Decode Error in image analysis: {str(e)}")
+            return None
@@ -0,0 +1,119 @@
+import os
+import json
+import asyncio
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Optional
+
+class DiskCache:
+    """Small key/value cache on SQLite in WAL mode, shared by every process using the same file.
+
+    Values are stored as JSON under a namespace (e.g. "responses", "render").
+    Each process (and thread) opens its own connection, so the cache is safe to
+    use from pre-forked server workers: WAL lets readers proceed while one
+    writer commits. Code on an event loop uses `aget`/`aset`, which run the
+    SQLite calls in the default executor; a database still locked after
+    `busy_timeout` seconds counts as a miss (or a skipped write).
+    """
+    PRUNE_EVERY = 200 # Writes between eviction passes
+
+    def __init__(self, path: str, max_entries: int = 10000, busy_timeout: float = 1.0):
+        self.path = path
+        self.max_entries = max_entries
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._writes = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection() # Create the schema eagerly so workers never race on it
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Hash arbitrary JSON-serializable parts into a compact cache key."""
+        raw = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _connection(self) -> sqlite3.Connection:
+        # Connections must not cross fork() or threads: key them by pid in thread-local storage
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                " namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+                " created REAL NOT NULL, expires REAL,"
+                " PRIMARY KEY (namespace, key))"
+            )
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """Return the cached value, or None when missing or expired."""
+        try:
+            row = self._connection().execute(
+                "SELECT value, expires FROM cache WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Warning: cache read failed: {e}")
+            return None
+        if row is None:
+            return None
+        value, expires = row
+        if expires is not None and expires < time.time():
+            return None
+        return json.loads(value)
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None):
+        """Store a JSON-serializable value, optionally expiring after `ttl` seconds."""
+        now = time.time()
+        expires = now + ttl if ttl else None
+        try:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, created, expires) VALUES (?, ?, ?, ?, ?)",
+                (namespace, key, json.dumps(value, ensure_ascii=False), now, expires)
+            )
+        except sqlite3.Error as e:
+            print(f"Warning: cache write failed: {e}")
+            return
+        self._writes += 1
+        if self._writes % self.PRUNE_EVERY == 0:
+            self.prune()
+
+    async def aget(self, namespace: str, key: str) -> Optional[Any]:
+        """`get` for event-loop code: runs in the default executor, so a busy writer never stalls the loop."""
+        return await asyncio.get_running_loop().run_in_executor(None, self.get, namespace, key)
+
+    async def aset(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None):
+        """`set` for event-loop code (see aget)."""
+        await asyncio.get_running_loop().run_in_executor(None, self.set, namespace, key, value, ttl)
+
+    def prune(self):
+        """Drop expired entries and the oldest ones beyond `max_entries`."""
+        try:
+            conn = self._connection()
+            conn.execute("DELETE FROM cache WHERE expires IS NOT NULL AND expires < ?", (time.time(),))
+            conn.execute(
+                "DELETE FROM cache WHERE rowid IN ("
+                " SELECT rowid FROM cache ORDER BY created DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+        except sqlite3.Error as e:
+            print(f"Warning: cache prune failed: {e}")
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "shared_cache.sqlite3")
+_shared_caches = {}
+
+def get_shared_cache(settings) -> DiskCache:
+    """Return the process-wide DiskCache configured by `cache_settings`."""
+    path = settings.get("cache_settings", "path") or DEFAULT_CACHE_PATH
+    max_entries = settings.get("cache_settings", "max_entries")
+    cache = _shared_caches.get(path)
+    if cache is None:
+        cache = DiskCache(path, max_entries if isinstance(max_entries, int) and max_entries > 0 else 10000)
+        _shared_caches[path] = cache
+    return cache
@@ -0,0 +1,119 @@
+import os
+import mmap
+import base64
+import shutil
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, Optional, Tuple
+
+# Pillow is imported inside the worker functions: it is only needed in the pool processes
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+def get_image_pool() -> ProcessPoolExecutor:
+    """Return the process pool for CPU-bound image work, creating it on first use.
+
+    Workers are spawned rather than forked: forking a process that runs Qt and
+    asyncio threads can deadlock the child.
+    """
+    global _pool
+    if _pool is None:
+        workers = max(1, min(4, (os.cpu_count() or 2) - 1))
+        _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+def shutdown_image_pool():
+    """Stop the pool's worker processes (pending jobs are cancelled)."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+def make_thumbnail(source_path: str, thumbnail_path: str, max_size: int = 384, quality: int = 80) -> Tuple[int, int]:
+    """Write a WebP preview of `source_path` that fits in max_size x max_size; returns its (width, height).
+
+    Runs in a pool process. JPEG sources are decoded at reduced scale (draft mode),
+    so the full-resolution bitmap is never materialized for them.
+    """
+    from PIL import Image
+
+    with Image.open(source_path) as image:
+        image.draft("RGB", (max_size, max_size))
+        image.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+        tmp_path = f"{thumbnail_path}.{os.getpid()}.tmp"
+        image.save(tmp_path, "WEBP", quality=quality, method=4)
+        size = image.size
+    os.replace(tmp_path, thumbnail_path) # Atomic, so the view never loads a partial file
+    return size
+
+# Largest image each vision `detail` level uses: (fit inside a square of this side, then cap the short side).
+# "auto" lets the model pick, so it gets the "high" bounds.
+VISION_LIMITS = {"low": (512, None), "high": (2048, 768), "auto": (2048, 768)}
+VISION_FORMATS = {"JPEG": "image/jpeg", "PNG": "image/png", "WEBP": "image/webp"}
+
+def vision_target_size(width: int, height: int, detail: str) -> Tuple[int, int]:
+    """Return the size the vision model actually uses for an image at `detail` (never upscaled)."""
+    fit, short_side = VISION_LIMITS.get(detail, VISION_LIMITS["auto"])
+    scale = min(1.0, fit / max(width, height))
+    if short_side is not None:
+        scale = min(scale, short_side / min(width, height))
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+def encode_for_vision(source_path: str, output_path: str, detail: str, quality: int = 85) -> str:
+    """Write the vision upload for `source_path` to `output_path`; returns its MIME type.
+
+    Runs in a pool process. Images already within the `detail` bounds and in an
+    accepted format are copied unchanged; others are downscaled (JPEG sources are
+    decoded at reduced scale) and re-encoded as JPEG, or PNG when they have alpha.
+    """
+    from PIL import Image
+
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    with Image.open(source_path) as image:
+        target = vision_target_size(image.width, image.height, detail)
+        if target == image.size and image.format in VISION_FORMATS:
+            shutil.copyfile(source_path, tmp_path) # Streams the file; no decode, no extra copy in memory
+            mime = VISION_FORMATS[image.format]
+        else:
+            image.draft("RGB", target)
+            has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+            converted = image.convert("RGBA" if has_alpha else "RGB")
+            if converted.size != target:
+                converted = converted.resize(target, Image.Resampling.LANCZOS, reducing_gap=3.0)
+            if has_alpha:
+                converted.save(tmp_path, "PNG", optimize=True)
+                mime = "image/png"
+            else:
+                converted.save(tmp_path, "JPEG", quality=quality, optimize=True)
+                mime = "image/jpeg"
+    os.replace(tmp_path, output_path)
+    return mime
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Hash a file through a memory map, without reading it into memory."""
+    digest = hashlib.sha256()
+    if os.path.getsize(path) == 0:
+        return digest.hexdigest()
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        for offset in range(0, len(mapped), chunk_size):
+            digest.update(mapped[offset:offset + chunk_size])
+    return digest.hexdigest()
+
+def base64_length(size: int) -> int:
+    """Length of the base64 encoding of `size` bytes (with padding)."""
+    return 4 * ((size + 2) // 3)
+
+def iter_base64_chunks(path: str, chunk_size: int = 3 * 64 * 1024) -> Iterator[bytes]:
+    """Yield the base64 encoding of a file in chunks read from a memory map.
+
+    `chunk_size` is a multiple of 3, so the chunks concatenate to one valid
+    base64 string and only one chunk is held in memory at a time.
+    """
+    if os.path.getsize(path) == 0:
+        return
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        for offset in range(0, len(mapped), chunk_size):
+            yield base64.b64encode(mapped[offset:offset + chunk_size])
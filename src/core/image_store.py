@@ -0,0 +1,142 @@
+import os
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+from .disk_cache import DiskCache, get_shared_cache
+
+# Magic numbers of the formats the image APIs return
+_THUMBNAIL_SUFFIX = ".thumb.webp"
+
+_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"GIF87a", ".gif"),
+    (b"GIF89a", ".gif"),
+)
+
+def image_extension(data: bytes) -> str:
+    """Guess the file extension from the image bytes (".png" when unknown)."""
+    for signature, extension in _SIGNATURES:
+        if data.startswith(signature):
+            return extension
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return ".webp"
+    return ".png"
+
+class ImageStore:
+    """Content-addressed image files with size-bounded LRU eviction.
+
+    Files are named by the SHA-256 of their bytes, so an image is stored once no
+    matter how often it is downloaded. Recency is the file mtime, bumped on every
+    lookup, which keeps the LRU order across runs without a separate index.
+    An image and its WebP preview are used and evicted together, so the view
+    never shows a preview whose full-size original is gone.
+    Source URLs (which expire) are mapped to stored files through the shared
+    DiskCache, so a URL seen before is served without touching the network.
+    """
+    def __init__(self, directory: str, max_bytes: int = 500 * 1024 * 1024, index: Optional[DiskCache] = None):
+        self.directory = os.path.abspath(directory)
+        self.max_bytes = max_bytes
+        self.index = index
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        self.total_bytes = sum(entry.stat().st_size for entry in self._entries())
+
+    @classmethod
+    def from_settings(cls, settings) -> Optional['ImageStore']:
+        """Return the store configured by `cli_settings`, or None when saving images is off."""
+        if not settings.get("cli_settings", "save_images_locally"):
+            return None
+        directory = settings.get("cli_settings", "images_directory") or "generated_images"
+        max_mb = settings.get("cli_settings", "images_max_mb")
+        max_bytes = int(max_mb * 1024 * 1024) if isinstance(max_mb, (int, float)) and max_mb > 0 else 500 * 1024 * 1024
+        return cls(directory, max_bytes, get_shared_cache(settings))
+
+    def _entries(self):
+        with os.scandir(self.directory) as entries:
+            return [entry for entry in entries if entry.is_file() and not entry.name.endswith(".tmp")]
+
+    def path_for(self, digest_name: str) -> Optional[str]:
+        """Return the path of a stored file and mark it (and its preview) as recently used, or None if evicted."""
+        path = os.path.join(self.directory, digest_name)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        if not digest_name.endswith(_THUMBNAIL_SUFFIX):
+            try:
+                os.utime(self.thumbnail_path(path))
+            except OSError:
+                pass # No preview built (yet)
+        return path
+
+    def lookup(self, source_url: str) -> Optional[str]:
+        """Return the local path of an image previously stored from `source_url`."""
+        if self.index is None:
+            return None
+        digest_name = self.index.get("images", DiskCache.make_key(source_url))
+        return self.path_for(digest_name) if isinstance(digest_name, str) else None
+
+    def put(self, data: bytes, source_url: Optional[str] = None) -> str:
+        """Store image bytes (once per content) and return the local path."""
+        digest_name = hashlib.sha256(data).hexdigest() + image_extension(data)
+        path = self.path_for(digest_name)
+        if path is None:
+            path = os.path.join(self.directory, digest_name)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path) # Atomic, so the view never loads a partial file
+            self.track(path)
+        if self.index is not None and source_url and not source_url.startswith("data:"):
+            self.index.set("images", DiskCache.make_key(source_url), digest_name)
+        return path
+
+    def track(self, path: str):
+        """Count a file just written into the store (e.g. a thumbnail) and evict if over budget."""
+        with self._lock:
+            self.total_bytes += os.path.getsize(path)
+        self._evict(keep=os.path.basename(path))
+
+    def thumbnail_path(self, path: str) -> str:
+        """Return where the WebP preview of a stored image lives (it may not exist yet)."""
+        return os.path.splitext(path)[0] + _THUMBNAIL_SUFFIX
+
+    @staticmethod
+    def _group_key(name: str) -> str:
+        """Name shared by an image and its preview (the content digest)."""
+        if name.endswith(_THUMBNAIL_SUFFIX):
+            return name[:-len(_THUMBNAIL_SUFFIX)]
+        return os.path.splitext(name)[0]
+
+    def _evict(self, keep: str):
+        """Delete least recently used images (each with its preview) until the store fits in `max_bytes`."""
+        with self._lock:
+            if self.total_bytes <= self.max_bytes:
+                return
+            groups: Dict[str, List[os.DirEntry]] = {}
+            for entry in self._entries():
+                groups.setdefault(self._group_key(entry.name), []).append(entry)
+            self.total_bytes = sum(entry.stat().st_size for group in groups.values() for entry in group)
+            keep_key = self._group_key(keep)
+            # A group was last used when its most recently touched file was
+            ordered = sorted(groups.items(), key=lambda item: max(entry.stat().st_mtime for entry in item[1]))
+            for key, group in ordered:
+                if self.total_bytes <= self.max_bytes:
+                    break
+                if key == keep_key:
+                    continue
+                # Preview first: if removing the original fails, no orphaned preview is left pointing at it
+                for entry in sorted(group, key=lambda entry: not entry.name.endswith(_THUMBNAIL_SUFFIX)):
+                    try:
+                        size = entry.stat().st_size
+                        os.remove(entry.path)
+                        self.total_bytes -= size
+                    except OSError:
+                        pass
+
+    @staticmethod
+    def file_url(path: str) -> str:
+        """Return the file:// URL the chat view loads a stored image from."""
+        return Path(path).as_uri()
@@ -0,0 +1,44 @@
+import asyncio
+import time
+from typing import Optional
+
+class RateLimiter:
+    """Async token-bucket limiter for provider requests.
+
+    A rate of None (or <= 0) disables limiting, so providers without a
+    configured `requests_per_minute` behave exactly as before.
+    """
+    def __init__(self, requests_per_minute: Optional[float] = None, burst: Optional[int] = None):
+        self._lock = asyncio.Lock()
+        self.update_rate(requests_per_minute, burst)
+
+    def update_rate(self, requests_per_minute: Optional[float], burst: Optional[int] = None):
+        """Change the allowed rate. Already granted requests are not affected."""
+        if requests_per_minute is not None and requests_per_minute > 0:
+            self.rate_per_second: Optional[float] = float(requests_per_minute) / 60.0
+            self.capacity = float(burst) if burst and burst > 0 else max(1.0, self.rate_per_second)
+        else:
+            self.rate_per_second = None
+            self.capacity = 0.0
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate_per_second is not None
+
+    async def acquire(self):
+        """Wait until one request may be sent."""
+        if self.rate_per_second is None:
+            return
+        async with self._lock:
+            while True:
+                if self.rate_per_second is None: # Limit removed while waiting
+                    return
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate_per_second)
+                self._last_refill = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self._tokens) / self.rate_per_second)
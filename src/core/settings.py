@@ -1,13 +1,164 @@
 import os
 import json
 import re
-from typing import Dict, Any
+import asyncio
+import threading
+from dataclasses import dataclass, fields
+from typing import Dict, Any, Optional, Callable, List, FrozenSet
+
+# Matches JSON strings (kept) or // and /* */ comments (dropped), so URLs inside strings survive
+_JSON_COMMENT_PATTERN = re.compile(r'("(?:\\.|[^"\\])*")|//[^\n]*|/\*.*?\*/', re.S)
+
+@dataclass(frozen=True)
+class SettingsSnapshot:
+    """Flat, typed view of the resolved settings used on hot paths.
+
+    Built once per load so callers read plain attributes instead of walking
+    nested dicts and re-validating types on every request.
+    """
+    provider: str
+    base_url: Optional[str]
+    api_key_env: Optional[str]
+    requests_per_minute: Optional[float]
+    chat_model: str
+    chat_temperature: float
+    max_conversation_history: int
+    is_o1_model: bool
+    image_model: str
+    image_size: str
+    image_quality: str
+    image_variants: int
+    image_max_context_history: int
+    image_use_raw_prompt: bool
+    prompt_processor_model: str
+    prompt_processor_temperature: float
+    prompt_processor_system_prompt: Optional[str]
+    prompt_processor_context_tokens: int
+
+    @classmethod
+    def from_settings(cls, settings: 'Settings') -> 'SettingsSnapshot':
+        provider = str(settings.get("api_settings", "current_provider") or "openai")
+        provider_settings = settings.get("api_settings", "providers", provider) or {}
+        rpm = provider_settings.get("requests_per_minute")
+
+        model_setting = settings.get("chat_settings", "model")
+        chat_model = str(model_setting) if model_setting is not None else "gpt-3.5-turbo"
+        temperature_setting = settings.get("chat_settings", "temperature")
+        history_setting = settings.get("chat_settings", "max_conversation_history")
+        image_history_setting = settings.get("image_settings", "max_context_history")
+        processor = settings.get("image_settings", "prompt_processor") or {}
+        processor_temperature = processor.get("temperature")
+        processor_tokens = processor.get("max_context_tokens")
+        variants_setting = settings.get("image_settings", "variants")
+
+        return cls(
+            provider=provider,
+            base_url=provider_settings.get("base_url"),
+            api_key_env=provider_settings.get("api_key_env"),
+            requests_per_minute=float(rpm) if isinstance(rpm, (int, float)) and rpm > 0 else None,
+            chat_model=chat_model,
+            chat_temperature=float(temperature_setting) if isinstance(temperature_setting, (float, int)) else 1.0,
+            max_conversation_history=history_setting if isinstance(history_setting, int) and history_setting > 0 else 10,
+            is_o1_model=chat_model.startswith("o1-"),
+            image_model=str(settings.get("image_settings", "model") or "dall-e-3"),
+            image_size=str(settings.get("image_settings", "size") or "1024x1024"),
+            image_quality=str(settings.get("image_settings", "quality") or "standard"),
+            image_variants=min(variants_setting, 10) if isinstance(variants_setting, int) and variants_setting > 0 else 1,
+            image_max_context_history=image_history_setting if isinstance(image_history_setting, int) and image_history_setting > 0 else 20,
+            image_use_raw_prompt=bool(settings.get("image_settings", "use_raw_prompt")),
+            prompt_processor_model=str(processor.get("model") or chat_model),
+            prompt_processor_temperature=float(processor_temperature) if isinstance(processor_temperature, (float, int)) else 0.7,
+            prompt_processor_system_prompt=processor.get("system_prompt") or None,
+            prompt_processor_context_tokens=processor_tokens if isinstance(processor_tokens, int) and processor_tokens > 0 else 1500,
+        )
+
+@dataclass(frozen=True)
+class SettingsChange:
+    """Event published when settings.json is reloaded with different values."""
+    old: SettingsSnapshot
+    new: SettingsSnapshot
+    changed: FrozenSet[str] # Names of SettingsSnapshot fields whose value changed
+
+    @property
+    def provider_changed(self) -> bool:
+        """True when the upstream endpoint or credentials changed."""
+        return bool(self.changed & {"provider", "base_url", "api_key_env"})
+
+    @property
+    def rate_limit_changed(self) -> bool:
+        return "requests_per_minute" in self.changed
 
 class Settings:
+    SETTINGS_PATH = 'settings.json'
+
+    _shared: Optional['Settings'] = None
+    _shared_lock = threading.Lock()
+
     def __init__(self):
+        self._mtime = self._file_mtime() # Taken before reading so edits during the load are not missed
         self.settings = self.load_settings()
+        self.snapshot = SettingsSnapshot.from_settings(self)
+        self._listeners: List[Callable[[SettingsChange], None]] = []
+
+    @classmethod
+    def shared(cls) -> 'Settings':
+        """Return the process-wide Settings, loading settings.json only once."""
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
         
-    def load_settings(self) -> Dict[str, Any]:
+    def subscribe(self, listener: Callable[[SettingsChange], None]):
+        """Call `listener` with a SettingsChange whenever a reload changes resolved values."""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[SettingsChange], None]):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _file_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.SETTINGS_PATH).st_mtime
+        except OSError:
+            return None
+
+    def reload_if_changed(self) -> Optional[SettingsChange]:
+        """Re-parse settings.json only if its mtime changed, then notify listeners.
+
+        A file that fails to parse (e.g. saved mid-edit) keeps the current settings.
+        """
+        mtime = self._file_mtime()
+        if mtime == self._mtime:
+            return None
+        self._mtime = mtime
+        self.settings = self.load_settings(fallback=self.settings)
+
+        old_snapshot = self.snapshot
+        self.snapshot = SettingsSnapshot.from_settings(self)
+        changed = frozenset(
+            f.name for f in fields(SettingsSnapshot)
+            if getattr(old_snapshot, f.name) != getattr(self.snapshot, f.name)
+        )
+        if not changed:
+            return None
+
+        change = SettingsChange(old=old_snapshot, new=self.snapshot, changed=changed)
+        print(f"Settings reloaded. Changed: {', '.join(sorted(changed))}")
+        for listener in list(self._listeners):
+            try:
+                listener(change)
+            except Exception as e:
+                print(f"Error applying settings change in {listener}: {e}")
+        return change
+
+    async def watch(self, interval: float = 1.0):
+        """Poll the settings file's mtime until cancelled (one os.stat per interval)."""
+        while True:
+            await asyncio.sleep(interval)
+            self.reload_if_changed()
+
+    def load_settings(self, fallback: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         default_settings = {
             "api_settings": {
                 "current_provider": "openai",
@@ -41,7 +192,9 @@ class Settings:
                 "model": "gpt-4o",
                 "max_tokens": 1000,
                 "detail": "auto",
-                "available_details": ["auto", "low", "high"]
+                "available_details": ["auto", "low", "high"],
+                "cache_directory": os.path.join(".cache", "vision"),
+                "cache_max_mb": 200
             },
             "image_settings": {
                 "model": "dall-e-3",
@@ -49,35 +202,64 @@ class Settings:
                 "available_sizes": ["1024x1024", "1792x1024", "1024x1792"],
                 "quality": "standard",
                 "available_qualities": ["standard", "hd"],
+                "variants": 1,
                 "max_context_history": 20,
                 "use_raw_prompt": False,
                 "prompt_processor": {
                     "model": "gpt-4o",
                     "temperature": 0.7,
+                    "max_context_tokens": 1500,
                     "system_prompt": "You are a creative assistant that helps enhance image generation prompts. Your goal is to make the prompts more detailed and effective for DALL-E image generation while maintaining the user's original intent."
                 }
+            },
+            "cli_settings": {
+                "show_enhanced_prompt": True,
+                "save_images_locally": False,
+                "images_directory": "generated_images",
+                "images_max_mb": 500,
+                "thumbnail_size": 384
+            },
+            "batch_settings": {
+                "concurrency": 8,
+                "progress_interval": 5.0
+            },
+            "server_settings": {
+                "host": "127.0.0.1",
+                "port": 8080,
+                "max_sessions": 256,
+                "workers": 1
+            },
+            "cache_settings": {
+                "path": ".cache/shared_cache.sqlite3",
+                "max_entries": 10000,
+                "response_cache_ttl": 0,
+                "render_cache": True
             }
         }
         
+        # On reload, keep the current values instead of resetting to defaults when the file is broken
+        fallback_settings = fallback if fallback is not None else default_settings
+        fallback_name = "current" if fallback is not None else "default"
+
         try:
-            with open('settings.json', 'r') as f:
+            with open(self.SETTINGS_PATH, 'r') as f:
                 content = f.read()
             
-            # Remove JSON comments
-            content = re.sub(r'//.*?\n|/\*.*?\*/', '', content, flags=re.S)
+            # Remove JSON comments (string-aware, so "https://..." values are left intact)
+            content = _JSON_COMMENT_PATTERN.sub(lambda m: m.group(1) or '', content)
             user_settings = json.loads(content)
             
             return self._deep_merge(default_settings, user_settings)
             
         except FileNotFoundError:
-            print("Warning: settings.json not found. Using default settings.")
-            return default_settings
+            print(f"Warning: settings.json not found. Using {fallback_name} settings.")
+            return fallback_settings
         except json.JSONDecodeError as e:
-            print(f"Warning: Error parsing settings.json. Using default settings. Error: {str(e)}")
-            return default_settings
+            print(f"Warning: Error parsing settings.json. Using {fallback_name} settings. Error: {str(e)}")
+            return fallback_settings
         except Exception as e:
-            print(f"Warning: Unexpected error loading settings. Using default settings. Error: {str(e)}")
-            return default_settings
+            print(f"Warning: Unexpected error loading settings. Using {fallback_name} settings. Error: {str(e)}")
+            return fallback_settings
 
     def _deep_merge(self, default: Dict, user: Dict) -> Dict:
         """Deep merge two dictionaries."""
@@ -1,4 +1,5 @@
 from .chat import ChatManager
 from .image import ImageManager
+from .batch import BatchRunner, VisionBatchRunner
 
-__all__ = ['ChatManager', 'ImageManager'] 
\ No newline at end of file
+__all__ = ['ChatManager', 'ImageManager', 'BatchRunner', 'VisionBatchRunner'] 
\ No newline at end of file
@@ -0,0 +1,246 @@
+import asyncio
+import glob
+import json
+import math
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Literal, Optional, Set, TextIO, Tuple
+from ..core.api_client import APIClient
+from ..core.settings import Settings
+
+@dataclass
+class BatchReport:
+    """Summary of a batch run."""
+    total: int = 0
+    skipped: int = 0 # Rows already finished in a previous run (resumed)
+    succeeded: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+
+    @property
+    def completed(self) -> int:
+        return self.succeeded + self.failed
+
+    @property
+    def throughput(self) -> float:
+        """Completed requests per second in this run."""
+        return self.completed / self.elapsed if self.elapsed > 0 else 0.0
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Nearest-rank latency percentile in seconds (None if nothing ran)."""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+        return ordered[min(rank, len(ordered)) - 1]
+
+    def format(self) -> str:
+        def fmt(value: Optional[float]) -> str:
+            return f"{value:.2f}s" if value is not None else "-"
+        return (
+            f"Batch finished: {self.succeeded} succeeded, {self.failed} failed, "
+            f"{self.skipped} skipped (already done) out of {self.total} rows\n"
+            f"Elapsed: {self.elapsed:.1f}s | Throughput: {self.throughput:.2f} req/s\n"
+            f"Latency p50: {fmt(self.percentile(50))} | p95: {fmt(self.percentile(95))} | p99: {fmt(self.percentile(99))}"
+        )
+
+class BatchRunner:
+    """Runs a JSONL file of chat requests through APIClient with bounded concurrency.
+
+    Each input line is a JSON object with either a `prompt` string or a full
+    `messages` list, plus optional `id`, `model` and `temperature`. Each output
+    line carries the input `index` so results written in completion order can be
+    reassembled. The output file doubles as the checkpoint: rows that already
+    have a successful result there are skipped when the job is resumed.
+    """
+    def __init__(self, api_client: APIClient, settings: Settings, concurrency: Optional[int] = None):
+        self.api_client = api_client
+        self.settings = settings
+
+        concurrency_setting = concurrency if concurrency is not None else self.settings.get("batch_settings", "concurrency")
+        self.concurrency = concurrency_setting if isinstance(concurrency_setting, int) and concurrency_setting > 0 else 8
+
+        interval_setting = self.settings.get("batch_settings", "progress_interval")
+        self.progress_interval = float(interval_setting) if isinstance(interval_setting, (int, float)) else 5.0
+
+    async def run(self, input_path: str, output_path: str, resume: bool = True) -> BatchReport:
+        """Process every row of `input_path`, appending results to `output_path`."""
+        finished = self._load_finished(output_path, "index") if resume else set()
+        report = BatchReport(total=self._count_rows(input_path))
+        with open(input_path, 'r', encoding='utf-8') as input_file:
+            rows = ((index, line) for index, line in enumerate(input_file) if line.strip())
+            return await self._run_rows(rows, finished, report, output_path, resume, self._run_row)
+
+    async def _run_rows(self, rows: Iterable[Tuple[Hashable, Any]], finished: Set[Any], report: BatchReport,
+                        output_path: str, resume: bool,
+                        run_row: Callable[[Any, Any, TextIO, BatchReport], Awaitable[None]]) -> BatchReport:
+        """Run `run_row(key, row, output_file, report)` for every row whose key is not in `finished`."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks: Set[asyncio.Task] = set()
+        start = time.perf_counter()
+        progress_task = asyncio.ensure_future(self._report_progress(report, start))
+
+        try:
+            with open(output_path, 'a' if resume else 'w', encoding='utf-8') as output_file:
+                if resume and output_file.tell() > 0 and not self._ends_with_newline(output_path):
+                    output_file.write("\n") # Terminate a line cut off by an interrupted run
+
+                for key, row in rows:
+                    if key in finished:
+                        report.skipped += 1
+                        continue
+
+                    # Acquire before creating the task so only `concurrency` rows are ever in flight
+                    await semaphore.acquire()
+                    task = asyncio.ensure_future(run_row(key, row, output_file, report))
+                    tasks.add(task)
+                    task.add_done_callback(lambda t: (tasks.discard(t), semaphore.release()))
+
+                if tasks:
+                    await asyncio.gather(*tasks)
+        finally:
+            progress_task.cancel()
+
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    async def _run_row(self, index: int, line: str, output_file: TextIO, report: BatchReport):
+        """Execute a single row and append its result line."""
+        record: Dict[str, Any] = {"index": index}
+        started = time.perf_counter()
+        try:
+            row = json.loads(line)
+            record["id"] = row.get("id")
+            messages = row.get("messages") or [{"role": "user", "content": str(row.get("prompt", ""))}]
+            snapshot = self.settings.snapshot
+            model = str(row.get("model") or snapshot.chat_model)
+            temperature_setting = row.get("temperature")
+            temperature = float(temperature_setting) if isinstance(temperature_setting, (float, int)) else snapshot.chat_temperature
+
+            response_json = await self.api_client.chat_completion(messages=messages, model=model, temperature=temperature)
+            content = self._extract_content(response_json)
+            if content is None:
+                record["error"] = "No usable response from provider"
+            else:
+                record["response"] = content
+                if isinstance(response_json, dict) and response_json.get("usage"):
+                    record["usage"] = response_json["usage"]
+        except json.JSONDecodeError as e:
+            record["error"] = f"Invalid input line: {e}"
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+
+        self._write_record(record, started, output_file, report)
+
+    def _write_record(self, record: Dict[str, Any], started: float, output_file: TextIO, report: BatchReport):
+        """Count a finished row and append its result line."""
+        latency = time.perf_counter() - started
+        record["latency"] = round(latency, 4)
+        if "error" in record:
+            report.failed += 1
+        else:
+            report.succeeded += 1
+            report.latencies.append(latency)
+
+        # Single event loop thread, so whole-line writes never interleave
+        output_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        output_file.flush()
+
+    def _extract_content(self, response_json: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Pull the assistant message text out of a chat completion response."""
+        if not isinstance(response_json, dict):
+            return None
+        choices = response_json.get("choices")
+        if not isinstance(choices, list) or not choices:
+            return None
+        message = choices[0].get("message") if isinstance(choices[0], dict) else None
+        content = message.get("content") if isinstance(message, dict) else None
+        return content if isinstance(content, str) else None
+
+    def _load_finished(self, output_path: str, key: str) -> Set[Any]:
+        """Read the checkpoint (previous output) and return the `key` values of rows that succeeded."""
+        finished: Set[Any] = set()
+        if not os.path.exists(output_path):
+            return finished
+        with open(output_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue # A partially written last line from an interrupted run
+                if isinstance(record, dict) and isinstance(record.get(key), (int, str)) and "error" not in record:
+                    finished.add(record[key])
+        return finished
+
+    def _count_rows(self, input_path: str) -> int:
+        with open(input_path, 'r', encoding='utf-8') as f:
+            return sum(1 for line in f if line.strip())
+
+    def _ends_with_newline(self, path: str) -> bool:
+        with open(path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    async def _report_progress(self, report: BatchReport, start: float):
+        """Print progress, throughput and tail latency every `progress_interval` seconds."""
+        while True:
+            await asyncio.sleep(self.progress_interval)
+            elapsed = time.perf_counter() - start
+            done = report.completed + report.skipped
+            rate = report.completed / elapsed if elapsed > 0 else 0.0
+            p95 = report.percentile(95)
+            p95_text = f"{p95:.2f}s" if p95 is not None else "-"
+            print(f"[batch] {done}/{report.total} rows done ({report.failed} failed) | {rate:.2f} req/s | p95 {p95_text}")
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.webp')
+
+def find_images(source: str) -> List[str]:
+    """List the image files under a directory (recursively) or matching a glob, sorted."""
+    if os.path.isdir(source):
+        paths = [
+            os.path.join(root, name)
+            for root, _, names in os.walk(source)
+            for name in names
+        ]
+    else:
+        paths = glob.glob(source, recursive=True)
+    return sorted(path for path in paths if path.lower().endswith(IMAGE_EXTENSIONS) and os.path.isfile(path))
+
+class VisionBatchRunner(BatchRunner):
+    """Runs one vision prompt over every image in a directory or glob.
+
+    Images go through `APIClient.analyze_image`, so downscaling and re-encoding
+    happen in the image process pool (overlapping with the requests in flight)
+    and repeated images reuse their cached upload. Output lines are keyed by
+    `path`, which is also what a resumed run skips on.
+    """
+    def __init__(self, api_client: APIClient, settings: Settings, prompt: str,
+                 detail: Optional[Literal['auto', 'low', 'high']] = None, concurrency: Optional[int] = None):
+        super().__init__(api_client, settings, concurrency)
+        self.prompt = prompt
+        self.detail = detail
+
+    async def run(self, input_path: str, output_path: str, resume: bool = True) -> BatchReport:
+        """Analyze every image matched by `input_path` (directory or glob), appending results to `output_path`."""
+        paths = find_images(input_path)
+        finished = self._load_finished(output_path, "path") if resume else set()
+        report = BatchReport(total=len(paths))
+        rows = ((path, index) for index, path in enumerate(paths))
+        return await self._run_rows(rows, finished, report, output_path, resume, self._run_image)
+
+    async def _run_image(self, path: str, index: int, output_file: TextIO, report: BatchReport):
+        """Analyze a single image and append its result line."""
+        record: Dict[str, Any] = {"index": index, "path": path}
+        started = time.perf_counter()
+        try:
+            content = await self.api_client.analyze_image(path, prompt=self.prompt, detail=self.detail)
+            if content is None:
+                record["error"] = "No usable response from provider"
+            else:
+                record["response"] = content
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+
+        self._write_record(record, started, output_file, report)
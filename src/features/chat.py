@@ -1,20 +1,42 @@
-from typing import List, Dict, Any, Optional, Sequence
-from openai.types.chat import ChatCompletionMessageParam
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Sequence, Tuple, AsyncIterator
 from ..core.api_client import APIClient
 from ..core.settings import Settings
 
+if TYPE_CHECKING:
+    from openai.types.chat import ChatCompletionMessageParam
+
+# Message kinds, one byte per message in ChatManager.message_kinds
+MESSAGE_NORMAL = 0
+MESSAGE_SYSTEM = 1
+MESSAGE_IMAGE_REQUEST = 2 # "/image <description>" from the user
+MESSAGE_IMAGE_RESULT = 3 # "Image URL: ..." (or older "I've generated an image") from the assistant
+
+def classify_message(role: Any, content: Any) -> int:
+    """Return the MESSAGE_* kind of a conversation message."""
+    if role == "system":
+        return MESSAGE_SYSTEM
+    if not isinstance(content, str):
+        return MESSAGE_NORMAL
+    if role == "user" and content.startswith("/image"):
+        return MESSAGE_IMAGE_REQUEST
+    if content.startswith("Image URL:") or "I've generated an image" in content:
+        return MESSAGE_IMAGE_RESULT
+    return MESSAGE_NORMAL
+
 class ChatManager:
     def __init__(self, api_client: APIClient, settings: Settings):
         self.api_client = api_client
         self.settings = settings
-        self.conversation: List[ChatCompletionMessageParam] = [
+        self.conversation: List['ChatCompletionMessageParam'] = [
             {"role": "system", "content": "You are a helpful assistant."}
         ]
+        # Kind of each conversation message (MESSAGE_*), classified once when it is added
+        self.message_kinds = bytearray([MESSAGE_SYSTEM])
 
     def add_message(self, role: str, content: str):
         """Add a message to the conversation history."""
         # Don't add system messages for o1-preview model
-        if role == "system" and self.settings.get("chat_settings", "model") == "o1-preview":
+        if role == "system" and self.settings.snapshot.chat_model == "o1-preview":
             return
         # Ensure content is a string, as ChatCompletionMessageParam expects str for content
         # However, the type hint List[ChatCompletionMessageParam] should guide usage
@@ -23,23 +45,25 @@ class ChatManager:
         #     content = str(content) # Or handle error
         self.conversation.append({"role": role, "content": content} # type: ignore
         )
+        self.message_kinds.append(classify_message(role, content))
 
-    async def get_response(self, user_input: str) -> Optional[str]: # async def로 변경
-        """Get response from the AI for user input asynchronously."""
-        self.add_message("user", user_input)
-        
-        model_setting = self.settings.get("chat_settings", "model")
-        # Ensure model_setting is a string, provide a default or raise error if None/invalid
-        model = str(model_setting) if model_setting is not None else "gpt-3.5-turbo" # Example default
-
-        temperature_setting = self.settings.get("chat_settings", "temperature")
-        # Ensure temperature_setting is float, provide a default or raise error if None/invalid
-        temperature = float(temperature_setting) if isinstance(temperature_setting, (float, int)) else 1.0
+    def _prepare_request(self) -> Tuple[List['ChatCompletionMessageParam'], str, float]:
+        """Resolve the messages, model and temperature for the next API call."""
+        # Typed, pre-validated values from the settings snapshot (defaults applied at load time)
+        snapshot = self.settings.snapshot
+        model = snapshot.chat_model
+        temperature = snapshot.chat_temperature
         
         messages_for_api = self.conversation
-        if model.startswith('o1-'): # Simplified check for o1 models based on previous logic
+        if snapshot.is_o1_model: # Simplified check for o1 models based on previous logic
             messages_for_api = [msg for msg in self.conversation if msg.get("role") != "system"]
             temperature = 1.0  # o1-preview only supports temperature=1
+        return messages_for_api, model, temperature
+
+    async def get_response(self, user_input: str) -> Optional[str]: # async def로 변경
+        """Get response from the AI for user input asynchronously."""
+        self.add_message("user", user_input)
+        messages_for_api, model, temperature = self._prepare_request()
         
         try:
             response_json = await self.api_client.chat_completion(
@@ -75,6 +99,23 @@ class ChatManager:
             print(f"Error in ChatManager.get_response: {e}")
             return None
 
+    async def stream_response(self, user_input: str) -> AsyncIterator[str]:
+        """Stream the AI response for user input, recording the full reply when done."""
+        self.add_message("user", user_input)
+        messages_for_api, model, temperature = self._prepare_request()
+
+        parts: List[str] = []
+        async for delta in self.api_client.chat_completion_stream(
+            messages=messages_for_api, # type: ignore
+            model=model,
+            temperature=temperature
+        ):
+            parts.append(delta)
+            yield delta
+
+        if parts:
+            self.add_message("assistant", "".join(parts))
+
     def format_conversation(self, messages: Sequence[Dict[str, str]]) -> str:
         """Format conversation messages for context."""
         formatted = []
@@ -95,19 +136,13 @@ class ChatManager:
                 formatted.append(f"{role}: {content}")
         return "\n".join(formatted)
 
-    def get_recent_context(self, max_context: Optional[int] = None) -> Sequence[ChatCompletionMessageParam]: # Changed return type to Sequence
+    def get_recent_context(self, max_context: Optional[int] = None) -> Sequence['ChatCompletionMessageParam']: # Changed return type to Sequence
         """Get recent conversation context."""
+        snapshot = self.settings.snapshot
         if max_context is None:
-            max_context_setting = self.settings.get("chat_settings", "max_conversation_history")
-            if not isinstance(max_context_setting, int) or max_context_setting <= 0:
-                max_context = 10 # Default to 10 if setting is invalid, not found, or non-positive
-            else:
-                max_context = max_context_setting
-        
-        current_model_setting = self.settings.get("chat_settings", "model")
-        current_model = str(current_model_setting) if current_model_setting is not None else ""
+            max_context = snapshot.max_conversation_history # Already defaults to 10 if invalid
         
-        if current_model.startswith("o1-"):
+        if snapshot.is_o1_model:
             messages_to_return = [msg for msg in self.conversation if msg.get("role") != "system"]
         else:
             messages_to_return = list(self.conversation) # Make a copy
@@ -1,6 +1,8 @@
 import asyncio
+from collections import OrderedDict
 from ..core.api_client import APIClient
 from ..core.settings import Settings
+from ..core.image_processing import shutdown_image_pool
 from .chat import ChatManager
 from .image import ImageManager
 from typing import Optional, Literal, cast
@@ -9,25 +11,43 @@ class MainController:
     """Main controller for the application."""
     def __init__(self, settings: Settings, event_loop: asyncio.AbstractEventLoop):
         self.settings = settings
-        self.api_client = APIClient()
+        self.api_client = APIClient(settings)
         self.chat_manager = ChatManager(self.api_client, settings)
         self.image_manager = ImageManager(self.api_client, settings)
         self.event_loop = event_loop
+        # Per-client conversations for server mode (session id -> ChatManager), least recently used first
+        self.sessions: "OrderedDict[str, ChatManager]" = OrderedDict()
+        max_sessions_setting = settings.get("server_settings", "max_sessions")
+        self.max_sessions = max_sessions_setting if isinstance(max_sessions_setting, int) and max_sessions_setting > 0 else 256
+
+    def get_session_chat_manager(self, session_id: str) -> ChatManager:
+        """Return the ChatManager for a client session, creating it on first use.
+
+        All sessions share this controller's APIClient, so upstream connections are pooled.
+        """
+        chat_manager = self.sessions.get(session_id)
+        if chat_manager is None:
+            chat_manager = ChatManager(self.api_client, self.settings)
+            self.sessions[session_id] = chat_manager
+            while len(self.sessions) > self.max_sessions:
+                self.sessions.popitem(last=False) # Evict the least recently used session
+        else:
+            self.sessions.move_to_end(session_id)
+        return chat_manager
 
     async def handle_chat_message(self, message: str) -> Optional[str]:
         """Handle a chat message."""
         # Vision 명령어 처리
         if message.startswith("/vision"):
-            return self._handle_vision_command(message)
+            return await self._handle_vision_command(message)
             
         return await self.chat_manager.get_response(message)
     
-    def _handle_vision_command(self, message: str) -> str:
+    async def _handle_vision_command(self, message: str) -> str:
         """
         Handle vision command for image analysis.
         Format: /vision <url_or_path> [prompt] [--detail=<auto|low|high>]
         """
-        raise NotImplementedError("이미지 비전 기능은 현재 비활성화되어 있습니다.")
         # Remove command prefix and split arguments
         args = message[7:].strip().split()
         if not args:
@@ -60,7 +80,7 @@ class MainController:
         
         # Analyze image
         try:
-            result = self.image_manager.analyze_image(
+            result = await self.image_manager.analyze_image(
                 input_source=image_source,
                 prompt=prompt,
                 detail=detail
@@ -77,3 +97,8 @@ class MainController:
     def cleanup(self):
         """Clean up resources."""
         pass  # Add cleanup if needed
+
+    async def aclose(self):
+        """Release async resources (pooled upstream connections, image worker processes)."""
+        await self.api_client.close()
+        shutdown_image_pool()
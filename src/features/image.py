@@ -1,16 +1,37 @@
-from typing import Optional, List, Dict, Literal, Sequence
-from openai.types.chat import ChatCompletionMessageParam
+from typing import TYPE_CHECKING, Callable, Optional, List, Dict, Literal, Sequence, Tuple
 from ..core.api_client import APIClient
 from ..core.settings import Settings
+from ..core.image_store import ImageStore
+from ..core.image_processing import get_image_pool, make_thumbnail
+from ..core.disk_cache import DiskCache, get_shared_cache
+from .chat import MESSAGE_IMAGE_REQUEST, MESSAGE_IMAGE_RESULT, MESSAGE_SYSTEM, classify_message
+import asyncio
+import base64
+import binascii
+import os
 import re
 from pathlib import Path
 
+if TYPE_CHECKING:
+    from openai.types.chat import ChatCompletionMessageParam
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count without a tokenizer: ~4 ASCII characters per token, one per other character (e.g. Hangul)."""
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return ascii_chars // 4 + (len(text) - ascii_chars) + 1
+
 class ImageManager:
     def __init__(self, api_client: APIClient, settings: Settings):
         self.api_client = api_client
         self.settings = settings
+        # Local copies of generated images (cli_settings.save_images_locally), so the view never re-fetches them
+        self.image_store = ImageStore.from_settings(settings)
+        thumbnail_size = settings.get("cli_settings", "thumbnail_size")
+        self.thumbnail_size = thumbnail_size if isinstance(thumbnail_size, int) and thumbnail_size > 0 else 384
+        # Enhanced prompts by request hash, shared across runs and processes
+        self.prompt_cache: DiskCache = get_shared_cache(settings)
 
-    def analyze_image(self, input_source: str, prompt: Optional[str] = None, detail: Optional[Literal['auto', 'low', 'high']] = None) -> Optional[str]:
+    async def analyze_image(self, input_source: str, prompt: Optional[str] = None, detail: Optional[Literal['auto', 'low', 'high']] = None) -> Optional[str]:
         """
         Analyze an image from URL or local file path.
         
@@ -46,7 +67,7 @@ class ImageManager:
         
         try:
             # Vision API 호출
-            return self.api_client.analyze_image(
+            return await self.api_client.analyze_image(
                 image_source=input_source,
                 prompt=prompt or "이 이미지를 자세히 설명해주세요.",
                 detail=detail
@@ -55,68 +76,39 @@ class ImageManager:
             print(f"Error analyzing image: {str(e)}")
             return None
 
-    def generate_with_context(self, prompt: str, conversation: List[Dict[str, str]]) -> Optional[str]:
-        """Generate image with conversation context."""
-        max_context = self.settings.get("image_settings", "max_context_history")
-        use_raw_prompt = self.settings.get("image_settings", "use_raw_prompt")
+    async def generate_with_context(self, prompt: str, conversation: List[Dict[str, str]], n: Optional[int] = None,
+                                    on_image: Optional[Callable[[int, str, Optional[str]], None]] = None,
+                                    message_kinds: Optional[Sequence[int]] = None) -> List[str]:
+        """Generate `n` images with conversation context.
+
+        Variants are requested concurrently; `on_image(index, url, thumbnail_url)` is
+        called as each one arrives. With local saving on, each image is downloaded in
+        the background and handed over as a file:// URL together with a WebP preview
+        (thumbnail_url is None otherwise). Returns the URLs in arrival order (empty if
+        every request failed).
+
+        `message_kinds` (e.g. ChatManager.message_kinds) saves re-classifying the
+        messages; without it they are classified on the fly.
+        """
+        snapshot = self.settings.snapshot
+        variants = n if n is not None else snapshot.image_variants
+        max_context = snapshot.image_max_context_history
+        use_raw_prompt = snapshot.image_use_raw_prompt
         
         # Normalize prompt (remove /image prefix if present)
         current_prompt = prompt[7:].strip() if prompt.startswith("/image ") else prompt
         
         # Get conversation context
-        recent_conversation = conversation[-max_context:]
-        
-        # Debug: show all messages in conversation
-        print("\n대화 컨텍스트 내용:")
-        for i, msg in enumerate(recent_conversation):
-            if msg["role"] == "user":
-                print(f"{i}: User: {msg['content'][:80]}{'...' if len(msg['content']) > 80 else ''}")
-            elif msg["role"] == "assistant":
-                print(f"{i}: AI: {msg['content'][:50]}{'...' if len(msg['content']) > 50 else ''}")
-        
-        # Get previous image requests for context
-        previous_image_requests = []
-        
-        # Go through conversation to find previous image requests (recent to old)
-        for msg in reversed(recent_conversation):
-            if msg["role"] == "user" and msg["content"].startswith("/image "):
-                # Extract the content after "/image "
-                image_req = msg["content"][7:].strip()
-                
-                # Don't include the current prompt
-                if image_req and image_req != current_prompt:
-                    previous_image_requests.insert(0, image_req)  # Add at beginning to preserve order
-        
-        # Limit to last 3 previous requests for clarity
-        previous_image_requests = previous_image_requests[-3:] if len(previous_image_requests) > 3 else previous_image_requests
+        if message_kinds is not None and len(message_kinds) != len(conversation):
+            message_kinds = None
+        window_start = max(0, len(conversation) - max_context)
+        previous_image_requests, relevant_messages = self._scan_context(
+            conversation, message_kinds, window_start, current_prompt
+        )
+        print(f"\n대화 컨텍스트: 최근 {len(conversation) - window_start}개 메시지")
         
         # --- Create Conversation Summary (for both raw and enhanced prompt context) ---
         conversation_summary = ""
-        # Take last ~5 messages for summary, excluding system/image results
-        summary_context_limit = 5 
-        relevant_messages = []
-        for msg in reversed(recent_conversation):
-            role = msg.get("role")
-            content = msg.get("content", "")
-            # Skip system, image URLs/results, and the current image command itself
-            if (role == "system" or 
-                "Image URL:" in content or 
-                "I've generated an image" in content or 
-                (role == "user" and content.startswith("/image") and content[7:].strip() == current_prompt)):
-                continue
-            # Reformat image requests for context
-            if role == "user" and content.startswith("/image"):
-                 image_description = content[7:].strip()
-                 if image_description:
-                     relevant_messages.insert(0, f"User (requested image): {image_description}")
-            elif role in ["user", "assistant"]:
-                 # Limit content length for summary
-                 summary_content = content[:100] + ('...' if len(content) > 100 else '')
-                 relevant_messages.insert(0, f"{role.capitalize()}: {summary_content}")
-            
-            if len(relevant_messages) >= summary_context_limit:
-                break
-        
         if relevant_messages:
             conversation_summary = "Conversation context: \n" + "\n".join(relevant_messages) + "\n\n"
         # --- End Conversation Summary ---
@@ -144,7 +136,9 @@ class ImageManager:
         # If not using raw prompt, enhance with GPT
         if not use_raw_prompt:
             try:
-                enhanced_prompt = self._enhance_prompt_with_gpt(recent_conversation, current_prompt, previous_image_requests)
+                enhanced_prompt = await self._enhance_prompt_with_gpt(
+                    conversation, message_kinds, window_start, current_prompt, previous_image_requests
+                )
                 if enhanced_prompt:
                     final_prompt = enhanced_prompt # Overwrite with enhanced prompt
                     print("\n향상된 프롬프트 사용:", final_prompt)
@@ -154,46 +148,166 @@ class ImageManager:
                 pass
         # No else block needed here, final_prompt already holds the base combination
         
-        # Generate image with final prompt
-        return self.api_client.generate_image(
-            prompt=final_prompt,
-            model=self.settings.get("image_settings", "model"),
-            size=self.settings.get("image_settings", "size"),
-            quality=self.settings.get("image_settings", "quality")
-        )
+        # Generate the variants with the final prompt, handing each one over as soon as it arrives
+        urls: List[str] = []
+
+        async def deliver(index: int, url: str):
+            shown_url, thumbnail_url = url, None
+            path = await self.cache_image(url)
+            if path is not None:
+                shown_url = ImageStore.file_url(path)
+                thumbnail_path = await self.thumbnail(path)
+                thumbnail_url = ImageStore.file_url(thumbnail_path) if thumbnail_path else None
+            urls.append(shown_url)
+            if on_image is not None:
+                on_image(index, shown_url, thumbnail_url)
+
+        # Downloads overlap with the variants still being generated
+        deliveries: List[asyncio.Future] = []
+        try:
+            async for index, url in self.api_client.generate_image(
+                prompt=final_prompt,
+                model_name=snapshot.image_model,
+                size=snapshot.image_size, # type: ignore
+                quality=snapshot.image_quality, # type: ignore
+                n=variants
+            ):
+                if url is not None:
+                    deliveries.append(asyncio.ensure_future(deliver(index, url)))
+            await asyncio.gather(*deliveries)
+        finally:
+            for delivery in deliveries:
+                delivery.cancel()
+        return urls
+
+    async def cache_image(self, url: str) -> Optional[str]:
+        """Store an image URL (or data URL) locally and return its path, or None if saving is off or failed."""
+        store = self.image_store
+        if store is None:
+            return None
+        loop = asyncio.get_running_loop()
+        # The URL index is SQLite: look it up off the event loop, like the write in put()
+        path = await loop.run_in_executor(None, store.lookup, url)
+        if path is None:
+            try:
+                if url.startswith("data:"):
+                    data: Optional[bytes] = base64.b64decode(url.split(",", 1)[1], validate=True)
+                else:
+                    data = await self.api_client.download_image(url)
+            except (asyncio.TimeoutError, binascii.Error, IndexError) as e:
+                # The caller shows the original URL instead; one bad image must not fail the whole generation
+                print(f"Warning: could not fetch image for local copy: {e!r}")
+                return None
+            if not data:
+                return None
+            try:
+                # Hashing and writing a multi-megabyte file stays off the event loop
+                path = await loop.run_in_executor(None, store.put, data, url)
+            except OSError as e:
+                print(f"Warning: could not save image locally: {e}")
+                return None
+        return path
+
+    async def thumbnail(self, path: str) -> Optional[str]:
+        """Return the WebP preview of a stored image, building it in the image process pool if needed."""
+        store = self.image_store
+        if store is None:
+            return None
+        thumbnail_path = store.thumbnail_path(path)
+        if store.path_for(os.path.basename(thumbnail_path)) is not None and os.path.exists(path):
+            return thumbnail_path
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                get_image_pool(), make_thumbnail, path, thumbnail_path, self.thumbnail_size
+            )
+        except Exception as e:
+            print(f"Warning: could not create thumbnail for {path}: {e}")
+            return None
+        store.track(thumbnail_path)
+        return thumbnail_path
         
-    def _enhance_prompt_with_gpt(self, conversation: Sequence[Dict[str, str]], current_prompt: str, 
+    def _scan_context(self, conversation: Sequence[Dict[str, str]], message_kinds: Optional[Sequence[int]],
+                      window_start: int, current_prompt: str,
+                      max_requests: int = 3, max_summary: int = 5) -> Tuple[List[str], List[str]]:
+        """Collect previous image requests and summary lines in one reverse pass.
+
+        Scanning stops as soon as both lists are full, so older messages are never
+        visited. Both lists are returned oldest first.
+        """
+        previous_image_requests: List[str] = []
+        relevant_messages: List[str] = []
+        for i in range(len(conversation) - 1, window_start - 1, -1):
+            msg = conversation[i]
+            role = msg.get("role")
+            content = msg.get("content", "")
+            kind = message_kinds[i] if message_kinds is not None else classify_message(role, content)
+            # Skip system messages and image results
+            if kind == MESSAGE_SYSTEM or kind == MESSAGE_IMAGE_RESULT:
+                continue
+            if kind == MESSAGE_IMAGE_REQUEST:
+                image_description = content[7:].strip()
+                # The current image command itself is neither a previous request nor context
+                if not image_description or image_description == current_prompt:
+                    continue
+                if len(previous_image_requests) < max_requests:
+                    previous_image_requests.append(image_description)
+                if len(relevant_messages) < max_summary:
+                    relevant_messages.append(f"User (requested image): {image_description}")
+            elif role in ("user", "assistant") and len(relevant_messages) < max_summary:
+                # Limit content length for summary
+                summary_content = content[:100] + ('...' if len(content) > 100 else '')
+                relevant_messages.append(f"{role.capitalize()}: {summary_content}")
+            if len(previous_image_requests) >= max_requests and len(relevant_messages) >= max_summary:
+                break
+        previous_image_requests.reverse()
+        relevant_messages.reverse()
+        return previous_image_requests, relevant_messages
+
+    async def _enhance_prompt_with_gpt(self, conversation: Sequence[Dict[str, str]], message_kinds: Optional[Sequence[int]],
+                               window_start: int, current_prompt: str, 
                                previous_image_requests: List[str]) -> Optional[str]:
-        """Enhance the image prompt using GPT."""
+        """Enhance the image prompt with the prompt processor model.
+
+        Only as much recent conversation as fits `prompt_processor.max_context_tokens`
+        is sent. Results are cached by a hash of the full request, so repeating a
+        request in the same context costs no round-trip.
+        """
+        snapshot = self.settings.snapshot
         # Create context message for previous requests
         previous_requests_context = ""
         if previous_image_requests:
             previous_requests_context = "Previous image requests: " + "; ".join(previous_image_requests) + ". "
         
-        # Prepare conversation history for the prompt enhancement request
-        # Filter out system messages if needed, depending on the model (similar logic to ChatManager might be needed)
-        # For simplicity now, let's pass the recent conversation directly.
-        # We might need to format/filter this further later.
-        history_messages = list(conversation) # Make a copy to avoid modifying the original
+        history_messages = self._budget_context(
+            conversation, message_kinds, window_start, current_prompt, snapshot.prompt_processor_context_tokens
+        )
 
         # Create the final user prompt for enhancement request
         enhancement_request_prompt = f"{previous_requests_context}Based on the conversation context and previous image requests, create a detailed prompt for generating this image: {current_prompt}"
 
         # Construct messages for GPT: system + history + final user request
-        context_messages: List[ChatCompletionMessageParam] = [
-            {"role": "system", "content": "You are an expert image prompt creator. Your task is to create a detailed, descriptive prompt for DALL-E 3 image generation based on the conversation context and the user's specific request. Focus on visual elements mentioned in the conversation, maintaining the user's intent while adding descriptive details. Create a cohesive scene that captures the essence of what's being discussed."}
+        context_messages: List['ChatCompletionMessageParam'] = [
+            {"role": "system", "content": snapshot.prompt_processor_system_prompt or "You are an expert image prompt creator. Your task is to create a detailed, descriptive prompt for DALL-E 3 image generation based on the conversation context and the user's specific request. Focus on visual elements mentioned in the conversation, maintaining the user's intent while adding descriptive details. Create a cohesive scene that captures the essence of what's being discussed."}
         ]
         # Add conversation history
         context_messages.extend(history_messages) # type: ignore
         # Add the final user request
         context_messages.append({"role": "user", "content": enhancement_request_prompt})
+
+        model = snapshot.prompt_processor_model
+        temperature = snapshot.prompt_processor_temperature
+        cache_key = DiskCache.make_key("enhance", model, temperature, context_messages)
+        cached = self.prompt_cache.get("enhanced_prompts", cache_key)
+        if isinstance(cached, str):
+            print("\n향상된 프롬프트 캐시 사용")
+            return cached
         
         # Get enhanced prompt from GPT
         try:
-            response = self.api_client.chat_completion(
+            response = await self.api_client.chat_completion(
                 messages=context_messages,
-                model=self.settings.get("chat_settings", "model"),
-                temperature=self.settings.get("chat_settings", "temperature")
+                model=model,
+                temperature=temperature
             )
             
             # Extract content safely
@@ -208,16 +322,42 @@ class ImageManager:
             else:
                 return None
             
-            # Removed cli_settings check as it was removed from settings
-            # We might add a specific setting for this later if needed
-            # print("\nEnhanced prompt:", enhanced_prompt)
-                
+            if isinstance(enhanced_prompt, str) and enhanced_prompt:
+                self.prompt_cache.set("enhanced_prompts", cache_key, enhanced_prompt)
             return enhanced_prompt
             
         except Exception as e:
             print(f"Error enhancing prompt with GPT: {e}")
             return None
 
+    def _budget_context(self, conversation: Sequence[Dict[str, str]], message_kinds: Optional[Sequence[int]],
+                        window_start: int, current_prompt: str, max_tokens: int) -> List[Dict[str, str]]:
+        """Return the most recent user/assistant messages that fit in `max_tokens` (oldest first).
+
+        System messages, image results and the current request are left out, and
+        image requests are sent as their description.
+        """
+        selected: List[Dict[str, str]] = []
+        used = 0
+        for i in range(len(conversation) - 1, window_start - 1, -1):
+            msg = conversation[i]
+            role = msg.get("role")
+            content = msg.get("content", "")
+            kind = message_kinds[i] if message_kinds is not None else classify_message(role, content)
+            if kind == MESSAGE_SYSTEM or kind == MESSAGE_IMAGE_RESULT or role not in ("user", "assistant") or not isinstance(content, str):
+                continue
+            if kind == MESSAGE_IMAGE_REQUEST:
+                content = content[7:].strip()
+                if not content or content == current_prompt:
+                    continue
+            cost = estimate_tokens(content)
+            if used + cost > max_tokens:
+                break
+            used += cost
+            selected.append({"role": role, "content": content})
+        selected.reverse()
+        return selected
+
     def _format_conversation(self, messages: List[Dict[str, str]]) -> str:
         """Format conversation messages for context."""
         formatted = []
@@ -1,4 +1,11 @@
-from .app import App
-from .main_window import MainWindow
+# Resolve exports lazily so importing the package does not load Qt/QtWebEngine up front
+__all__ = ['App', 'MainWindow']
 
-__all__ = ['App', 'MainWindow'] 
\ No newline at end of file
+def __getattr__(name):
+    if name == 'App':
+        from .app import App
+        return App
+    if name == 'MainWindow':
+        from .main_window import MainWindow
+        return MainWindow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
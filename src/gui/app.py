@@ -4,8 +4,9 @@ import sys
 import asyncio
 import qasync
 from qasync import QApplication
-from .main_window import MainWindow
 from ..core.settings import Settings
+from ..core.disk_cache import get_shared_cache
+from ..utils.text_formatter import TextFormatter
 from ..features.controllers import MainController
 
 class App:
@@ -15,7 +16,9 @@ class App:
         self.event_loop = None
         
         # Initialize core components
-        self.settings = Settings()
+        self.settings = Settings.shared()
+        if self.settings.get("cache_settings", "render_cache"):
+            TextFormatter.render_cache = get_shared_cache(self.settings)
         
         # Initialize controller
         # self.controller = MainController(self.settings)
@@ -30,9 +33,14 @@ class App:
 
         # 이제 event_loop가 있으니 Controller 생성 가능
         self.controller = MainController(self.settings, self.event_loop) 
+        # QtWebEngine is imported only now, when the window is built (see test_import_time.py)
+        from .main_window import MainWindow
         self.window = MainWindow(self.controller)
         
         self.window.show()
+
+        # Pick up settings.json edits without restarting the app
+        self.settings_watch_task = asyncio.ensure_future(self.settings.watch(), loop=self.event_loop)
         
         exit_code = 0
         try:
@@ -52,6 +60,8 @@ class App:
             if tasks:
                 self.event_loop.run_until_complete(wait_for_tasks_cancellation())
 
+            self.event_loop.run_until_complete(self.controller.aclose())
+
             if hasattr(self.event_loop, 'shutdown_asyncgens'):
                 self.event_loop.run_until_complete(self.event_loop.shutdown_asyncgens())
             
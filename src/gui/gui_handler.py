@@ -1,7 +1,8 @@
 from PyQt6.QtCore import QObject, pyqtSignal, QTimer # Added QTimer for potential debouncing/delay if needed
 from PyQt6.QtWidgets import QApplication, QFileDialog # Added QFileDialog
 from PyQt6.QtGui import QPageLayout, QPageSize
-from typing import TYPE_CHECKING, Any
+import os
+from typing import TYPE_CHECKING, Any, Optional
 from .workers import ChatWorker, ImageGenerationWorker, VisionWorker # Import workers
 from .dialogs import ProcessingDialog # Import ProcessingDialog
 from ..utils.text_formatter import TextFormatter # Import TextFormatter
@@ -75,28 +76,42 @@ class GuiHandler(QObject):
         self._start_worker(worker, "Assistant is thinking...")
 
     def _handle_image_command(self, command: str):
-        """Handles '/image' commands by starting an ImageGenerationWorker."""
-        raise NotImplementedError("이미지 생성 기능은 현재 비활성화되어 있습니다.")
-        prompt = command[6:].strip()
+        """Handles '/image [--n=<1-10>] <prompt>' commands by starting an ImageGenerationWorker."""
+        n = None
+        prompt_parts = []
+        for part in command[6:].strip().split():
+            if part.startswith("--n="):
+                value = part.split("=", 1)[1]
+                if not value.isdigit() or not 1 <= int(value) <= 10:
+                    self._format_and_append_response("❌ Input Error:", "--n must be a number between 1 and 10")
+                    return
+                n = int(value)
+            else:
+                prompt_parts.append(part)
+        prompt = " ".join(prompt_parts)
         if not prompt:
              # Use helper to show error in MainWindow (will now emit HTML)
              self._format_and_append_response("❌ Input Error:", "Please provide an image description")
              return
 
-        # Add user command to chat history *before* starting worker
-        self.controller.chat_manager.add_message("user", command)
+        # Add user command to chat history *before* starting worker (without flags, so it reads as plain context)
+        self.controller.chat_manager.add_message("user", f"/image {prompt}")
 
         worker = ImageGenerationWorker(
             self.controller.image_manager,
             prompt,
             self.controller.chat_manager.conversation,
-            self.controller.event_loop
+            self.controller.event_loop,
+            n=n,
+            message_kinds=self.controller.chat_manager.message_kinds
         )
+        worker.image_ready.connect(self._handle_image_ready)
         worker.response_ready.connect(self._handle_image_worker_response)
-        self._start_worker(worker, "Generating image with DALL-E...")
+        variants = n if n is not None else self.controller.settings.snapshot.image_variants
+        self._start_worker(worker, f"Generating {variants} image{'s' if variants > 1 else ''}...")
 
     def _handle_vision_command(self, command: str):
-        """Handles '/vision' commands by starting a VisionWorker."""
+        """Handles '/vision' commands by starting a VisionWorker (a file picker opens unless a local path exists)."""
         parts = command[7:].strip().split()
         if not parts:
             # Use helper to show error in MainWindow (will now emit HTML)
@@ -105,7 +120,7 @@ class GuiHandler(QObject):
 
         # Handle local file selection if needed
         image_source = parts[0]
-        if not image_source.startswith(('http://', 'https://')):
+        if not image_source.startswith(('http://', 'https://')) and not os.path.isfile(image_source):
             # For local path, show file dialog
             file_dialog = QFileDialog()
             file_dialog.setFileMode(QFileDialog.FileMode.ExistingFile) # Ensure only one file
@@ -174,16 +189,22 @@ class GuiHandler(QObject):
             self._handle_unexpected_response(response)
         # Input re-enabled via _cleanup_worker
 
-    def _handle_image_worker_response(self, response: Any):
-        """Handles successful response from ImageGenerationWorker (expects URL)."""
-        if isinstance(response, str) and response.startswith("http"):
-            # Add the image URL to the conversation history via controller
-            self.controller.chat_manager.add_message("assistant", f"Image URL: {response}")
-            print(f"\n[DEBUG] Adding image URL to conversation: {response[:30]}...")
-            print(f"[DEBUG] Conversation length after image: {len(self.controller.chat_manager.conversation)}")
+    def _handle_image_ready(self, index: int, url: str, thumbnail_url: str):
+        """Shows one generated image as soon as it arrives from ImageGenerationWorker."""
+        # Add the image URL to the conversation history via controller
+        # Inline base64 results are kept out of the history: they would be resent with every chat request
+        history_url = url if not url.startswith("data:") else "(inline image data)"
+        self.controller.chat_manager.add_message("assistant", f"Image URL: {history_url}")
+        print(f"\n[DEBUG] Adding image URL to conversation: {url[:30]}...")
 
-            # Use helper to format and append
-            self._format_and_append_response("🖼️ Image generated:", response, is_url=True)
+        # Use helper to format and append
+        self._format_and_append_response(f"🖼️ Image generated (#{index + 1}):", url, is_url=True, thumbnail_url=thumbnail_url or None)
+
+    def _handle_image_worker_response(self, response: Any):
+        """Handles completion of ImageGenerationWorker (expects the list of URLs already shown)."""
+        if isinstance(response, list):
+            if not response:
+                self._format_and_append_response("❌ Error:", "Image generation failed.")
         else:
             self._handle_unexpected_response(response)
         # Input re-enabled via _cleanup_worker
@@ -210,8 +231,12 @@ class GuiHandler(QObject):
         self._format_and_append_response("❌ System Message:", "Received unexpected response from assistant.")
 
     # --- Helper Methods ---
-    def _format_and_append_response(self, title: str, content: str, is_url: bool = False, format_markdown: bool = False):
-        """Formats the response as an HTML fragment and emits the signal."""
+    def _format_and_append_response(self, title: str, content: str, is_url: bool = False, format_markdown: bool = False,
+                                     thumbnail_url: Optional[str] = None):
+        """Formats the response as an HTML fragment and emits the signal.
+
+        With `thumbnail_url`, the transcript shows the small preview and links to the original.
+        """
         separator_html = "<hr style='border: none; border-top: 1px solid #ccc; margin: 10px 0;'>"
         # Escape title just in case, though usually system-controlled
         title_html = f"<div><b>{TextFormatter.escape_html(title)}</b></div>"
@@ -220,7 +245,15 @@ class GuiHandler(QObject):
         if is_url:
             escaped_url = TextFormatter.escape_html(content)
             # Basic image check (can be improved)
-            if any(ext in escaped_url.lower() for ext in ['.png', '.jpg', '.jpeg', '.gif', '.webp']):
+            if thumbnail_url:
+                 # Chromium decodes only the small WebP preview; clicking opens the full-size original
+                 escaped_thumbnail = TextFormatter.escape_html(thumbnail_url)
+                 content_html = f'<a href="{escaped_url}" target="_blank"><img src="{escaped_thumbnail}" alt="Generated Image" loading="lazy" decoding="async" style="max-width: 300px; height: auto; display: block; margin-top: 5px;"></a><br>' \
+                               f'<a href="{escaped_url}" target="_blank" style="color: blue; text-decoration: underline; font-size: small;">Open full size</a><br><br>'
+            elif escaped_url.startswith("data:image/"):
+                 # Inline base64 image (models without URL output): no point printing the data as a link
+                 content_html = f'<img src="{escaped_url}" alt="Generated Image" style="max-width: 300px; height: auto; display: block; margin-top: 5px;"><br>'
+            elif any(ext in escaped_url.lower() for ext in ['.png', '.jpg', '.jpeg', '.gif', '.webp']):
                  content_html = f'<a href="{escaped_url}" target="_blank"><img src="{escaped_url}" alt="Generated Image" style="max-width: 300px; height: auto; display: block; margin-top: 5px;"></a><br>' \
                                f'<a href="{escaped_url}" target="_blank" style="color: blue; text-decoration: underline; font-size: small;">{escaped_url}</a><br><br>'
             else:
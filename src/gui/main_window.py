@@ -287,7 +287,8 @@ class MainWindow(QMainWindow):
 (function() {{ // Start IIFE
     let chatBody = document.getElementById('chat-body');
     if (chatBody) {{
-        chatBody.innerHTML += {js_escaped_fragment}; // Python inserts variable here
+        // insertAdjacentHTML keeps existing nodes, so earlier images are not reloaded on every append
+        chatBody.insertAdjacentHTML('beforeend', {js_escaped_fragment}); // Python inserts variable here
         // Queue MathJax processing
         if (typeof MathJax !== 'undefined' && MathJax.Hub) {{
             MathJax.Hub.Queue(["Typeset", MathJax.Hub, chatBody]);
@@ -23,6 +23,7 @@ class APIWorker(QThread):
         self.args = args
         self.kwargs = kwargs
         self._is_cancelled = False
+        self._future = None
 
     def run(self):
         """Execute the API call in a separate thread."""
@@ -34,11 +35,11 @@ class APIWorker(QThread):
                     self.error_occurred.emit(error_msg)
                     return
 
-                future = asyncio.run_coroutine_threadsafe(
+                self._future = asyncio.run_coroutine_threadsafe(
                     self.api_call(*self.args, **self.kwargs),
                     self.main_event_loop
                 )
-                result = future.result()
+                result = self._future.result()
             else:
                 result = self.api_call(*self.args, **self.kwargs)
             
@@ -51,20 +52,32 @@ class APIWorker(QThread):
                 self.error_occurred.emit(error_msg)
 
     def cancel(self):
-        """Mark the worker as cancelled."""
+        """Mark the worker as cancelled and stop its coroutine, if any."""
         self._is_cancelled = True
+        if self._future is not None:
+            self._future.cancel() # Cancels the task on the event loop, closing its in-flight requests
 
 class ImageGenerationWorker(APIWorker):
     """Worker thread specifically for image generation."""
-    def __init__(self, image_manager: ImageManager, prompt: str, conversation: list, main_event_loop: asyncio.AbstractEventLoop):
+    image_ready = pyqtSignal(int, str, str)  # (variant index, url, thumbnail url or ""), emitted as each variant arrives
+
+    def __init__(self, image_manager: ImageManager, prompt: str, conversation: list, main_event_loop: asyncio.AbstractEventLoop,
+                 n: Optional[int] = None, message_kinds: Optional[bytearray] = None):
         # Note: Passing the manager instance might be cleaner than passing the method
         super().__init__(
             image_manager.generate_with_context,
             main_event_loop, # 전달
             prompt,
-            conversation
+            conversation,
+            n=n,
+            on_image=self._emit_image,
+            message_kinds=message_kinds
         )
 
+    def _emit_image(self, index: int, url: str, thumbnail_url: Optional[str]):
+        if not self._is_cancelled:
+            self.image_ready.emit(index, url, thumbnail_url or "")
+
 class ChatWorker(APIWorker):
     """Worker thread for handling chat messages."""
     def __init__(self, controller: MainController, message: str, main_event_loop: asyncio.AbstractEventLoop):
@@ -6,17 +6,22 @@ listing available tools, and invoking tools with parameters. It also includes LL
 for AI-driven tool selection and invocation.
 """
 
-from mcp_sse_client.client import MCPClient, ToolDef, ToolParameter, ToolInvocationResult
+from mcp_sse_client.client import MCPClient, ToolDef, ToolParameter, ToolInvocationResult, ToolAttachment, ToolResultChunk
+from mcp_sse_client.catalog_cache import ToolCatalog, ToolCatalogCache
+from mcp_sse_client.router import MCPRouter
+from mcp_sse_client.result_cache import ToolResultCache
+from mcp_sse_client.tool_index import ToolPrefilter
 
 # Import LLM bridge classes for easier access
 try:
     from mcp_sse_client.llm_bridge import LLMBridge, OpenAIBridge, AnthropicBridge
     __all__ = [
-        "MCPClient", "ToolDef", "ToolParameter", "ToolInvocationResult",
+        "MCPClient", "ToolDef", "ToolParameter", "ToolInvocationResult", "ToolAttachment", "ToolResultChunk",
+        "ToolCatalog", "ToolCatalogCache", "MCPRouter", "ToolResultCache", "ToolPrefilter",
         "LLMBridge", "OpenAIBridge", "AnthropicBridge"
     ]
 except ImportError:
     # LLM dependencies might not be installed
-    __all__ = ["MCPClient", "ToolDef", "ToolParameter", "ToolInvocationResult"]
+    __all__ = ["MCPClient", "ToolDef", "ToolParameter", "ToolInvocationResult", "ToolAttachment", "ToolResultChunk", "ToolCatalog", "ToolCatalogCache", "MCPRouter", "ToolResultCache", "ToolPrefilter"]
 
 __version__ = "0.1.0"
@@ -0,0 +1,257 @@
+"""
+Tool catalog cache for MCP endpoints.
+
+Tool lists are cached per endpoint in memory and on disk with a TTL and a
+content hash. Cached catalogs are served immediately (so a cold start does not
+block on `list_tools`) and revalidated in the background; a persistent
+`MCPClient` session also triggers a refresh on `notifications/tools/list_changed`.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+from .client import ToolDef, ToolParameter
+
+
+def default_cache_dir() -> str:
+    """Return the catalog cache directory (MCP_SSE_CLIENT_CACHE_DIR or ~/.cache/mcp_sse_client)."""
+    return os.environ.get("MCP_SSE_CLIENT_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "mcp_sse_client")
+
+
+def tools_content_hash(tools: List[ToolDef]) -> str:
+    """Hash a tool list canonically, so identical catalogs get identical hashes.
+
+    Args:
+        tools: List of ToolDef objects
+
+    Returns:
+        Hex SHA-256 of the canonical JSON form of the tools
+    """
+    canonical = json.dumps([asdict(tool) for tool in tools], sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+_LIST_HASH_CACHE_SIZE = 32
+# id(tool list) -> (the list, ids of its ToolDefs, content hash); holding the list keeps its id from being reused
+_list_hashes: "OrderedDict[int, Tuple[List[ToolDef], Tuple[int, ...], str]]" = OrderedDict()
+
+
+def tools_version(tools: List[ToolDef]) -> str:
+    """tools_content_hash, computed once per tool list object.
+
+    Lists that are not a catalog's own (e.g. a bridge's `tools` set by hand)
+    would otherwise be re-serialized and hashed on every request. The memo is
+    keyed by the list's identity and the identities of its ToolDefs, so
+    replacing, adding or removing tools gets a new hash; ToolDefs are not
+    expected to be mutated in place.
+
+    Args:
+        tools: List of ToolDef objects
+
+    Returns:
+        Hex SHA-256 of the canonical JSON form of the tools
+    """
+    member_ids = tuple(map(id, tools))
+    cached = _list_hashes.get(id(tools))
+    if cached is not None and cached[0] is tools and cached[1] == member_ids:
+        _list_hashes.move_to_end(id(tools))
+        return cached[2]
+    content_hash = tools_content_hash(tools)
+    _list_hashes[id(tools)] = (tools, member_ids, content_hash)
+    if len(_list_hashes) > _LIST_HASH_CACHE_SIZE:
+        _list_hashes.popitem(last=False)
+    return content_hash
+
+
+@dataclass
+class ToolCatalog:
+    """A versioned tool list for one endpoint.
+
+    Attributes:
+        endpoint: Endpoint the tools were listed from
+        tools: List of ToolDef objects
+        content_hash: Hash of the tool definitions; doubles as the catalog version
+        fetched_at: Unix time the list was fetched from the server
+        routes: Route map of an MCPRouter ({routed name: [endpoint, server-side name]}), None for plain clients
+    """
+    endpoint: str
+    tools: List[ToolDef]
+    content_hash: str
+    fetched_at: float
+    routes: Optional[Dict[str, List[str]]] = None
+
+    @property
+    def version(self) -> str:
+        return self.content_hash
+
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+def _tool_from_dict(data: Dict[str, Any]) -> ToolDef:
+    return ToolDef(
+        name=data["name"],
+        description=data.get("description", ""),
+        parameters=[ToolParameter(**param) for param in data.get("parameters", [])],
+        metadata=data.get("metadata"),
+        identifier=data.get("identifier", ""),
+    )
+
+
+class ToolCatalogCache:
+    """Endpoint-keyed tool catalog cache with disk persistence and background refresh."""
+
+    def __init__(self, cache_dir: Optional[str] = None, ttl: float = 3600.0, persist: bool = True):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory for persisted catalogs (default: see default_cache_dir)
+            ttl: Seconds after which a catalog is refreshed in the background
+            persist: Whether to read/write catalogs on disk
+        """
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.ttl = ttl
+        self.persist = persist
+        self._catalogs: Dict[str, ToolCatalog] = {}
+        self._revalidated: Set[str] = set()  # Endpoints refreshed at least once in this process
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._subscribed: Set[int] = set()  # ids of clients whose change notifications we listen to
+
+    def _path(self, endpoint: str) -> str:
+        name = hashlib.sha256(endpoint.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.cache_dir, f"tools-{name}.json")
+
+    def _load_from_disk(self, endpoint: str) -> Optional[ToolCatalog]:
+        if not self.persist:
+            return None
+        try:
+            with open(self._path(endpoint), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("endpoint") != endpoint:
+                return None
+            return ToolCatalog(
+                endpoint=endpoint,
+                tools=[_tool_from_dict(tool) for tool in data["tools"]],
+                content_hash=data["content_hash"],
+                fetched_at=float(data["fetched_at"]),
+                routes=data.get("routes"),
+            )
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Warning: ignoring unreadable tool catalog cache for {endpoint}: {e}")
+            return None
+
+    def _save_to_disk(self, catalog: ToolCatalog):
+        if not self.persist:
+            return
+        path = self._path(catalog.endpoint)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "endpoint": catalog.endpoint,
+                    "content_hash": catalog.content_hash,
+                    "fetched_at": catalog.fetched_at,
+                    "tools": [asdict(tool) for tool in catalog.tools],
+                    "routes": catalog.routes,
+                }, f, default=str)
+            os.replace(tmp_path, path)  # Atomic, so concurrent readers never see a partial file
+        except OSError as e:
+            print(f"Warning: could not persist tool catalog for {catalog.endpoint}: {e}")
+
+    def current(self, endpoint: str) -> Optional[ToolCatalog]:
+        """Return the in-memory catalog for an endpoint without any I/O."""
+        return self._catalogs.get(endpoint)
+
+    def invalidate(self, endpoint: str):
+        """Forget the cached catalog for an endpoint (memory and disk)."""
+        self._catalogs.pop(endpoint, None)
+        self._revalidated.discard(endpoint)
+        if self.persist:
+            try:
+                os.remove(self._path(endpoint))
+            except OSError:
+                pass
+
+    async def get(self, client, force_refresh: bool = False) -> ToolCatalog:
+        """Return the catalog for `client.endpoint`, fetching only when nothing is cached.
+
+        Args:
+            client: MCPClient (or anything with `endpoint` and `list_tools()`)
+            force_refresh: Fetch from the server even if a cached catalog exists
+
+        Returns:
+            ToolCatalog for the endpoint
+        """
+        endpoint = client.endpoint
+        self._subscribe(client)
+        if force_refresh:
+            return await self.refresh(client)
+
+        catalog = self._catalogs.get(endpoint)
+        if catalog is None:
+            catalog = self._load_from_disk(endpoint)
+            if catalog is None:
+                return await self.refresh(client)
+            self._catalogs[endpoint] = catalog
+        if catalog.routes and hasattr(client, "restore_routes"):
+            client.restore_routes(catalog.routes)  # Keep the cached routed names pointing at their owners
+
+        # Serve what we have; revalidate in the background once per process and whenever stale
+        if endpoint not in self._revalidated or catalog.age() > self.ttl:
+            self.refresh_in_background(client)
+        return catalog
+
+    async def refresh(self, client) -> ToolCatalog:
+        """Fetch the tool list now and update memory/disk if the content changed."""
+        endpoint = client.endpoint
+        previous = self._catalogs.get(endpoint)
+        if previous is not None and previous.routes and hasattr(client, "restore_routes"):
+            client.restore_routes(previous.routes)
+        tools = await client.list_tools()
+        routes = client.route_map() if hasattr(client, "route_map") else None
+        content_hash = tools_content_hash(tools)
+        if previous is not None and previous.content_hash == content_hash:
+            previous.fetched_at = time.time()  # Same catalog: keep the objects, bump freshness
+            previous.routes = routes
+            catalog = previous
+        else:
+            catalog = ToolCatalog(endpoint=endpoint, tools=tools, content_hash=content_hash, fetched_at=time.time(), routes=routes)
+            self._catalogs[endpoint] = catalog
+            if previous is not None:
+                print(f"Tool catalog for {endpoint} changed ({len(previous.tools)} -> {len(tools)} tools)")
+        self._revalidated.add(endpoint)
+        self._save_to_disk(catalog)
+        return catalog
+
+    def refresh_in_background(self, client):
+        """Schedule a refresh unless one is already running for this endpoint."""
+        endpoint = client.endpoint
+        running = self._refreshing.get(endpoint)
+        if running is not None and not running.done():
+            return
+        self._revalidated.add(endpoint)  # Don't reschedule on every call while this one runs
+
+        async def _refresh():
+            try:
+                await self.refresh(client)
+            except Exception as e:
+                print(f"Background tool catalog refresh failed for {endpoint}: {e}")
+            finally:
+                self._refreshing.pop(endpoint, None)
+
+        self._refreshing[endpoint] = asyncio.create_task(_refresh())
+
+    def _subscribe(self, client):
+        """Listen for tools/list_changed on the client's persistent session (once per client)."""
+        if id(client) in self._subscribed or not hasattr(client, "add_tools_changed_listener"):
+            return
+        self._subscribed.add(id(client))
+        client.add_tools_changed_listener(lambda: self.refresh_in_background(client))
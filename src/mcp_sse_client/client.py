@@ -5,12 +5,20 @@ This module provides a client for connecting to MCP endpoints using Server-Sent
 listing available tools, and invoking tools with parameters.
 """
 
-from typing import Any, Dict, List, Optional
+import asyncio
+import base64
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
 from urllib.parse import urlparse
-from dataclasses import dataclass
-from mcp import ClientSession
+from dataclasses import dataclass, field
+import anyio
+from mcp import ClientSession, types
 from mcp.client.sse import sse_client
+from mcp.shared.exceptions import McpError
 from pydantic import BaseModel
+import httpx
+
+T = TypeVar("T")
 
 
 @dataclass
@@ -49,30 +57,387 @@ class ToolDef:
     identifier: str = ""
 
 
+@dataclass
+class ToolAttachment:
+    """Binary content (image, audio, blob resource) returned by a tool.
+    
+    Attributes:
+        type: MCP content type ("image", "audio" or "resource")
+        mime_type: MIME type reported by the server
+        data: Base64 data as received (decode with to_bytes)
+        uri: Resource URI for blob resources
+    """
+    type: str
+    mime_type: str
+    data: str
+    uri: Optional[str] = None
+
+    def to_bytes(self) -> bytes:
+        return base64.b64decode(self.data)
+
+
 @dataclass
 class ToolInvocationResult:
     """Represents the result of a tool invocation.
     
     Attributes:
-        content: Result content as a string
+        content: Result content as a string (capped, see MCPClient.max_result_bytes)
         error_code: Error code (0 for success, 1 for error)
+        attachments: Binary content, referenced from `content` by index only
+        truncated: Whether `content` was cut to the byte cap
+        total_bytes: Size of the full text content before truncation
     """
     content: str
     error_code: int
+    attachments: List[ToolAttachment] = field(default_factory=list)
+    truncated: bool = False
+    total_bytes: int = 0
+
+
+@dataclass
+class ToolResultChunk:
+    """One piece of a streamed tool result (see MCPClient.stream_tool).
+    
+    Attributes:
+        type: "progress", "text", "attachment" or "end"
+        text: Text slice for "text" chunks, progress message for "progress"
+        attachment: ToolAttachment for "attachment" chunks
+        progress: Progress value for "progress" chunks
+        total: Progress total, if the server reports one
+        error_code: Error code of the call, set on the "end" chunk
+    """
+    type: str
+    text: Optional[str] = None
+    attachment: Optional[ToolAttachment] = None
+    progress: Optional[float] = None
+    total: Optional[float] = None
+    error_code: int = 0
+
+
+def truncate_middle(parts: List[str], max_bytes: Optional[int], separator: str = "\n") -> Tuple[str, bool, int]:
+    """Join text parts, keeping the head and tail when the result exceeds `max_bytes`.
+    
+    Args:
+        parts: Text parts to join
+        max_bytes: Byte cap for the UTF-8 result (None: no cap)
+        separator: Separator between parts
+        
+    Returns:
+        (text, truncated, total_bytes of the untruncated text)
+    """
+    encoded = [part.encode("utf-8") for part in parts]
+    sep = separator.encode("utf-8")
+    total = sum(len(part) for part in encoded) + len(sep) * max(0, len(encoded) - 1)
+    if max_bytes is None or total <= max_bytes:
+        return separator.join(parts), False, total
+
+    marker = f"\n... [truncated {total - max_bytes} of {total} bytes] ...\n".encode("utf-8")
+    budget = max(0, max_bytes - len(marker))
+    head_budget, tail_budget = budget * 2 // 3, budget - budget * 2 // 3
+
+    head = bytearray()
+    for i, part in enumerate(encoded):
+        chunk = (sep if i else b"") + part
+        head += chunk[:head_budget - len(head)]
+        if len(head) >= head_budget:
+            break
+    tail = bytearray()
+    for i in range(len(encoded) - 1, -1, -1):
+        chunk = encoded[i] + (sep if i < len(encoded) - 1 else b"")
+        take = tail_budget - len(tail)
+        tail[:0] = chunk[-take:] if take else b""
+        if len(tail) >= tail_budget:
+            break
+    # errors="ignore" drops a multi-byte character split at either cut
+    text = bytes(head).decode("utf-8", errors="ignore") + marker.decode("utf-8") + bytes(tail).decode("utf-8", errors="ignore")
+    return text, True, total
+
+
+def _split_content(items: List[Any]) -> Tuple[List[str], List[ToolAttachment]]:
+    """Serialize tool content items to JSON strings, moving binary payloads into attachments."""
+    parts: List[str] = []
+    attachments: List[ToolAttachment] = []
+    for item in items:
+        if isinstance(item, (types.ImageContent, getattr(types, "AudioContent", types.ImageContent))):
+            attachments.append(ToolAttachment(type=item.type, mime_type=item.mimeType, data=item.data))
+        elif isinstance(item, types.EmbeddedResource) and isinstance(item.resource, types.BlobResourceContents):
+            resource = item.resource
+            attachments.append(ToolAttachment(type="resource", mime_type=resource.mimeType or "application/octet-stream",
+                                              data=resource.blob, uri=str(resource.uri)))
+        else:
+            parts.append(item.model_dump_json())
+            continue
+        attachment = attachments[-1]
+        # Leave a small placeholder in the text so the model knows the content exists
+        parts.append(json.dumps({
+            "type": attachment.type,
+            "mimeType": attachment.mime_type,
+            "attachment": len(attachments) - 1,
+            "bytes": len(attachment.data) * 3 // 4,
+        }))
+    return parts, attachments
+
+
+# Raised by ClientSession when writing a request to a closed or broken stream:
+# the request never left the client, so any operation can be run again
+_NOT_SENT_ERRORS = (anyio.ClosedResourceError, anyio.BrokenResourceError)
+
+
+def _is_transport_error(error: BaseException) -> bool:
+    """True if `error` means the connection itself is broken (timeouts are not: the server may still answer)."""
+    if isinstance(error, TimeoutError):
+        return False
+    return isinstance(error, _NOT_SENT_ERRORS + (anyio.EndOfStream, ConnectionError, OSError, httpx.TransportError))
+
+
+class PersistentSession:
+    """A long-lived, reconnecting MCP session for a single endpoint.
+
+    The SSE stream and ClientSession are entered inside one owner task (they are
+    anyio context managers and must be exited by the task that entered them).
+    The owner task pings the server while idle and closes the connection after
+    `idle_timeout` seconds without use; the next call reconnects transparently.
+
+    Each connection gets a generation number. When a call finds its connection
+    broken, only that generation is retired: new calls get a fresh connection,
+    and the old one is closed once the calls still running on it have finished.
+    """
+
+    def __init__(self, endpoint: str, idle_timeout: float = 300.0, health_check_interval: float = 30.0,
+                 connect_timeout: float = 30.0):
+        """Initialize the session holder.
+        
+        Args:
+            endpoint: The MCP endpoint URL
+            idle_timeout: Seconds without calls before the connection is closed
+            health_check_interval: Seconds between pings while the connection is idle
+            connect_timeout: Seconds to wait for connect + initialize
+        """
+        self.endpoint = endpoint
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.connect_timeout = connect_timeout
+        self.connects = 0  # Number of (re)connections made, useful for diagnostics
+        self._session: Optional[ClientSession] = None
+        self._generation = 0  # Bumped on every connect
+        self._task: Optional[asyncio.Task] = None
+        self._ready: Optional[asyncio.Event] = None
+        self._closing: Optional[asyncio.Event] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._error: Optional[BaseException] = None
+        self._in_flight: Dict[int, int] = {}  # Running calls per connection generation
+        self._retired: Dict[int, Tuple[asyncio.Event, asyncio.Task]] = {}  # Broken connections draining their calls
+        self._last_used = 0.0
+        self._tools_changed_listeners: List[Callable[[], None]] = []
+
+    def add_tools_changed_listener(self, listener: Callable[[], None]):
+        """Call `listener` whenever the server sends `notifications/tools/list_changed`."""
+        self._tools_changed_listeners.append(listener)
+
+    async def _handle_message(self, message: Any):
+        """ClientSession message handler: dispatch server notifications we care about."""
+        if isinstance(message, types.ServerNotification) and \
+           isinstance(message.root, types.ToolListChangedNotification):
+            for listener in list(self._tools_changed_listeners):
+                try:
+                    listener()
+                except Exception as e:
+                    print(f"Error in tools/list_changed listener for {self.endpoint}: {e}")
+
+    @property
+    def connected(self) -> bool:
+        return self._session is not None and self._task is not None and not self._task.done()
+
+    async def _acquire(self) -> Tuple[ClientSession, int]:
+        """Return the live session and its generation, (re)connecting if needed."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not self.connected:
+                await self._connect()
+            self._in_flight[self._generation] = self._in_flight.get(self._generation, 0) + 1
+            self._last_used = asyncio.get_running_loop().time()
+            assert self._session is not None
+            return self._session, self._generation
+
+    def _release(self, generation: int):
+        remaining = self._in_flight[generation] - 1
+        if remaining:
+            self._in_flight[generation] = remaining
+        else:
+            del self._in_flight[generation]
+            if generation in self._retired:
+                self._retired[generation][0].set()  # Last call on a broken connection: close it
+        self._last_used = asyncio.get_running_loop().time()
+
+    def _retire(self, session: ClientSession, generation: int):
+        """Stop handing out a broken connection; it closes when its running calls drain."""
+        if self._session is not session or self._generation != generation:
+            return  # Another call already retired it (or it closed on its own)
+        assert self._closing is not None and self._task is not None
+        self._session = None
+        self._retired[generation] = (self._closing, self._task)
+        if not self._in_flight.get(generation):
+            self._closing.set()
+
+    async def _connect(self):
+        self._generation += 1
+        self._ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._error = None
+        self._task = asyncio.create_task(self._run(self._generation, self._ready, self._closing))
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=self.connect_timeout)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+            raise ConnectionError(f"Timed out connecting to MCP endpoint {self.endpoint}")
+        if self._session is None:
+            raise ConnectionError(f"Could not connect to MCP endpoint {self.endpoint}: {self._error}") from self._error
+
+    async def _run(self, generation: int, ready: asyncio.Event, closing: asyncio.Event):
+        """Owner task: hold the SSE connection open until closed, retired, idle or unhealthy."""
+        try:
+            async with sse_client(self.endpoint) as streams:
+                async with ClientSession(*streams, message_handler=self._handle_message) as session:
+                    await session.initialize()
+                    self.connects += 1
+                    self._session = session
+                    ready.set()
+                    await self._supervise(session, generation, closing)
+        except Exception as e:
+            self._error = e
+        finally:
+            if self._generation == generation:
+                self._session = None
+            self._retired.pop(generation, None)
+            ready.set()  # Wake a waiting _connect() if initialization failed
+
+    async def _supervise(self, session: ClientSession, generation: int, closing: asyncio.Event):
+        """Ping while idle; return (closing the connection) on close, drained retirement, idle timeout or failed ping."""
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await asyncio.wait_for(closing.wait(), timeout=self.health_check_interval)
+                return  # close() was called, or the connection was retired and has drained
+            except asyncio.TimeoutError:
+                pass
+            if self._in_flight.get(generation) or self._session is not session:
+                continue  # Active calls prove the connection is alive; a retired one just drains
+            idle_for = loop.time() - self._last_used
+            if idle_for >= self.idle_timeout:
+                return
+            if idle_for >= self.health_check_interval:
+                try:
+                    await asyncio.wait_for(session.send_ping(), timeout=self.health_check_interval)
+                except Exception as e:
+                    print(f"MCP health check failed for {self.endpoint}, dropping connection: {e}")
+                    return
+
+    async def call(self, operation: Callable[[ClientSession], Awaitable[T]], idempotent: bool = False) -> T:
+        """Run `operation` on the pooled session, reconnecting once if the transport broke.
+        
+        A transport error retires the connection the call ran on (see class
+        docstring). The operation is run again on a fresh connection only if
+        the request was never sent, or if it is `idempotent`: a tool call may
+        already have run on the server and is never replayed. Timeouts and
+        other errors are raised without touching the connection.
+        
+        Args:
+            operation: Coroutine function taking the ClientSession
+            idempotent: Whether `operation` is safe to run twice (e.g. list_tools, ping)
+            
+        Returns:
+            Whatever `operation` returns
+        """
+        for attempt in range(2):
+            session, generation = await self._acquire()
+            try:
+                return await operation(session)
+            except McpError:
+                raise  # Protocol-level error from the server; the connection is fine
+            except Exception as e:
+                if not _is_transport_error(e):
+                    raise
+                self._retire(session, generation)
+                if attempt == 1 or not (idempotent or isinstance(e, _NOT_SENT_ERRORS)):
+                    raise
+            finally:
+                self._release(generation)
+        raise RuntimeError("unreachable")
+
+    async def close(self):
+        """Close the connection and any retired ones, and wait for their owner tasks to finish."""
+        owners = list(self._retired.values())
+        if self._task is not None and self._closing is not None:
+            owners.append((self._closing, self._task))
+        for closing, task in owners:
+            if task.done():
+                continue
+            closing.set()
+            try:
+                await asyncio.wait_for(asyncio.shield(task), timeout=5.0)
+            except Exception:
+                task.cancel()
 
 
 class MCPClient:
-    """Client for interacting with Model Context Protocol (MCP) endpoints"""
+    """Client for interacting with Model Context Protocol (MCP) endpoints
     
-    def __init__(self, endpoint: str):
+    Use it as an async context manager to keep one persistent, reconnecting
+    session per endpoint::
+
+        async with MCPClient("http://localhost:8000/sse") as client:
+            tools = await client.list_tools()
+
+    Outside a context manager every call opens and closes its own connection.
+    """
+    
+    def __init__(self, endpoint: str, idle_timeout: float = 300.0, health_check_interval: float = 30.0,
+                 max_result_bytes: Optional[int] = 1_000_000):
         """Initialize MCP client with endpoint URL
         
         Args:
             endpoint: The MCP endpoint URL (must be http or https)
+            idle_timeout: Seconds without calls before the pooled connection is closed
+            health_check_interval: Seconds between pings on an idle pooled connection
+            max_result_bytes: Byte cap for ToolInvocationResult.content (None: no cap)
         """
         if urlparse(endpoint).scheme not in ("http", "https"):
             raise ValueError(f"Endpoint {endpoint} is not a valid HTTP(S) URL")
         self.endpoint = endpoint
+        self.session = PersistentSession(endpoint, idle_timeout, health_check_interval)
+        self.max_result_bytes = max_result_bytes
+        self._pooled = False
+
+    async def __aenter__(self) -> "MCPClient":
+        self._pooled = True
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    @property
+    def pooled(self) -> bool:
+        """True while used as a context manager (persistent session)."""
+        return self._pooled
+
+    def add_tools_changed_listener(self, listener: Callable[[], None]):
+        """Register a callback for server-side tool list changes (persistent sessions only)."""
+        self.session.add_tools_changed_listener(listener)
+
+    async def close(self):
+        """Close the pooled session."""
+        self._pooled = False
+        await self.session.close()
+
+    async def _call(self, operation: Callable[[ClientSession], Awaitable[T]], idempotent: bool = False) -> T:
+        """Run an operation on the pooled session, or on a one-shot connection when not pooled."""
+        if self._pooled:
+            return await self.session.call(operation, idempotent)
+        async with sse_client(self.endpoint) as streams:
+            async with ClientSession(*streams) as session:
+                await session.initialize()
+                return await operation(session)
 
     async def list_tools(self) -> List[ToolDef]:
         """List available tools from the MCP endpoint
@@ -80,34 +445,35 @@ class MCPClient:
         Returns:
             List of ToolDef objects describing available tools
         """
+        tools_result = await self._call(lambda session: session.list_tools(), idempotent=True)
+
         tools = []
-        async with sse_client(self.endpoint) as streams:
-            async with ClientSession(*streams) as session:
-                await session.initialize()
-                tools_result = await session.list_tools()
-                
-                for tool in tools_result.tools:
-                    parameters = []
-                    required_params = tool.inputSchema.get("required", [])
-                    for param_name, param_schema in tool.inputSchema.get("properties", {}).items():
-                        parameters.append(
-                            ToolParameter(
-                                name=param_name,
-                                parameter_type=param_schema.get("type", "string"),
-                                description=param_schema.get("description", ""),
-                                required=param_name in required_params,
-                                default=param_schema.get("default"),
-                            )
-                        )
-                    tools.append(
-                        ToolDef(
-                            name=tool.name,
-                            description=tool.description,
-                            parameters=parameters,
-                            metadata={"endpoint": self.endpoint},
-                            identifier=tool.name  # Using name as identifier
-                        )
+        for tool in tools_result.tools:
+            parameters = []
+            required_params = tool.inputSchema.get("required", [])
+            for param_name, param_schema in tool.inputSchema.get("properties", {}).items():
+                parameters.append(
+                    ToolParameter(
+                        name=param_name,
+                        parameter_type=param_schema.get("type", "string"),
+                        description=param_schema.get("description", ""),
+                        required=param_name in required_params,
+                        default=param_schema.get("default"),
                     )
+                )
+            metadata: Dict[str, Any] = {"endpoint": self.endpoint}
+            annotations = getattr(tool, "annotations", None)  # Behaviour hints (readOnlyHint, ...), if the server sends them
+            if annotations is not None:
+                metadata["annotations"] = annotations.model_dump(exclude_none=True)
+            tools.append(
+                ToolDef(
+                    name=tool.name,
+                    description=tool.description,
+                    parameters=parameters,
+                    metadata=metadata,
+                    identifier=tool.name  # Using name as identifier
+                )
+            )
         return tools
 
     async def invoke_tool(self, tool_name: str, kwargs: Dict[str, Any]) -> ToolInvocationResult:
@@ -120,12 +486,65 @@ class MCPClient:
         Returns:
             ToolInvocationResult containing the tool's response
         """
-        async with sse_client(self.endpoint) as streams:
-            async with ClientSession(*streams) as session:
-                await session.initialize()
-                result = await session.call_tool(tool_name, kwargs)
+        result = await self._call(lambda session: session.call_tool(tool_name, kwargs))
 
+        # Binary content goes to attachments; the text is capped with head/tail truncation
+        parts, attachments = _split_content(result.content)
+        content, truncated, total_bytes = truncate_middle(parts, self.max_result_bytes)
         return ToolInvocationResult(
-            content="\n".join([result.model_dump_json() for result in result.content]),
+            content=content,
             error_code=1 if result.isError else 0,
+            attachments=attachments,
+            truncated=truncated,
+            total_bytes=total_bytes,
         )
+
+    async def stream_tool(self, tool_name: str, kwargs: Dict[str, Any], chunk_size: int = 65536) -> AsyncIterator[ToolResultChunk]:
+        """Invoke a tool and stream its result piece by piece
+        
+        Yields "progress" chunks while the tool runs (for servers that send
+        progress notifications), then the text content in slices of
+        `chunk_size` characters and each binary item as an "attachment",
+        and finally an "end" chunk carrying the error code. The full text is
+        never joined into one string and the byte cap does not apply.
+        
+        Args:
+            tool_name: Name of the tool to invoke
+            kwargs: Dictionary of parameters to pass to the tool
+            chunk_size: Characters per "text" chunk
+            
+        Returns:
+            Async iterator of ToolResultChunk objects
+        """
+        progress: "asyncio.Queue[ToolResultChunk]" = asyncio.Queue()
+
+        async def on_progress(value: float, total: Optional[float], message: Optional[str]):
+            progress.put_nowait(ToolResultChunk(type="progress", progress=value, total=total, text=message))
+
+        call = asyncio.ensure_future(self._call(
+            lambda session: session.call_tool(tool_name, kwargs, progress_callback=on_progress)
+        ))
+        try:
+            while not call.done():
+                getter = asyncio.ensure_future(progress.get())
+                await asyncio.wait({call, getter}, return_when=asyncio.FIRST_COMPLETED)
+                if getter.done():
+                    yield getter.result()
+                else:
+                    getter.cancel()
+            while not progress.empty():
+                yield progress.get_nowait()
+
+            result = call.result()
+            for item in result.content:
+                parts, attachments = _split_content([item])
+                if attachments:
+                    yield ToolResultChunk(type="attachment", attachment=attachments[0])
+                    continue
+                text = item.text if isinstance(item, types.TextContent) else parts[0]
+                for start in range(0, len(text), chunk_size):
+                    yield ToolResultChunk(type="text", text=text[start:start + chunk_size])
+            yield ToolResultChunk(type="end", error_code=1 if result.isError else 0)
+        finally:
+            if not call.done():
+                call.cancel()
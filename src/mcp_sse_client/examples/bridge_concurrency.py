@@ -0,0 +1,88 @@
+"""
+Check that concurrent bridge queries overlap instead of serializing.
+
+Runs N OpenAIBridge queries at once against a stand-in chat completions API
+(httpx.MockTransport, each request takes --latency seconds, no network or API
+key needed), first with blocking sync clients and then with the async clients
+the bridges use:
+
+    python -m mcp_sse_client.examples.bridge_concurrency --bridges 8 --latency 0.5
+"""
+
+import argparse
+import asyncio
+import time
+import httpx
+import openai
+from mcp_sse_client import MCPClient
+from mcp_sse_client.llm_bridge import OpenAIBridge
+
+COMPLETION = {
+    "id": "chatcmpl-stand-in",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "stand-in",
+    "choices": [{"index": 0, "message": {"role": "assistant", "content": "ok"}, "finish_reason": "stop"}],
+    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+}
+
+
+def make_bridges(count: int, llm_client) -> list:
+    """Create bridges sharing one LLM client, with an empty tool list (no MCP server needed)."""
+    bridges = []
+    for _ in range(count):
+        bridge = OpenAIBridge(MCPClient("http://127.0.0.1:9/sse"), api_key="stand-in")
+        bridge.llm_client = llm_client
+        bridge.tools = []
+        bridges.append(bridge)
+    return bridges
+
+
+async def run_concurrently(bridges: list) -> float:
+    """Run one query per bridge at the same time and return the wall time in seconds."""
+    start = time.perf_counter()
+    await asyncio.gather(*(bridge.process_query(f"query {i}") for i, bridge in enumerate(bridges)))
+    return time.perf_counter() - start
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Bridge concurrency check")
+    parser.add_argument("--bridges", type=int, default=8, help="Concurrent bridges (default: 8)")
+    parser.add_argument("--latency", type=float, default=0.5, help="Stand-in API latency in seconds (default: 0.5)")
+    args = parser.parse_args()
+
+    def sync_handler(request: httpx.Request) -> httpx.Response:
+        time.sleep(args.latency)
+        return httpx.Response(200, json=COMPLETION)
+
+    async def async_handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(args.latency)
+        return httpx.Response(200, json=COMPLETION)
+
+    # Blocking client awaited from the event loop: every call stalls the loop
+    sync_client = openai.OpenAI(api_key="stand-in", http_client=httpx.Client(transport=httpx.MockTransport(sync_handler)))
+
+    class BlockingCompletions:
+        async def create(self, **kwargs):
+            return sync_client.chat.completions.create(**kwargs)
+
+    class BlockingClient:
+        chat = type("Chat", (), {"completions": BlockingCompletions()})()
+
+    blocking = await run_concurrently(make_bridges(args.bridges, BlockingClient()))
+
+    # Async client on one shared connection pool, as the bridges use by default
+    async with httpx.AsyncClient(transport=httpx.MockTransport(async_handler)) as http_client:
+        async_client = openai.AsyncOpenAI(api_key="stand-in", http_client=http_client)
+        overlapped = await run_concurrently(make_bridges(args.bridges, async_client))
+
+    serial = args.bridges * args.latency
+    print(f"{args.bridges} queries, {args.latency:.2f}s each (fully serial: {serial:.2f}s)")
+    print(f"blocking sync client   {blocking:6.2f}s")
+    print(f"async client (pooled)  {overlapped:6.2f}s")
+    assert overlapped < serial / 2, "async bridge queries did not overlap"
+    print("OK: async bridge queries overlap")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -26,6 +26,7 @@ import argparse  # Import argparse
 from mcp_sse_client import MCPClient
 # Import all bridges
 from mcp_sse_client.llm_bridge import OpenAIBridge, AnthropicBridge, OllamaBridge 
+from mcp_sse_client.llm_bridge.batch import QueryBatchReport
 from mcp_sse_client.format_converters import to_openai_format, to_anthropic_format
 # Import model definitions
 from mcp_sse_client.llm_bridge.models import (
@@ -126,6 +127,9 @@ async def main():
     )
     parser.add_argument("--openai-key", help="OpenAI API key (overrides OPENAI_API_KEY env var)")
     parser.add_argument("--anthropic-key", help="Anthropic API key (overrides ANTHROPIC_API_KEY env var)")
+    parser.add_argument("--queries", help="Run every line of this file as a query (batch mode) instead of the interactive loop")
+    parser.add_argument("--concurrency", type=int, default=8, help="Queries in flight in batch mode (default: 8)")
+    parser.add_argument("--no-execute", action="store_true", help="In batch mode, only record tool selection without running tools")
     # No API key arg for Ollama
     
     args = parser.parse_args()
@@ -144,120 +148,135 @@ async def main():
     client = MCPClient(endpoint)
     print(f"Connecting to MCP server at: {endpoint}")
 
-    # Setup bridge based on provider
-    if provider == "openai":
-        api_key = args.openai_key or os.environ.get("OPENAI_API_KEY")
-        if not api_key:
-            api_key = input("Enter OpenAI API key: ").strip()
+    # Keep one persistent MCP session open for the whole interactive run
+    async with client:
+        # Setup bridge based on provider
+        if provider == "openai":
+            api_key = args.openai_key or os.environ.get("OPENAI_API_KEY")
+            if not api_key:
+                api_key = input("Enter OpenAI API key: ").strip()
         
-        model = args.openai_model
-        bridge = OpenAIBridge(client, api_key, model=model)
-        print(f"Using OpenAI LLM bridge with model: {model}")
+            model = args.openai_model
+            bridge = OpenAIBridge(client, api_key, model=model)
+            print(f"Using OpenAI LLM bridge with model: {model}")
     
-    elif provider == "anthropic":
-        api_key = args.anthropic_key or os.environ.get("ANTHROPIC_API_KEY")
-        if not api_key:
-            api_key = input("Enter Anthropic API key: ").strip()
+        elif provider == "anthropic":
+            api_key = args.anthropic_key or os.environ.get("ANTHROPIC_API_KEY")
+            if not api_key:
+                api_key = input("Enter Anthropic API key: ").strip()
         
-        model = args.anthropic_model
-        bridge = AnthropicBridge(client, api_key, model=model)
-        print(f"Using Anthropic LLM bridge with model: {model}")
+            model = args.anthropic_model
+            bridge = AnthropicBridge(client, api_key, model=model)
+            print(f"Using Anthropic LLM bridge with model: {model}")
 
-    elif provider == "ollama":
-        # No API key needed for Ollama
-        model = args.ollama_model
-        host = args.ollama_host # Will be None if not provided, which is handled by the bridge
-        bridge = OllamaBridge(client, model=model, host=host)
-        print(f"Using Ollama LLM bridge with model: {model} (Host: {host or 'Default'})")
-        # Optional: Add connection check
-        if not await bridge.check_connection():
-             print(f"Warning: Could not verify connection to Ollama. Ensure it's running and model '{model}' is available.", file=sys.stderr)
+        elif provider == "ollama":
+            # No API key needed for Ollama
+            model = args.ollama_model
+            host = args.ollama_host # Will be None if not provided, which is handled by the bridge
+            bridge = OllamaBridge(client, model=model, host=host)
+            print(f"Using Ollama LLM bridge with model: {model} (Host: {host or 'Default'})")
+            # Optional: Add connection check
+            if not await bridge.check_connection():
+                 print(f"Warning: Could not verify connection to Ollama. Ensure it's running and model '{model}' is available.", file=sys.stderr)
     
-    else:
-        print(f"Unsupported provider: {provider}", file=sys.stderr)
-        return
+        else:
+            print(f"Unsupported provider: {provider}", file=sys.stderr)
+            return
 
-    # --- Tool Fetching and Interaction ---
-    print("Fetching tools from server...")
-    tools = await bridge.fetch_tools()
+        # --- Tool Fetching and Interaction ---
+        print("Fetching tools from server...")
+        tools = await bridge.fetch_tools()
+    
+        # Show tool summary
+        print_tool_summary(tools)
     
-    # Show tool summary
-    print_tool_summary(tools)
+        # Batch mode
+        if args.queries:
+            with open(args.queries, "r", encoding="utf-8") as f:
+                queries = [line.strip() for line in f if line.strip()]
+            print(f"\nRunning {len(queries)} queries with concurrency {args.concurrency}...")
+            report = QueryBatchReport()
+            async for outcome in bridge.process_queries(queries, concurrency=args.concurrency,
+                                                        execute_tools=not args.no_execute, report=report):
+                selection = outcome.error and f"ERROR {outcome.error}" or ", ".join(outcome.tool_names) or "(no tool)"
+                print(f"  [{outcome.index + 1}/{len(queries)}] {outcome.latency:6.2f}s  {selection}  <- {outcome.query[:60]}")
+            print_section("Batch Report", report.format())
+            return
     
-    # Interactive mode
-    print("\nEntering interactive mode. Type 'quit' to exit.")
-    while True:
-        query = input("\nEnter your query: ")
-        if query.lower() in ("quit", "exit"):
-            break
+        # Interactive mode
+        print("\nEntering interactive mode. Type 'quit' to exit.")
+        while True:
+            query = input("\nEnter your query: ")
+            if query.lower() in ("quit", "exit"):
+                break
         
-        print_section("User Query", query)
-        print("Processing query...")
+            print_section("User Query", query)
+            print("Processing query...")
         
-        # Get the formatted tools that will be sent to the LLM
-        if provider == "openai" or provider == "ollama": # Ollama uses OpenAI format
-            formatted_tools = to_openai_format(tools)
-        elif provider == "anthropic":
-            formatted_tools = to_anthropic_format(tools)
-        else:
-             formatted_tools = [] # Should not happen due to earlier check
+            # Get the formatted tools that will be sent to the LLM
+            if provider == "openai" or provider == "ollama": # Ollama uses OpenAI format
+                formatted_tools = to_openai_format(tools)
+            elif provider == "anthropic":
+                formatted_tools = to_anthropic_format(tools)
+            else:
+                 formatted_tools = [] # Should not happen due to earlier check
 
-        # Process the query
-        result = await bridge.process_query(query)
+            # Process the query
+            result = await bridge.process_query(query)
         
-        # Extract and show LLM's reasoning
-        # Need to handle different response structures
-        llm_response = result["llm_response"]
-        reasoning = "[Could not extract reasoning]" # Default
-        if provider == "openai":
-            if hasattr(llm_response.choices[0].message, 'content') and llm_response.choices[0].message.content:
-                reasoning = llm_response.choices[0].message.content
-        elif provider == "anthropic":
-            text_parts = [c.text for c in llm_response.content if hasattr(c, 'type') and c.type == "text"]
-            if text_parts: reasoning = "\n".join(text_parts)
-        elif provider == "ollama":
-             if isinstance(llm_response, dict) and 'message' in llm_response and llm_response['message'].get('content'):
-                 # Check if tool calls exist; if so, reasoning might be empty or just whitespace
-                 if not llm_response['message'].get('tool_calls'):
-                     reasoning = llm_response['message']['content']
-                 # Optionally, could try to extract pre-tool-call text if available, but Ollama structure varies
+            # Extract and show LLM's reasoning
+            # Need to handle different response structures
+            llm_response = result["llm_response"]
+            reasoning = "[Could not extract reasoning]" # Default
+            if provider == "openai":
+                if hasattr(llm_response.choices[0].message, 'content') and llm_response.choices[0].message.content:
+                    reasoning = llm_response.choices[0].message.content
+            elif provider == "anthropic":
+                text_parts = [c.text for c in llm_response.content if hasattr(c, 'type') and c.type == "text"]
+                if text_parts: reasoning = "\n".join(text_parts)
+            elif provider == "ollama":
+                 if isinstance(llm_response, dict) and 'message' in llm_response and llm_response['message'].get('content'):
+                     # Check if tool calls exist; if so, reasoning might be empty or just whitespace
+                     if not llm_response['message'].get('tool_calls'):
+                         reasoning = llm_response['message']['content']
+                     # Optionally, could try to extract pre-tool-call text if available, but Ollama structure varies
         
-        print_section("LLM Reasoning", reasoning)
+            print_section("LLM Reasoning", reasoning)
         
-        # Show tool selection decision
-        if result["tool_call"]:
-            selected_tool = result["tool_call"]["name"]
-            params = result["tool_call"]["parameters"]
+            # Show tool selection decision
+            if result["tool_call"]:
+                selected_tool = result["tool_call"]["name"]
+                params = result["tool_call"]["parameters"]
             
-            # Find the matching tool definition
-            tool_def = next((t for t in tools if t.name == selected_tool), None)
+                # Find the matching tool definition
+                tool_def = next((t for t in tools if t.name == selected_tool), None)
             
-            print_section("Tool Selection Decision", f"Selected: {selected_tool}")
-            if tool_def:
-                print(f"  Description: {tool_def.description}")
+                print_section("Tool Selection Decision", f"Selected: {selected_tool}")
+                if tool_def:
+                    print(f"  Description: {tool_def.description}")
                 
-                # Show parameter matching
-                print("\n  Parameters provided:")
-                for param_name, param_value in params.items():
-                    param_def = next((p for p in tool_def.parameters if p.name == param_name), None)
-                    if param_def:
-                        required = "required" if param_def.required else "optional"
-                        print(f"    - {param_name} ({param_def.parameter_type}, {required}): {param_value}")
-                        print(f"      Description: {param_def.description}")
+                    # Show parameter matching
+                    print("\n  Parameters provided:")
+                    for param_name, param_value in params.items():
+                        param_def = next((p for p in tool_def.parameters if p.name == param_name), None)
+                        if param_def:
+                            required = "required" if param_def.required else "optional"
+                            print(f"    - {param_name} ({param_def.parameter_type}, {required}): {param_value}")
+                            print(f"      Description: {param_def.description}")
             
-            # Show how the query maps to the tool selection
-            print("\n  Query to Tool Mapping:")
-            print(f"    Query: \"{query}\"")
-            print(f"    Tool: {selected_tool}")
-            print(f"    Key parameters: {', '.join(params.keys())}")
-        else:
-            print_section("Tool Selection Decision", "No tool was selected by the LLM")
+                # Show how the query maps to the tool selection
+                print("\n  Query to Tool Mapping:")
+                print(f"    Query: \"{query}\"")
+                print(f"    Tool: {selected_tool}")
+                print(f"    Key parameters: {', '.join(params.keys())}")
+            else:
+                print_section("Tool Selection Decision", "No tool was selected by the LLM")
         
-        # Show tool result if any
-        if result["tool_result"]:
-            print_section("Tool Execution Result", 
-                         f"Success: {result['tool_result'].error_code == 0}\n" +
-                         f"Content: {result['tool_result'].content}")
+            # Show tool result if any
+            if result["tool_result"]:
+                print_section("Tool Execution Result", 
+                             f"Success: {result['tool_result'].error_code == 0}\n" +
+                             f"Content: {result['tool_result'].content}")
 
 
 if __name__ == "__main__":
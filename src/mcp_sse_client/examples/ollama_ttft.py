@@ -0,0 +1,136 @@
+"""
+Measure Ollama time-to-first-token cold and warm.
+
+Starts a local stand-in for the Ollama HTTP API (aiohttp, no model needed)
+that charges --load-time seconds whenever the model is not loaded and unloads
+it after the request's keep_alive. Then it times OllamaBridge queries:
+
+- cold: model unloaded, no warm-up (pays the load on the first token)
+- warm: after the bridge's background warm-up preloaded the model
+- repeat: a follow-up query while keep_alive holds the model
+
+    python -m mcp_sse_client.examples.ollama_ttft --load-time 2.0
+
+Pass --host http://localhost:11434 --model <name> to measure a real Ollama
+server instead (the cold number is then only cold if the model is unloaded).
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from aiohttp import web
+from mcp_sse_client import MCPClient
+from mcp_sse_client.llm_bridge import OllamaBridge
+
+
+class StandInOllama:
+    """Just enough of /api/chat, /api/generate and /api/tags to exercise the bridge."""
+
+    def __init__(self, model: str, load_time: float, token_interval: float = 0.02):
+        self.model = model
+        self.load_time = load_time
+        self.token_interval = token_interval
+        self.loaded_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def _ensure_loaded(self, keep_alive) -> float:
+        """Load the model if needed and extend its lifetime; return the load time paid."""
+        async with self._lock:
+            paid = 0.0
+            if time.monotonic() >= self.loaded_until:
+                await asyncio.sleep(self.load_time)
+                paid = self.load_time
+            self.loaded_until = time.monotonic() + self._keep_alive_seconds(keep_alive)
+            return paid
+
+    @staticmethod
+    def _keep_alive_seconds(keep_alive) -> float:
+        if keep_alive is None:
+            return 300.0
+        if isinstance(keep_alive, (int, float)):
+            return float("inf") if keep_alive < 0 else float(keep_alive)
+        units = {"s": 1, "m": 60, "h": 3600}
+        return float(keep_alive[:-1]) * units[keep_alive[-1]] if keep_alive[-1] in units else float(keep_alive)
+
+    async def chat(self, request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        load = await self._ensure_loaded(body.get("keep_alive"))
+        response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+        await response.prepare(request)
+        for word in ["Stand-in", " reply", " from", " the", " local", " model."]:
+            await asyncio.sleep(self.token_interval)
+            await response.write(json.dumps({
+                "model": self.model, "created_at": "", "done": False,
+                "message": {"role": "assistant", "content": word},
+            }).encode() + b"\n")
+        await response.write(json.dumps({
+            "model": self.model, "created_at": "", "done": True, "done_reason": "stop",
+            "message": {"role": "assistant", "content": ""},
+            "load_duration": int(load * 1e9), "prompt_eval_count": 8, "eval_count": 6,
+        }).encode() + b"\n")
+        await response.write_eof()
+        return response
+
+    async def generate(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        load = await self._ensure_loaded(body.get("keep_alive"))
+        return web.json_response({"model": self.model, "created_at": "", "response": "", "done": True,
+                                  "done_reason": "load", "load_duration": int(load * 1e9)})
+
+    async def tags(self, request: web.Request) -> web.Response:
+        return web.json_response({"models": [{"model": f"{self.model}:latest", "name": f"{self.model}:latest",
+                                              "modified_at": "2024-01-01T00:00:00Z", "digest": "", "size": 0}]})
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/api/chat", self.chat)
+        app.router.add_post("/api/generate", self.generate)
+        app.router.add_get("/api/tags", self.tags)
+        return app
+
+
+async def time_query(bridge: OllamaBridge) -> float:
+    await bridge.submit_query("Say hello.", [])
+    return bridge.last_ttft
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Ollama time-to-first-token, cold vs warm")
+    parser.add_argument("--model", default="llama3", help="Model name (default: llama3)")
+    parser.add_argument("--load-time", type=float, default=2.0, help="Stand-in model load time in seconds (default: 2.0)")
+    parser.add_argument("--port", type=int, default=11500, help="Port for the stand-in server (default: 11500)")
+    parser.add_argument("--host", help="Measure this Ollama server instead of the stand-in")
+    args = parser.parse_args()
+
+    runner = None
+    host = args.host
+    if host is None:
+        runner = web.AppRunner(StandInOllama(args.model, args.load_time).app())
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", args.port).start()
+        host = f"http://127.0.0.1:{args.port}"
+
+    mcp_client = MCPClient("http://127.0.0.1:9/sse")  # Not contacted: the queries carry no tools
+    try:
+        # Cold: no warm-up and keep_alive=0, so the model is unloaded right after
+        cold_bridge = OllamaBridge(mcp_client, model=args.model, host=host, keep_alive=0, warm_up=False)
+        print(f"Model listed by server: {await cold_bridge.check_connection()}")
+        cold = await time_query(cold_bridge)
+
+        # Warm: the constructor starts the preload; give it time to finish, as an idle app would
+        warm_bridge = OllamaBridge(mcp_client, model=args.model, host=host)
+        await warm_bridge.warm_up_task
+        warm = await time_query(warm_bridge)
+        repeat = await time_query(warm_bridge)
+
+        print(f"TTFT cold (no warm-up):        {cold * 1000:8.1f} ms")
+        print(f"TTFT warm (after preload):     {warm * 1000:8.1f} ms")
+        print(f"TTFT repeat (kept alive):      {repeat * 1000:8.1f} ms")
+    finally:
+        if runner is not None:
+            await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
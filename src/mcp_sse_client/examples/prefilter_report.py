@@ -0,0 +1,86 @@
+"""
+Report token savings and selection accuracy of the tool prefilter on a fixture set.
+
+Loads tools and labelled queries from fixtures/prefilter_fixture.json (or
+--fixture), runs ToolPrefilter for each query and prints how often the
+expected tool survives the filter, how often it falls back to the full list,
+and how many schema tokens are saved compared with sending every tool:
+
+    python -m mcp_sse_client.examples.prefilter_report --top-k 5
+
+Token counts are estimated as serialized schema bytes / 4 (OpenAI format).
+"""
+
+import argparse
+import json
+import os
+from mcp_sse_client.client import ToolDef, ToolParameter
+from mcp_sse_client.catalog_cache import tools_content_hash
+from mcp_sse_client.format_converters import convert_tools_cached
+from mcp_sse_client.tool_index import ToolPrefilter
+
+DEFAULT_FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "prefilter_fixture.json")
+
+
+def load_fixture(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    tools = [
+        ToolDef(
+            name=tool["name"],
+            description=tool["description"],
+            parameters=[ToolParameter(**param) for param in tool["parameters"]],
+            identifier=tool["name"],
+        )
+        for tool in data["tools"]
+    ]
+    return tools, data["queries"]
+
+
+def estimate_tokens(schemas) -> int:
+    return len(json.dumps(schemas, separators=(",", ":")).encode("utf-8")) // 4
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tool prefilter fixture report")
+    parser.add_argument("--fixture", default=DEFAULT_FIXTURE, help="Fixture JSON with 'tools' and 'queries'")
+    parser.add_argument("--top-k", type=int, default=8, help="Tools kept per query (default: 8)")
+    parser.add_argument("--min-score", type=float, default=2.0, help="Fallback threshold on the best BM25 score (default: 2.0)")
+    parser.add_argument("--verbose", action="store_true", help="Print every query's selection")
+    args = parser.parse_args()
+
+    tools, queries = load_fixture(args.fixture)
+    version = tools_content_hash(tools)
+    schemas = convert_tools_cached(tools, "openai", version).schemas
+    full_tokens = estimate_tokens(schemas)
+    prefilter = ToolPrefilter(top_k=args.top_k, min_score=args.min_score, min_tools=0)
+
+    hits = fallbacks = sent_tokens = 0
+    top1 = 0
+    for case in queries:
+        selection = prefilter.select(case["query"], tools, version)
+        chosen = [tools[i].name for i in selection.indices]
+        sent_tokens += estimate_tokens([schemas[i] for i in selection.indices])
+        fallbacks += selection.fallback
+        hit = case["expected"] in chosen
+        hits += hit
+        if selection.scores:
+            best = max(selection.scores, key=selection.scores.get)
+            top1 += tools[best].name == case["expected"]
+        if args.verbose or not hit:
+            status = "ok  " if hit else "MISS"
+            print(f"{status} {case['query'][:60]:<60} expected {case['expected']:<24} "
+                  f"{'(fallback)' if selection.fallback else ', '.join(chosen[:args.top_k])}")
+
+    count = len(queries)
+    baseline = full_tokens * count
+    print(f"\nTools: {len(tools)} | Queries: {count} | top-k: {args.top_k} | min score: {args.min_score}")
+    print(f"Expected tool kept:   {hits}/{count} ({hits / count * 100:.1f}%)")
+    print(f"Expected tool ranked first: {top1}/{count} ({top1 / count * 100:.1f}%)")
+    print(f"Fallback to all tools: {fallbacks}/{count}")
+    print(f"Schema tokens: {sent_tokens} vs {baseline} unfiltered ({(1 - sent_tokens / baseline) * 100:.1f}% saved, "
+          f"~{full_tokens} -> ~{sent_tokens // count} per query)")
+
+
+if __name__ == "__main__":
+    main()
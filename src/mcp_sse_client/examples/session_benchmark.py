@@ -0,0 +1,79 @@
+"""
+Benchmark per-call latency of one-shot MCP connections versus a persistent session.
+
+Starts a local stand-in MCP server (FastMCP over SSE, one trivial `echo` tool)
+on 127.0.0.1 and times `invoke_tool` both ways:
+
+    python -m mcp_sse_client.examples.session_benchmark --calls 50
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uvicorn
+from mcp.server.fastmcp import FastMCP
+from mcp_sse_client import MCPClient
+
+
+def build_stand_in_server() -> FastMCP:
+    """Create a minimal MCP server with a single cheap tool."""
+    server = FastMCP("benchmark-stand-in")
+
+    @server.tool()
+    def echo(text: str) -> str:
+        """Return the input text."""
+        return text
+
+    return server
+
+
+async def time_calls(client: MCPClient, calls: int):
+    """Return per-call latencies in milliseconds."""
+    latencies = []
+    for i in range(calls):
+        start = time.perf_counter()
+        await client.invoke_tool("echo", {"text": f"ping {i}"})
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def summarize(label, latencies):
+    ordered = sorted(latencies)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    print(f"{label:<22} mean {statistics.mean(latencies):7.2f} ms | p50 {statistics.median(latencies):7.2f} ms | p95 {p95:7.2f} ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="MCP session reuse benchmark")
+    parser.add_argument("--calls", type=int, default=50, help="Tool calls per mode (default: 50)")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the stand-in server (default: 8765)")
+    args = parser.parse_args()
+
+    config = uvicorn.Config(build_stand_in_server().sse_app(), host="127.0.0.1", port=args.port, log_level="warning")
+    server = uvicorn.Server(config)
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    endpoint = f"http://127.0.0.1:{args.port}/sse"
+    try:
+        # One-shot: every call connects, initializes and disconnects
+        one_shot = await time_calls(MCPClient(endpoint), args.calls)
+
+        # Persistent: one connection and handshake shared by every call
+        async with MCPClient(endpoint) as client:
+            await client.list_tools()  # Warm up the connection
+            pooled = await time_calls(client, args.calls)
+            connects = client.session.connects
+
+        summarize("one-shot connection", one_shot)
+        summarize("persistent session", pooled)
+        print(f"Persistent session reconnects: {connects - 1}")
+    finally:
+        server.should_exit = True
+        await server_task
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -14,17 +14,17 @@ async def main():
     try:
         # Initialize the client
         print("Initializing client...")
-        client = MCPClient("http://localhost:8000/sse")
-        
-        # List available tools
-        print("Listing available tools...")
-        tools = await client.list_tools()
-        print("Available tools:")
-        for tool in tools:
-            print(f"- {tool.name}: {tool.description}")
-            print("  Parameters:")
-            for param in tool.parameters:
-                print(f"    - {param.name} ({param.parameter_type}): {param.description}")
+        # The context manager keeps one persistent session open for all calls
+        async with MCPClient("http://localhost:8000/sse") as client:
+            # List available tools
+            print("Listing available tools...")
+            tools = await client.list_tools()
+            print("Available tools:")
+            for tool in tools:
+                print(f"- {tool.name}: {tool.description}")
+                print("  Parameters:")
+                for param in tool.parameters:
+                    print(f"    - {param.name} ({param.parameter_type}): {param.description}")
         
         # # Invoke a tool
         # print("\nInvoking tool 'convert_document'...")
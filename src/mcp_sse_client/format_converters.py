@@ -1,8 +1,11 @@
 """
 Format converters for transforming MCP tool definitions to various LLM formats.
 """
-from typing import List, Dict, Any
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, List, Dict, Any, Optional, Tuple
 from .client import ToolDef, ToolParameter
+from .catalog_cache import tools_version
 
 # Type mapping from Python/MCP types to JSON Schema types
 TYPE_MAPPING = {
@@ -154,3 +157,63 @@ def to_anthropic_format(tools: List[ToolDef]) -> List[Dict[str, Any]]:
                 
         anthropic_tools.append(anthropic_tool)
     return anthropic_tools
+
+
+# Converters by target format name, used by the memoized conversion below
+CONVERTERS: Dict[str, Callable[[List[ToolDef]], List[Dict[str, Any]]]] = {
+    "openai": to_openai_format,
+    "anthropic": to_anthropic_format,
+}
+
+_CONVERTED_CACHE_SIZE = 32
+
+
+@dataclass(frozen=True)
+class ConvertedTools:
+    """Tool schemas converted once for one catalog version and target format.
+
+    Attributes:
+        version: Catalog version (content hash) the schemas were built from
+        format: Target format name ("openai", "anthropic")
+        schemas: Converted schema dicts; shared between queries, treat as read-only
+    """
+    version: str
+    format: str
+    schemas: List[Dict[str, Any]]
+
+
+_converted: "OrderedDict[Tuple[str, str], ConvertedTools]" = OrderedDict()
+
+
+def convert_tools_cached(tools: List[ToolDef], target_format: str, version: Optional[str] = None) -> ConvertedTools:
+    """Convert tools to a target format, memoized per (catalog version, format).
+
+    Args:
+        tools: List of ToolDef objects to convert
+        target_format: Key of CONVERTERS ("openai" or "anthropic")
+        version: Catalog content hash; computed from `tools` when omitted
+
+    Returns:
+        ConvertedTools with the converted schema dicts
+    """
+    if target_format not in CONVERTERS:
+        raise ValueError(f"Unknown tool format: {target_format}")
+    if version is None:
+        version = tools_version(tools)
+
+    key = (version, target_format)
+    converted = _converted.get(key)
+    if converted is not None:
+        _converted.move_to_end(key)
+        return converted
+
+    schemas = CONVERTERS[target_format](tools)
+    converted = ConvertedTools(
+        version=version,
+        format=target_format,
+        schemas=schemas,
+    )
+    _converted[key] = converted
+    if len(_converted) > _CONVERTED_CACHE_SIZE:
+        _converted.popitem(last=False)
+    return converted
@@ -3,12 +3,16 @@ LLM Bridge for integrating MCP client with various LLM providers.
 """
 """LLM Bridge module for integrating MCP with various LLM providers."""
 
-from .base import LLMBridge
+from .base import AgentEvent, LLMBridge
+from .batch import QueryBatchReport, QueryOutcome
 from .openai_bridge import OpenAIBridge
 from .anthropic_bridge import AnthropicBridge
 from .ollama_bridge import OllamaBridge # Import OllamaBridge
 
 __all__ = [
+    "AgentEvent",
+    "QueryBatchReport",
+    "QueryOutcome",
     "LLMBridge", 
     "OpenAIBridge", 
     "AnthropicBridge", 
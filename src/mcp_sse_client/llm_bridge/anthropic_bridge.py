@@ -1,27 +1,30 @@
 """
 Anthropic-specific implementation of the LLM Bridge.
 """
-from typing import Dict, List, Any, Optional
+from typing import AsyncIterator, Dict, List, Any, Optional
+import json
 import anthropic
-from ..client import ToolDef
-from ..format_converters import to_anthropic_format
-from .base import LLMBridge
+from ..client import ToolDef, ToolInvocationResult
+from .base import AgentEvent, LLMBridge, TurnResult
+from .http_pool import get_shared_http_client
 from .models import DEFAULT_ANTHROPIC_MODEL # Import default model
 
 
 class AnthropicBridge(LLMBridge):
     """Anthropic-specific implementation of the LLM Bridge."""
     
-    def __init__(self, mcp_client, api_key, model=DEFAULT_ANTHROPIC_MODEL): # Use imported default
+    def __init__(self, mcp_client, api_key, model=DEFAULT_ANTHROPIC_MODEL, catalog_cache=None): # Use imported default
         """Initialize Anthropic bridge with API key and model.
         
         Args:
             mcp_client: An initialized MCPClient instance
             api_key: Anthropic API key
             model: Anthropic model to use (default: from models.py)
+            catalog_cache: Optional ToolCatalogCache shared between bridges
         """
-        super().__init__(mcp_client)
-        self.llm_client = anthropic.Anthropic(api_key=api_key)
+        super().__init__(mcp_client, catalog_cache)
+        # Async client on the shared connection pool, so queries never block the event loop
+        self.llm_client = anthropic.AsyncAnthropic(api_key=api_key, http_client=get_shared_http_client())
         self.model = model
     
     async def format_tools(self, tools: List[ToolDef]) -> List[Dict[str, Any]]:
@@ -33,7 +36,7 @@ class AnthropicBridge(LLMBridge):
         Returns:
             List of tools in Anthropic format
         """
-        return to_anthropic_format(tools)
+        return self._convert_tools(tools, "anthropic").schemas
     
     async def submit_query(self, query: str, formatted_tools: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Submit a query to Anthropic with the formatted tools.
@@ -45,7 +48,7 @@ class AnthropicBridge(LLMBridge):
         Returns:
             Anthropic API response
         """
-        response = self.llm_client.messages.create(
+        response = await self.llm_client.messages.create(
             model=self.model,
             max_tokens=4096,
             system="You are a helpful tool-using assistant.",
@@ -57,20 +60,104 @@ class AnthropicBridge(LLMBridge):
         
         return response
     
-    async def parse_tool_call(self, llm_response: Any) -> Optional[Dict[str, Any]]:
-        """Parse the Anthropic response to extract tool calls.
+    async def parse_tool_calls(self, llm_response: Any) -> List[Dict[str, Any]]:
+        """Parse the Anthropic response to extract all tool calls.
         
         Args:
             llm_response: Response from Anthropic
             
         Returns:
-            Dictionary with tool name and parameters, or None if no tool call
+            List of dictionaries with tool use id, name and parameters
         """
-        for content in llm_response.content:
-            if content.type == "tool_use":
-                return {
-                    "name": content.name,  # Access name directly from the ToolUseBlock
-                    "parameters": content.input  # Access input directly from the ToolUseBlock
-                }
+        return [
+            {
+                "id": content.id,
+                "name": content.name,  # Access name directly from the ToolUseBlock
+                "parameters": content.input  # Access input directly from the ToolUseBlock
+            }
+            for content in llm_response.content
+            if content.type == "tool_use"
+        ]
+
+    async def stream_turn(self, messages: List[Dict[str, Any]], formatted_tools: List[Dict[str, Any]]) -> AsyncIterator[Any]:
+        """Stream one Anthropic turn for the agent loop (see LLMBridge.stream_turn).
         
-        return None
+        Args:
+            messages: Conversation so far, in Anthropic format
+            formatted_tools: Tools in Anthropic format
+            
+        Returns:
+            Async iterator of AgentEvent objects followed by one TurnResult
+        """
+        stream = await self.llm_client.messages.create(
+            model=self.model,
+            max_tokens=4096,
+            system="You are a helpful tool-using assistant.",
+            messages=messages,
+            tools=formatted_tools,
+            stream=True
+        )
+        
+        blocks: Dict[int, Dict[str, Any]] = {}  # Content blocks by stream index
+        tool_calls: List[Dict[str, Any]] = []
+        tokens = 0
+        
+        async for event in stream:
+            if event.type == "message_start":
+                tokens += event.message.usage.input_tokens
+            elif event.type == "content_block_start":
+                block = event.content_block
+                if block.type == "tool_use":
+                    blocks[event.index] = {"type": "tool_use", "id": block.id, "name": block.name, "partial_json": ""}
+                elif block.type == "text":
+                    blocks[event.index] = {"type": "text", "text": ""}
+            elif event.type == "content_block_delta":
+                block = blocks.get(event.index)
+                if block is None:
+                    continue
+                if event.delta.type == "text_delta":
+                    block["text"] += event.delta.text
+                    yield AgentEvent("llm_delta", 0, content=event.delta.text)
+                elif event.delta.type == "input_json_delta":
+                    block["partial_json"] += event.delta.partial_json
+            elif event.type == "content_block_stop":
+                block = blocks.get(event.index)
+                if block is not None and block["type"] == "tool_use":
+                    # The tool input is complete: start the call while the model continues
+                    try:
+                        block["input"] = json.loads(block.pop("partial_json") or "{}")
+                    except json.JSONDecodeError:
+                        print(f"Warning: Could not parse tool input as JSON for {block['name']}")
+                        block["input"] = {}
+                    tool_call = {"id": block["id"], "name": block["name"], "parameters": block["input"]}
+                    tool_calls.append(tool_call)
+                    yield AgentEvent("tool_start", 0, tool_call=tool_call)
+            elif event.type == "message_delta":
+                tokens += event.usage.output_tokens
+        
+        content = [blocks[index] for index in sorted(blocks) if blocks[index]["type"] == "tool_use" or blocks[index]["text"]]
+        text = "".join(block["text"] for block in content if block["type"] == "text")
+        yield TurnResult(text=text, tool_calls=tool_calls, messages=[{"role": "assistant", "content": content}], tokens=tokens)
+    
+    def tool_result_messages(self, tool_calls: List[Dict[str, Any]], tool_results: List[ToolInvocationResult]) -> List[Dict[str, Any]]:
+        """Return tool results as one Anthropic user message of `tool_result` blocks.
+        
+        Args:
+            tool_calls: Tool calls of the turn
+            tool_results: Their results, in call order
+            
+        Returns:
+            A single user message
+        """
+        return [{
+            "role": "user",
+            "content": [
+                {
+                    "type": "tool_result",
+                    "tool_use_id": tool_call["id"],
+                    "content": tool_result.content,
+                    "is_error": tool_result.error_code != 0
+                }
+                for tool_call, tool_result in zip(tool_calls, tool_results)
+            ]
+        }]
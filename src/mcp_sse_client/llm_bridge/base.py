@@ -2,30 +2,135 @@
 Base class for LLM Bridge implementations.
 """
 import abc
-from typing import Dict, List, Any, Optional
-from ..client import MCPClient, ToolDef, ToolInvocationResult
+import asyncio
+import time
+from dataclasses import dataclass, field, replace
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Any, Optional, Tuple
+from ..client import MCPClient, ToolDef, ToolInvocationResult, truncate_middle
+from ..catalog_cache import ToolCatalog, ToolCatalogCache, tools_version
+from ..format_converters import ConvertedTools, convert_tools_cached
+from ..result_cache import ToolResultCache
+from ..tool_index import PrefilterResult, ToolPrefilter
+from .batch import QueryBatchReport, QueryOutcome
+
+
+@dataclass
+class AgentEvent:
+    """One event of an agent run (see LLMBridge.run_agent).
+    
+    Attributes:
+        type: "llm_delta", "tool_start", "tool_result" or "final"
+        step: Zero-based agent step (one LLM turn plus its tool calls)
+        content: Text delta ("llm_delta") or the final answer ("final")
+        tool_call: Tool call for "tool_start"/"tool_result"
+        tool_result: ToolInvocationResult for "tool_result"
+        stop_reason: For "final": "answer", "max_steps" or "token_budget"
+        tokens_used: Tokens reported by the provider so far (0 if not reported)
+    """
+    type: str
+    step: int
+    content: Optional[str] = None
+    tool_call: Optional[Dict[str, Any]] = None
+    tool_result: Optional[ToolInvocationResult] = None
+    stop_reason: Optional[str] = None
+    tokens_used: int = 0
+
+
+@dataclass
+class TurnResult:
+    """Outcome of one streamed LLM turn, yielded last by `stream_turn`.
+    
+    Attributes:
+        text: Full assistant text of the turn
+        tool_calls: Parsed tool calls, in the order the model emitted them
+        messages: Provider-format messages recording the assistant turn
+        tokens: Tokens the provider reported for the turn (0 if not reported)
+    """
+    text: str
+    tool_calls: List[Dict[str, Any]] = field(default_factory=list)
+    messages: List[Dict[str, Any]] = field(default_factory=list)
+    tokens: int = 0
 
 
 class LLMBridge(abc.ABC):
     """Abstract base class for LLM bridge implementations."""
     
-    def __init__(self, mcp_client: MCPClient):
+    def __init__(self, mcp_client: MCPClient, catalog_cache: Optional[ToolCatalogCache] = None):
         """Initialize the LLM bridge with an MCPClient instance.
         
         Args:
             mcp_client: An initialized MCPClient instance
+            catalog_cache: Tool catalog cache (default: a disk-backed ToolCatalogCache)
         """
         self.mcp_client = mcp_client
+        self.catalog_cache = catalog_cache if catalog_cache is not None else ToolCatalogCache()
+        self.catalog: Optional[ToolCatalog] = None
         self.tools = None
+        self.max_parallel_tools = 8  # Tool calls of one turn running at the same time
+        self.tool_timeout: Optional[float] = 60.0  # Seconds per tool call (None: no limit)
+        self.llm_result_max_bytes: Optional[int] = 32_000  # Tool result size sent back to the model
+        # Optional async (tool_call, result) -> str used instead of truncation for oversized results
+        self.result_summarizer: Optional[Callable[[Dict[str, Any], ToolInvocationResult], Awaitable[str]]] = None
+        self.result_cache: Optional[ToolResultCache] = None  # Opt-in cache for read-only tool calls
+        self.tool_prefilter: Optional[ToolPrefilter] = None  # Opt-in: send only the top-k tools per query
+        self.prefilter_result_chars = 2000  # Characters of each tool result used for tool selection in agent steps
+        self._tools_by_name: Dict[str, ToolDef] = {}
+        self._tools_by_name_source: Optional[List[ToolDef]] = None
     
-    async def fetch_tools(self) -> List[ToolDef]:
+    async def fetch_tools(self, force_refresh: bool = False) -> List[ToolDef]:
         """Fetch available tools from the MCP endpoint.
         
+        A cached catalog (in memory or on disk) is returned immediately and
+        revalidated in the background; the server is only queried synchronously
+        when nothing is cached or `force_refresh` is set.
+        
+        Args:
+            force_refresh: Bypass the catalog cache
+            
         Returns:
             List of ToolDef objects
         """
-        self.tools = await self.mcp_client.list_tools()
+        self.catalog = await self.catalog_cache.get(self.mcp_client, force_refresh=force_refresh)
+        self.tools = self.catalog.tools
         return self.tools
+
+    def _sync_catalog(self):
+        """Adopt a newer catalog published by a background refresh (no I/O)."""
+        latest = self.catalog_cache.current(self.mcp_client.endpoint)
+        if latest is not None and (self.catalog is None or latest.content_hash != self.catalog.content_hash):
+            self.catalog = latest
+            self.tools = latest.tools
+    
+    def _convert_tools(self, tools: List[ToolDef], target_format: str) -> ConvertedTools:
+        """Convert tools once per catalog version and format (see convert_tools_cached).
+        
+        Args:
+            tools: List of ToolDef objects
+            target_format: Target format name ("openai", "anthropic")
+            
+        Returns:
+            Cached ConvertedTools for the tools
+        """
+        version = self.catalog.content_hash if self.catalog is not None and tools is self.catalog.tools else None
+        return convert_tools_cached(tools, target_format, version)
+    
+    def _select_tools(self, query: str, formatted_tools: Any) -> Tuple[Any, Optional[PrefilterResult]]:
+        """Narrow the formatted tools to the prefilter's picks for this query.
+        
+        Args:
+            query: Text to select for (the user query, or the latest tool results in an agent step)
+            formatted_tools: Formatted tools for the full tool list, in list order
+            
+        Returns:
+            (formatted tools to send, PrefilterResult or None without a prefilter)
+        """
+        if self.tool_prefilter is None or not self.tools:
+            return formatted_tools, None
+        version = self.catalog.content_hash if self.catalog is not None and self.tools is self.catalog.tools else tools_version(self.tools)
+        selection = self.tool_prefilter.select(query, self.tools, version)
+        if selection.fallback:
+            return formatted_tools, selection
+        return [formatted_tools[i] for i in selection.indices], selection
     
     @abc.abstractmethod
     async def format_tools(self, tools: List[ToolDef]) -> Any:
@@ -52,9 +157,23 @@ class LLMBridge(abc.ABC):
         """
         pass
     
-    @abc.abstractmethod
+    async def parse_tool_calls(self, llm_response: Any) -> List[Dict[str, Any]]:
+        """Parse every tool call from the LLM response, in the order the model emitted them.
+        
+        Bridges override this; the default wraps `parse_tool_call` for
+        implementations that only understand a single call.
+        
+        Args:
+            llm_response: Response from the LLM
+            
+        Returns:
+            List of dictionaries with tool name, parameters and (if provided) call id
+        """
+        tool_call = await self.parse_tool_call(llm_response)
+        return [tool_call] if tool_call else []
+    
     async def parse_tool_call(self, llm_response: Any) -> Optional[Dict[str, Any]]:
-        """Parse the LLM response to extract tool calls.
+        """Parse the LLM response to extract the first tool call.
         
         Args:
             llm_response: Response from the LLM
@@ -62,7 +181,10 @@ class LLMBridge(abc.ABC):
         Returns:
             Dictionary with tool name and parameters, or None if no tool call
         """
-        pass
+        if type(self).parse_tool_calls is LLMBridge.parse_tool_calls:
+            raise NotImplementedError("LLMBridge subclasses must implement parse_tool_calls or parse_tool_call")
+        tool_calls = await self.parse_tool_calls(llm_response)
+        return tool_calls[0] if tool_calls else None
     
     async def execute_tool(self, tool_name: str, kwargs: Dict[str, Any]) -> ToolInvocationResult:
         """Execute a tool with the given parameters.
@@ -74,8 +196,212 @@ class LLMBridge(abc.ABC):
         Returns:
             ToolInvocationResult containing the tool's response
         """
+        if self.result_cache is not None:
+            tool = self._tool_by_name(tool_name)
+            if self.result_cache.is_cacheable(tool_name, tool):
+                endpoint = ((tool.metadata if tool else None) or {}).get("endpoint") or self.mcp_client.endpoint
+                return await self.result_cache.get_or_call(
+                    endpoint, tool_name, kwargs, lambda: self.mcp_client.invoke_tool(tool_name, kwargs)
+                )
+            self.result_cache.metrics.bypassed += 1
         return await self.mcp_client.invoke_tool(tool_name, kwargs)
     
+    def _tool_by_name(self, tool_name: str) -> Optional[ToolDef]:
+        """Look up a ToolDef by name (index rebuilt only when the tool list changes)."""
+        if self._tools_by_name_source is not self.tools:
+            self._tools_by_name = {tool.name: tool for tool in self.tools or []}
+            self._tools_by_name_source = self.tools
+        return self._tools_by_name.get(tool_name)
+    
+    async def execute_tools(self, tool_calls: List[Dict[str, Any]]) -> List[ToolInvocationResult]:
+        """Execute tool calls concurrently, at most `max_parallel_tools` at a time.
+        
+        Each call is bounded by `tool_timeout`. A call that fails or times out
+        yields an error result instead of cancelling the others.
+        
+        Args:
+            tool_calls: Parsed tool calls (see parse_tool_calls)
+            
+        Returns:
+            ToolInvocationResult for each call, in call order
+        """
+        semaphore = asyncio.Semaphore(max(1, self.max_parallel_tools))
+        # gather keeps the results in call order regardless of completion order
+        return list(await asyncio.gather(*(self._run_tool_call(tool_call, semaphore) for tool_call in tool_calls)))
+    
+    async def _run_tool_call(self, tool_call: Dict[str, Any], semaphore: asyncio.Semaphore) -> ToolInvocationResult:
+        """Run one tool call under the semaphore and timeout, turning failures into error results."""
+        tool_name = tool_call.get("name")
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(
+                    self.execute_tool(tool_name, tool_call.get("parameters") or {}),
+                    timeout=self.tool_timeout,
+                )
+            except asyncio.TimeoutError:
+                return ToolInvocationResult(content=f"Tool '{tool_name}' timed out after {self.tool_timeout}s", error_code=1)
+            except Exception as e:
+                return ToolInvocationResult(content=f"Tool '{tool_name}' failed: {e}", error_code=1)
+    
+    async def prepare_tool_result(self, tool_call: Dict[str, Any], tool_result: ToolInvocationResult) -> ToolInvocationResult:
+        """Fit a tool result into `llm_result_max_bytes` before it goes back to the model.
+        
+        Oversized results are summarized with `result_summarizer` when one is
+        set, otherwise truncated in the middle (head and tail are kept).
+        
+        Args:
+            tool_call: The tool call that produced the result
+            tool_result: The full tool result
+            
+        Returns:
+            The result itself, or a copy with shortened content
+        """
+        limit = self.llm_result_max_bytes
+        if limit is None or len(tool_result.content) <= limit // 4:  # Cheap check: 4 bytes per char at most
+            return tool_result
+        if self.result_summarizer is not None and len(tool_result.content.encode("utf-8")) > limit:
+            try:
+                summary = await self.result_summarizer(tool_call, tool_result)
+                return replace(tool_result, content=truncate_middle([summary], limit)[0], truncated=True)
+            except Exception as e:
+                print(f"Warning: summarizing the result of '{tool_call.get('name')}' failed, truncating instead: {e}")
+        content, truncated, _ = truncate_middle([tool_result.content], limit)
+        return replace(tool_result, content=content, truncated=tool_result.truncated or truncated) if truncated else tool_result
+    
+    # --- Agent loop ---
+    
+    def initial_messages(self, query: str) -> List[Dict[str, Any]]:
+        """Build the opening conversation for an agent run.
+        
+        Args:
+            query: User query string
+            
+        Returns:
+            Provider-format message list
+        """
+        return [{"role": "user", "content": query}]
+    
+    def stream_turn(self, messages: List[Dict[str, Any]], formatted_tools: Any) -> AsyncIterator[Any]:
+        """Stream one LLM turn for the agent loop.
+        
+        Implementations yield AgentEvent("llm_delta") for text as it arrives,
+        AgentEvent("tool_start") as soon as each tool call is complete (so it can
+        start while the model is still generating), and finally a TurnResult.
+        The `step` of yielded events is filled in by run_agent.
+        
+        Args:
+            messages: Conversation so far, in provider format
+            formatted_tools: Tools in the LLM-specific format
+            
+        Returns:
+            Async iterator of AgentEvent objects followed by one TurnResult
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support the agent loop")
+    
+    def tool_result_messages(self, tool_calls: List[Dict[str, Any]], tool_results: List[ToolInvocationResult]) -> List[Dict[str, Any]]:
+        """Build the provider-format messages that return tool results to the model.
+        
+        Args:
+            tool_calls: Tool calls of the turn
+            tool_results: Their results, in call order
+            
+        Returns:
+            Messages to append to the conversation
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support the agent loop")
+    
+    async def run_agent(self, query: str, max_steps: int = 8, max_tokens: Optional[int] = None) -> AsyncIterator[AgentEvent]:
+        """Run the query as a multi-step agent, streaming events as they happen.
+        
+        Each step streams one LLM turn. Tool calls start executing as soon as
+        the model has finished emitting them (concurrently, bounded by
+        `max_parallel_tools` and `tool_timeout`), and their results are fed
+        back to the model. The loop ends when the model answers without tool
+        calls, after `max_steps` turns, or once `max_tokens` is used up.
+        With a `tool_prefilter`, the first step selects tools for the query and
+        later steps for the query plus the previous turn's text and the start of
+        its tool results (`prefilter_result_chars` each), so tools a follow-up
+        step needs can be ranked in without losing those the query asked for.
+        
+        Usage::
+        
+            async for event in bridge.run_agent("..."):
+                if event.type == "llm_delta":
+                    print(event.content, end="")
+        
+        Args:
+            query: User query string
+            max_steps: Maximum number of LLM turns
+            max_tokens: Total token budget across turns (None: unlimited)
+            
+        Returns:
+            Async iterator of AgentEvent objects, ending with a "final" event
+        """
+        await self._ensure_tools()
+        
+        messages = self.initial_messages(query)
+        semaphore = asyncio.Semaphore(max(1, self.max_parallel_tools))
+        tokens_used = 0
+        text = ""
+        tasks: List[asyncio.Task] = []
+        selection_text = query
+        try:
+            for step in range(max_steps):
+                formatted_tools, _ = self._select_tools(selection_text, await self.format_tools(self.tools))
+                tasks = []
+                turn: Optional[TurnResult] = None
+                
+                async for item in self.stream_turn(messages, formatted_tools):
+                    if isinstance(item, TurnResult):
+                        turn = item
+                        continue
+                    item.step = step
+                    if item.type == "tool_start":
+                        # Speculative: the call runs while the model keeps generating
+                        tasks.append(asyncio.create_task(self._run_tool_call(item.tool_call, semaphore)))
+                    item.tokens_used = tokens_used
+                    yield item
+                
+                if turn is None:
+                    raise RuntimeError(f"{type(self).__name__}.stream_turn ended without a TurnResult")
+                tokens_used += turn.tokens
+                text = turn.text
+                if not turn.tool_calls:
+                    yield AgentEvent("final", step, content=text, stop_reason="answer", tokens_used=tokens_used)
+                    return
+                
+                # Calls missed by the stream (should not happen) still get executed, in order
+                for tool_call in turn.tool_calls[len(tasks):]:
+                    tasks.append(asyncio.create_task(self._run_tool_call(tool_call, semaphore)))
+                
+                index_of = {task: i for i, task in enumerate(tasks)}
+                pending = set(tasks)
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in sorted(done, key=index_of.get):
+                        yield AgentEvent("tool_result", step, tool_call=turn.tool_calls[index_of[task]],
+                                         tool_result=task.result(), tokens_used=tokens_used)
+                
+                messages.extend(turn.messages)
+                tool_results = await asyncio.gather(*(
+                    self.prepare_tool_result(tool_call, task.result()) for tool_call, task in zip(turn.tool_calls, tasks)
+                ))
+                messages.extend(self.tool_result_messages(turn.tool_calls, list(tool_results)))
+                selection_text = "\n".join([query, turn.text] + [
+                    tool_result.content[:self.prefilter_result_chars] for tool_result in tool_results
+                ])
+                
+                if max_tokens is not None and tokens_used >= max_tokens:
+                    yield AgentEvent("final", step, content=text, stop_reason="token_budget", tokens_used=tokens_used)
+                    return
+            
+            yield AgentEvent("final", max_steps - 1, content=text, stop_reason="max_steps", tokens_used=tokens_used)
+        finally:
+            # The consumer stopped early (or a turn failed): don't leave tool calls running
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
     async def process_query(self, query: str) -> Dict[str, Any]:
         """Process a user query through the LLM and execute any tool calls.
         
@@ -84,38 +410,115 @@ class LLMBridge(abc.ABC):
         2. Format tools for the LLM
         3. Submit query to LLM
         4. Parse tool calls from LLM response
-        5. Execute tool if needed
+        5. Execute all tool calls concurrently
         
         Args:
             query: User query string
             
         Returns:
-            Dictionary containing the LLM response, tool call, and tool result
+            Dictionary containing the LLM response, the tool calls and their
+            results (in call order), plus `tool_call`/`tool_result` for the
+            first call
         """
-        # 1. Fetch tools if not already fetched
-        if self.tools is None:
-            await self.fetch_tools()
+        # 1. Fetch tools if not already fetched (and pick up background catalog updates)
+        await self._ensure_tools()
         
         # 2. Format tools for the LLM
         formatted_tools = await self.format_tools(self.tools)
         
+        return await self._run_query(query, formatted_tools)
+    
+    async def _ensure_tools(self):
+        """Fetch tools on first use, afterwards adopt background catalog updates."""
+        if self.tools is None:
+            await self.fetch_tools()
+        else:
+            self._sync_catalog()
+    
+    async def _run_query(self, query: str, formatted_tools: Any, execute: bool = True) -> Dict[str, Any]:
+        """Steps 3-5 of process_query with already formatted tools (narrowed by the prefilter, if any)."""
+        formatted_tools, prefilter = self._select_tools(query, formatted_tools)
+        
         # 3. Submit query to LLM
         llm_response = await self.submit_query(query, formatted_tools)
         
         # 4. Parse tool calls from LLM response
-        tool_call = await self.parse_tool_call(llm_response)
+        tool_calls = await self.parse_tool_calls(llm_response)
         
         result = {
             "llm_response": llm_response,
-            "tool_call": tool_call,
-            "tool_result": None
+            "tool_calls": tool_calls,
+            "tool_results": [],
+            "tool_call": tool_calls[0] if tool_calls else None,
+            "tool_result": None,
+            "prefilter": prefilter
         }
         
-        # 5. Execute tool if needed
-        if tool_call:
-            tool_name = tool_call.get("name")
-            kwargs = tool_call.get("parameters", {})
-            tool_result = await self.execute_tool(tool_name, kwargs)
-            result["tool_result"] = tool_result
+        # 5. Execute tools if needed
+        if tool_calls and execute:
+            tool_results = await self.execute_tools(tool_calls)
+            result["tool_results"] = tool_results
+            result["tool_result"] = tool_results[0]
         
         return result
+    
+    async def process_queries(self, queries: Iterable[str], concurrency: int = 8, execute_tools: bool = True,
+                              report: Optional[QueryBatchReport] = None) -> AsyncIterator[QueryOutcome]:
+        """Process many queries with bounded concurrency, streaming outcomes as they finish.
+        
+        Tools are fetched and formatted once for the whole batch, and every
+        query shares the MCP client's session. Queries are pulled from
+        `queries` lazily, so large inputs are not loaded up front. A failing
+        query yields an outcome with `error` set instead of stopping the batch.
+        
+        Usage::
+        
+            report = QueryBatchReport()
+            async for outcome in bridge.process_queries(queries, concurrency=16, report=report):
+                ...
+            print(report.format())
+        
+        Args:
+            queries: Query strings
+            concurrency: Maximum queries in flight
+            execute_tools: Run the selected tools (False: only record the selection)
+            report: Optional QueryBatchReport to fill in
+            
+        Returns:
+            Async iterator of QueryOutcome objects in completion order
+        """
+        await self._ensure_tools()
+        formatted_tools = await self.format_tools(self.tools)  # Shared by every query in the batch
+        
+        pending_queries = iter(enumerate(queries))
+        outcomes: "asyncio.Queue[Optional[QueryOutcome]]" = asyncio.Queue()
+        
+        async def worker():
+            try:
+                for index, query in pending_queries:  # Shared iterator: each query is taken once
+                    start = time.perf_counter()
+                    try:
+                        result = await self._run_query(query, formatted_tools, execute=execute_tools)
+                        outcome = QueryOutcome(index, query, result=result, latency=time.perf_counter() - start)
+                    except Exception as e:
+                        outcome = QueryOutcome(index, query, error=str(e) or type(e).__name__, latency=time.perf_counter() - start)
+                    outcomes.put_nowait(outcome)
+            finally:
+                outcomes.put_nowait(None)  # Worker finished
+        
+        workers = [asyncio.create_task(worker()) for _ in range(max(1, concurrency))]
+        running = len(workers)
+        try:
+            while running:
+                outcome = await outcomes.get()
+                if outcome is None:
+                    running -= 1
+                    continue
+                if report is not None:
+                    report.add(outcome)
+                yield outcome
+        finally:
+            for task in workers:
+                task.cancel()
+            if report is not None:
+                report.finish()
@@ -0,0 +1,94 @@
+"""
+Result and report types for batch query runs (see LLMBridge.process_queries).
+"""
+import math
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class QueryOutcome:
+    """Result of one query in a batch.
+    
+    Attributes:
+        index: Position of the query in the input
+        query: The query string
+        result: process_query-style result dictionary, or None on error
+        error: Error message if the query failed
+        latency: Seconds from start to finish of this query
+    """
+    index: int
+    query: str
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    latency: float = 0.0
+
+    @property
+    def tool_names(self) -> List[str]:
+        """Names of the tools the model selected, in call order."""
+        if not self.result:
+            return []
+        return [tool_call.get("name") for tool_call in self.result.get("tool_calls") or []]
+
+
+@dataclass
+class QueryBatchReport:
+    """Summary of a batch run: tool-selection distribution and latencies.
+    
+    Pass one to `process_queries(..., report=report)`; it is filled as
+    outcomes stream out and finished when the batch ends.
+    """
+    total: int = 0
+    failed: int = 0
+    no_tool: int = 0
+    tool_counts: Counter = field(default_factory=Counter)  # First selected tool per query
+    call_counts: Counter = field(default_factory=Counter)  # Every tool call, including parallel ones
+    latencies: List[float] = field(default_factory=list)
+    started_at: float = field(default_factory=time.perf_counter)
+    elapsed: float = 0.0
+
+    def add(self, outcome: QueryOutcome):
+        self.total += 1
+        self.latencies.append(outcome.latency)
+        if outcome.error is not None:
+            self.failed += 1
+            return
+        names = outcome.tool_names
+        if not names:
+            self.no_tool += 1
+        else:
+            self.tool_counts[names[0]] += 1
+            self.call_counts.update(names)
+
+    def finish(self):
+        self.elapsed = time.perf_counter() - self.started_at
+
+    def percentile(self, p: float) -> float:
+        """Nearest-rank percentile of the per-query latencies."""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        rank = max(1, math.ceil(p / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+    @property
+    def throughput(self) -> float:
+        return self.total / self.elapsed if self.elapsed > 0 else 0.0
+
+    def format(self) -> str:
+        lines = [
+            f"Queries: {self.total} ({self.failed} failed, {self.no_tool} without a tool call)",
+            f"Elapsed: {self.elapsed:.1f}s ({self.throughput:.2f} queries/s)",
+            f"Latency: p50 {self.percentile(50):.2f}s | p95 {self.percentile(95):.2f}s | max {max(self.latencies, default=0.0):.2f}s",
+            "Tool selection (first call per query):",
+        ]
+        answered = self.total - self.failed
+        for name, count in self.tool_counts.most_common():
+            share = count / answered * 100 if answered else 0.0
+            lines.append(f"  {name:<32} {count:6d}  {share:5.1f}%")
+        if self.no_tool:
+            share = self.no_tool / answered * 100 if answered else 0.0
+            lines.append(f"  {'(no tool)':<32} {self.no_tool:6d}  {share:5.1f}%")
+        return "\n".join(lines)
@@ -0,0 +1,72 @@
+"""
+Shared async HTTP connection pool for the provider SDK clients.
+
+OpenAI and Anthropic bridges hand the same `httpx.AsyncClient` to their async
+SDK clients, so every bridge in the process reuses one set of keep-alive
+connections per provider host instead of opening its own pool.
+
+Pooled connections belong to the event loop that opened them, so the client's
+transport keeps one pool per running loop: a bridge created once and used
+from successive `asyncio.run` calls gets fresh connections on each new loop.
+"""
+import asyncio
+from typing import Dict, Optional
+import httpx
+
+# Connection limits for the shared pool (per process, across all provider hosts)
+DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60.0)
+# The SDKs pass their own per-request timeouts; this only applies to raw use of the client
+DEFAULT_TIMEOUT = httpx.Timeout(600.0, connect=10.0)
+
+_shared_client: Optional[httpx.AsyncClient] = None
+
+
+class PerLoopTransport(httpx.AsyncBaseTransport):
+    """Dispatches each request to a connection pool owned by the running event loop."""
+
+    def __init__(self, limits: httpx.Limits = DEFAULT_LIMITS):
+        self.limits = limits
+        self._pools: Dict[asyncio.AbstractEventLoop, httpx.AsyncHTTPTransport] = {}
+
+    def _pool(self) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        pool = self._pools.get(loop)
+        if pool is None:
+            # Connections of closed loops are unusable (and unclosable); just drop them
+            for old_loop in [old_loop for old_loop in self._pools if old_loop.is_closed()]:
+                del self._pools[old_loop]
+            pool = httpx.AsyncHTTPTransport(limits=self.limits)
+            self._pools[loop] = pool
+        return pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._pool().handle_async_request(request)
+
+    async def aclose(self):
+        """Close the running loop's pool; pools of other loops can only be dropped."""
+        pool = self._pools.pop(asyncio.get_running_loop(), None)
+        self._pools.clear()
+        if pool is not None:
+            await pool.aclose()
+
+
+def get_shared_http_client() -> httpx.AsyncClient:
+    """Return the process-wide async HTTP client, creating it on first use.
+    
+    It can be created outside an event loop and used from any loop (see module docstring).
+    
+    Returns:
+        Shared httpx.AsyncClient
+    """
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = httpx.AsyncClient(transport=PerLoopTransport(DEFAULT_LIMITS), timeout=DEFAULT_TIMEOUT)
+    return _shared_client
+
+
+async def close_shared_http_client():
+    """Close the shared client and its connections (a later call to get_shared_http_client opens a new one)."""
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
@@ -1,22 +1,25 @@
 """
 Ollama-specific implementation of the LLM Bridge for local models.
 """
-from typing import Dict, List, Any, Optional
+from typing import AsyncIterator, Dict, List, Any, Optional, Union
+import asyncio
 import json
+import time
 import ollama
-from ..client import ToolDef
-from ..format_converters import to_openai_format # Ollama uses OpenAI-like tool format
-from .base import LLMBridge
+from ..client import ToolDef, ToolInvocationResult
+from .base import AgentEvent, LLMBridge, TurnResult
 from .models import OPENAI_MODELS # Re-use OpenAI format for tools
 
 # Note: Ollama model names are user-defined (e.g., 'llama3', 'mistral')
 # We won't define a static list here, but allow users to specify.
 DEFAULT_OLLAMA_MODEL = "llama3" # A common default, user might need to change
+DEFAULT_KEEP_ALIVE = "30m" # How long Ollama keeps the model loaded after the last request
 
 class OllamaBridge(LLMBridge):
     """Ollama-specific implementation of the LLM Bridge."""
     
-    def __init__(self, mcp_client, model=DEFAULT_OLLAMA_MODEL, host=None):
+    def __init__(self, mcp_client, model=DEFAULT_OLLAMA_MODEL, host=None, catalog_cache=None,
+                 keep_alive: Union[str, float, None] = DEFAULT_KEEP_ALIVE, warm_up: bool = True):
         """Initialize Ollama bridge with model and optional host.
         
         Args:
@@ -25,13 +28,45 @@ class OllamaBridge(LLMBridge):
                    Ensure the model is available locally in Ollama.
             host: Optional URL of the Ollama server (e.g., 'http://localhost:11434').
                   If None, the default host configured for the ollama library will be used.
+            catalog_cache: Optional ToolCatalogCache shared between bridges.
+            keep_alive: Ollama keep_alive sent with every request (e.g. '30m', seconds,
+                        -1 to keep the model loaded, 0 to unload right away, None for the server default).
+            warm_up: Preload the model in the background when the bridge starts
+                     (needs a running event loop; otherwise call `warm_up()` yourself).
         """
-        super().__init__(mcp_client)
+        super().__init__(mcp_client, catalog_cache)
         # Initialize Ollama client, optionally specifying the host
         self.llm_client = ollama.AsyncClient(host=host) 
         self.model = model
         self.host = host # Store host for potential display/debugging
+        self.keep_alive = keep_alive
+        self.last_ttft: Optional[float] = None # Seconds to the first streamed chunk of the last query
+        self._models_probe: Optional[asyncio.Task] = None # Single cached list() call
+        self.warm_up_task: Optional[asyncio.Task] = None
         print(f"Ollama Bridge initialized. Model: {self.model}, Host: {self.host or 'default'}")
+        if warm_up:
+            try:
+                self.warm_up_task = asyncio.get_running_loop().create_task(self.warm_up())
+            except RuntimeError:
+                pass # No loop yet; the caller can await warm_up() later
+
+    async def warm_up(self) -> bool:
+        """Load the model into memory ahead of the first query.
+        
+        Sends an empty generate request, which makes Ollama load the model
+        and keep it for `keep_alive` without producing any tokens.
+        
+        Returns:
+            True if the model is loaded
+        """
+        start = time.perf_counter()
+        try:
+            await self.llm_client.generate(model=self.model, prompt="", keep_alive=self.keep_alive)
+        except Exception as e:
+            print(f"Warning: could not preload Ollama model '{self.model}': {e}")
+            return False
+        print(f"Ollama model '{self.model}' loaded in {time.perf_counter() - start:.2f}s")
+        return True
 
     async def format_tools(self, tools: List[ToolDef]) -> List[Dict[str, Any]]:
         """Format tools for Ollama (uses OpenAI-like format).
@@ -42,7 +77,7 @@ class OllamaBridge(LLMBridge):
         Returns:
             List of tools in Ollama/OpenAI format
         """
-        return to_openai_format(tools)
+        return self._convert_tools(tools, "openai").schemas
     
     async def submit_query(self, query: str, formatted_tools: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Submit a query to Ollama with the formatted tools.
@@ -57,14 +92,34 @@ class OllamaBridge(LLMBridge):
         messages = [{"role": "user", "content": query}]
         
         try:
-            response = await self.llm_client.chat(
+            # Stream the reply and assemble it, so time-to-first-token can be tracked
+            start = time.perf_counter()
+            self.last_ttft = None
+            content_parts = []
+            tool_calls = []
+            response: Dict[str, Any] = {}
+            async for chunk in await self.llm_client.chat(
                 model=self.model,
                 messages=messages,
                 tools=formatted_tools,
+                stream=True,
+                keep_alive=self.keep_alive,
                 # Ollama automatically decides on tool use if tools are provided
-            )
-            # The response object is already a dictionary
-            return response 
+            ):
+                if self.last_ttft is None:
+                    self.last_ttft = time.perf_counter() - start
+                message = chunk.get('message') or {}
+                if message.get('content'):
+                    content_parts.append(message.get('content'))
+                tool_calls.extend(message.get('tool_calls') or [])
+                if chunk.get('done'):
+                    # The final chunk carries the timing and token counts
+                    response = {key: chunk.get(key) for key in (
+                        'model', 'created_at', 'done', 'done_reason', 'total_duration', 'load_duration',
+                        'prompt_eval_count', 'prompt_eval_duration', 'eval_count', 'eval_duration'
+                    )}
+            response['message'] = {"role": "assistant", "content": "".join(content_parts), "tool_calls": tool_calls or None}
+            return response
         except ollama.ResponseError as e:
             # Handle potential errors like model not found
             print(f"Ollama API Error: {e.error} (Status code: {e.status_code})")
@@ -74,71 +129,131 @@ class OllamaBridge(LLMBridge):
             print(f"An unexpected error occurred with Ollama: {e}")
             raise e
 
-    async def parse_tool_call(self, llm_response: Any) -> Optional[Dict[str, Any]]:
-        """Parse the Ollama response to extract tool calls.
+    async def parse_tool_calls(self, llm_response: Any) -> List[Dict[str, Any]]:
+        """Parse the Ollama response to extract all tool calls.
         
         Args:
             llm_response: Response dictionary from Ollama
             
         Returns:
-            Dictionary with tool name and parameters, or None if no tool call
+            List of dictionaries with tool name and parameters
         """
         message = llm_response.get('message', {})
         tool_calls = message.get('tool_calls')
 
         if not tool_calls:
-            return None
-        
-        # Ollama might return multiple tool calls, handle the first one for now
-        tool_call = tool_calls[0] 
-        function_info = tool_call.get('function', {})
+            return []
         
-        # Ensure arguments are loaded as JSON if they are a string
-        arguments = function_info.get('arguments', {})
-        if isinstance(arguments, str):
-            try:
-                arguments = json.loads(arguments)
-            except json.JSONDecodeError:
-                print(f"Warning: Could not parse tool arguments as JSON: {arguments}")
-                arguments = {} # Fallback to empty dict
+        parsed_calls = []
+        for tool_call in tool_calls:
+            function_info = tool_call.get('function', {})
+            
+            # Ensure arguments are loaded as JSON if they are a string
+            arguments = function_info.get('arguments', {})
+            if isinstance(arguments, str):
+                try:
+                    arguments = json.loads(arguments)
+                except json.JSONDecodeError:
+                    print(f"Warning: Could not parse tool arguments as JSON: {arguments}")
+                    arguments = {} # Fallback to empty dict
+
+            parsed_calls.append({
+                "name": function_info.get('name'),
+                "parameters": arguments
+            })
+        return parsed_calls
 
-        return {
-            "name": function_info.get('name'),
-            "parameters": arguments
-        }
+    async def list_models(self, refresh: bool = False) -> List[str]:
+        """Return the names of the locally available models.
+        
+        The server is asked once; later calls (including concurrent ones)
+        share that result until `refresh` is set.
+        
+        Args:
+            refresh: Query the server again
+            
+        Returns:
+            List of model names
+        """
+        probe = self._models_probe
+        if refresh or probe is None or (probe.done() and (probe.cancelled() or probe.exception() is not None)):
+            self._models_probe = asyncio.ensure_future(self.llm_client.list())
+        models_info = await asyncio.shield(self._models_probe)
+        
+        # Handle different response structures (ListResponse, dict or plain list)
+        models = models_info.get('models', []) if hasattr(models_info, 'get') else models_info
+        names = [model.get('model') or model.get('name') or '' for model in models or []]
+        return [name for name in names if name]
 
     async def check_connection(self):
         """Check if the Ollama server is reachable and the model exists."""
         try:
-            # Simple check to see if server responds
-            await self.llm_client.list()
-            
-            # Check if the specific model exists locally
-            models_info = await self.llm_client.list()
-            
-            # Debug the response structure
-            print(f"Ollama models response in check_connection: {models_info}")
-            
-            # Handle different response structures
-            model_names = []
-            if isinstance(models_info, dict) and 'models' in models_info:
-                # New API format
-                model_names = [m.get('name', m.get('model', '')) for m in models_info.get('models', [])]
-            elif isinstance(models_info, list):
-                # Older API format or direct list
-                model_names = [m.get('name', m.get('model', '')) for m in models_info]
-            
-            # Filter out empty names
-            model_names = [name for name in model_names if name]
+            model_names = await self.list_models()
             
             if not model_names:
                 print("Warning: No models found in Ollama response")
                 return True  # Still return True as the server is reachable
                 
-            if self.model not in model_names:
+            # Ollama reports tagged names ('llama3:latest'), so accept the untagged form too
+            if self.model not in model_names and f"{self.model}:latest" not in model_names:
                 print(f"Warning: Model '{self.model}' not found in local Ollama models: {model_names}")
                 # Depending on strictness, could raise an error here
             return True
         except Exception as e:
             print(f"Error connecting to Ollama host '{self.host or 'default'}': {e}")
             return False
+
+    async def stream_turn(self, messages: List[Dict[str, Any]], formatted_tools: List[Dict[str, Any]]) -> AsyncIterator[Any]:
+        """Stream one Ollama turn for the agent loop (see LLMBridge.stream_turn).
+        
+        Ollama sends each tool call whole in a single chunk, so calls start as
+        soon as their chunk arrives.
+        
+        Args:
+            messages: Conversation so far, in Ollama format
+            formatted_tools: Tools in Ollama/OpenAI format
+            
+        Returns:
+            Async iterator of AgentEvent objects followed by one TurnResult
+        """
+        text_parts = []
+        tool_calls: List[Dict[str, Any]] = []
+        tokens = 0
+        
+        async for chunk in await self.llm_client.chat(model=self.model, messages=messages, tools=formatted_tools,
+                                                      stream=True, keep_alive=self.keep_alive):
+            message = chunk.get('message') or {}
+            content = message.get('content')
+            if content:
+                text_parts.append(content)
+                yield AgentEvent("llm_delta", 0, content=content)
+            if message.get('tool_calls'):
+                for tool_call in await self.parse_tool_calls({'message': message}):
+                    tool_calls.append(tool_call)
+                    yield AgentEvent("tool_start", 0, tool_call=tool_call)
+            if chunk.get('done'):
+                tokens = (chunk.get('prompt_eval_count') or 0) + (chunk.get('eval_count') or 0)
+        
+        text = "".join(text_parts)
+        assistant_message: Dict[str, Any] = {"role": "assistant", "content": text}
+        if tool_calls:
+            assistant_message["tool_calls"] = [
+                {"function": {"name": tool_call["name"], "arguments": tool_call["parameters"]}}
+                for tool_call in tool_calls
+            ]
+        yield TurnResult(text=text, tool_calls=tool_calls, messages=[assistant_message], tokens=tokens)
+
+    def tool_result_messages(self, tool_calls: List[Dict[str, Any]], tool_results: List[ToolInvocationResult]) -> List[Dict[str, Any]]:
+        """Return tool results as Ollama `tool` messages.
+        
+        Args:
+            tool_calls: Tool calls of the turn
+            tool_results: Their results, in call order
+            
+        Returns:
+            One `tool` message per call
+        """
+        return [
+            {"role": "tool", "content": tool_result.content, "tool_name": tool_call["name"]}
+            for tool_call, tool_result in zip(tool_calls, tool_results)
+        ]
@@ -1,28 +1,30 @@
 """
 OpenAI-specific implementation of the LLM Bridge.
 """
-from typing import Dict, List, Any, Optional
+from typing import AsyncIterator, Dict, List, Any, Optional
 import json
 import openai
-from ..client import ToolDef
-from ..format_converters import to_openai_format
-from .base import LLMBridge
+from ..client import ToolDef, ToolInvocationResult
+from .base import AgentEvent, LLMBridge, TurnResult
+from .http_pool import get_shared_http_client
 from .models import DEFAULT_OPENAI_MODEL # Import default model
 
 
 class OpenAIBridge(LLMBridge):
     """OpenAI-specific implementation of the LLM Bridge."""
     
-    def __init__(self, mcp_client, api_key, model=DEFAULT_OPENAI_MODEL): # Use imported default
+    def __init__(self, mcp_client, api_key, model=DEFAULT_OPENAI_MODEL, catalog_cache=None): # Use imported default
         """Initialize OpenAI bridge with API key and model.
         
         Args:
             mcp_client: An initialized MCPClient instance
             api_key: OpenAI API key
             model: OpenAI model to use (default: from models.py)
+            catalog_cache: Optional ToolCatalogCache shared between bridges
         """
-        super().__init__(mcp_client)
-        self.llm_client = openai.OpenAI(api_key=api_key)
+        super().__init__(mcp_client, catalog_cache)
+        # Async client on the shared connection pool, so queries never block the event loop
+        self.llm_client = openai.AsyncOpenAI(api_key=api_key, http_client=get_shared_http_client())
         self.model = model
     
     async def format_tools(self, tools: List[ToolDef]) -> List[Dict[str, Any]]:
@@ -34,7 +36,7 @@ class OpenAIBridge(LLMBridge):
         Returns:
             List of tools in OpenAI format
         """
-        return to_openai_format(tools)
+        return self._convert_tools(tools, "openai").schemas
     
     async def submit_query(self, query: str, formatted_tools: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Submit a query to OpenAI with the formatted tools.
@@ -48,7 +50,7 @@ class OpenAIBridge(LLMBridge):
         """
         messages = [{"role": "user", "content": query}]
         
-        response = self.llm_client.chat.completions.create(
+        response = await self.llm_client.chat.completions.create(
             model=self.model,
             messages=messages,
             tools=formatted_tools,
@@ -57,23 +59,109 @@ class OpenAIBridge(LLMBridge):
         
         return response
     
-    async def parse_tool_call(self, llm_response: Any) -> Optional[Dict[str, Any]]:
-        """Parse the OpenAI response to extract tool calls.
+    async def parse_tool_calls(self, llm_response: Any) -> List[Dict[str, Any]]:
+        """Parse the OpenAI response to extract all tool calls.
         
         Args:
             llm_response: Response from OpenAI
             
         Returns:
-            Dictionary with tool name and parameters, or None if no tool call
+            List of dictionaries with tool call id, name and parameters
         """
         message = llm_response.choices[0].message
         
         if not hasattr(message, 'tool_calls') or not message.tool_calls:
-            return None
+            return []
         
-        tool_call = message.tool_calls[0]
+        return [
+            {
+                "id": tool_call.id,
+                "name": tool_call.function.name,
+                "parameters": json.loads(tool_call.function.arguments)
+            }
+            for tool_call in message.tool_calls
+        ]
+
+    async def stream_turn(self, messages: List[Dict[str, Any]], formatted_tools: List[Dict[str, Any]]) -> AsyncIterator[Any]:
+        """Stream one OpenAI turn for the agent loop (see LLMBridge.stream_turn).
+        
+        Args:
+            messages: Conversation so far, in OpenAI format
+            formatted_tools: Tools in OpenAI format
+            
+        Returns:
+            Async iterator of AgentEvent objects followed by one TurnResult
+        """
+        stream = await self.llm_client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            tools=formatted_tools,
+            tool_choice="auto",
+            stream=True,
+            stream_options={"include_usage": True}
+        )
         
-        return {
-            "name": tool_call.function.name,
-            "parameters": json.loads(tool_call.function.arguments)
-        }
+        text_parts = []
+        calls: List[Dict[str, Any]] = []  # Accumulated raw calls by stream index
+        tool_calls: List[Dict[str, Any]] = []
+        tokens = 0
+        
+        def finish_call(raw_call: Dict[str, Any]) -> Dict[str, Any]:
+            arguments = raw_call["arguments"] or "{}"
+            try:
+                parameters = json.loads(arguments)
+            except json.JSONDecodeError:
+                print(f"Warning: Could not parse tool arguments as JSON: {arguments}")
+                parameters = {}
+            tool_call = {"id": raw_call["id"], "name": raw_call["name"], "parameters": parameters}
+            tool_calls.append(tool_call)
+            return tool_call
+        
+        async for chunk in stream:
+            if chunk.usage is not None:
+                tokens = chunk.usage.total_tokens
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            if delta.content:
+                text_parts.append(delta.content)
+                yield AgentEvent("llm_delta", 0, content=delta.content)
+            for call_delta in delta.tool_calls or []:
+                if call_delta.index >= len(calls):
+                    # A new index means every earlier call is complete: start them now
+                    for raw_call in calls[len(tool_calls):]:
+                        yield AgentEvent("tool_start", 0, tool_call=finish_call(raw_call))
+                    calls.extend({"id": None, "name": "", "arguments": ""} for _ in range(call_delta.index + 1 - len(calls)))
+                raw_call = calls[call_delta.index]
+                if call_delta.id:
+                    raw_call["id"] = call_delta.id
+                if call_delta.function is not None:
+                    raw_call["name"] += call_delta.function.name or ""
+                    raw_call["arguments"] += call_delta.function.arguments or ""
+        
+        for raw_call in calls[len(tool_calls):]:
+            yield AgentEvent("tool_start", 0, tool_call=finish_call(raw_call))
+        
+        text = "".join(text_parts)
+        assistant_message: Dict[str, Any] = {"role": "assistant", "content": text or None}
+        if calls:
+            assistant_message["tool_calls"] = [
+                {"id": raw_call["id"], "type": "function", "function": {"name": raw_call["name"], "arguments": raw_call["arguments"]}}
+                for raw_call in calls
+            ]
+        yield TurnResult(text=text, tool_calls=tool_calls, messages=[assistant_message], tokens=tokens)
+    
+    def tool_result_messages(self, tool_calls: List[Dict[str, Any]], tool_results: List[ToolInvocationResult]) -> List[Dict[str, Any]]:
+        """Return tool results as OpenAI `tool` messages.
+        
+        Args:
+            tool_calls: Tool calls of the turn
+            tool_results: Their results, in call order
+            
+        Returns:
+            One `tool` message per call
+        """
+        return [
+            {"role": "tool", "tool_call_id": tool_call["id"], "content": tool_result.content}
+            for tool_call, tool_result in zip(tool_calls, tool_results)
+        ]
@@ -0,0 +1,141 @@
+"""
+Result cache for idempotent MCP tool calls.
+
+`ToolResultCache` memoizes tool results keyed by endpoint, tool name and
+canonicalized arguments. Only tools marked cacheable are cached: tools in the
+allowlist, or (with `use_annotations`) tools whose server declares
+`readOnlyHint`. Concurrent identical calls are coalesced into one request.
+"""
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+from .client import ToolDef, ToolInvocationResult
+
+
+@dataclass
+class CacheMetrics:
+    """Counters for a ToolResultCache.
+    
+    Attributes:
+        hits: Calls answered from the cache
+        misses: Calls that went to the server
+        coalesced: Calls that joined an identical call already in flight
+        bypassed: Calls to tools that are not cacheable
+        expired: Entries dropped because their TTL ran out
+    """
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    bypassed: int = 0
+    expired: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        served = self.hits + self.coalesced + self.misses
+        return (self.hits + self.coalesced) / served if served else 0.0
+
+
+def canonical_arguments(kwargs: Dict[str, Any]) -> str:
+    """Serialize tool arguments so equal arguments always give the same string."""
+    return json.dumps(kwargs or {}, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class ToolResultCache:
+    """TTL cache with singleflight for read-only MCP tool calls (opt-in, see LLMBridge.result_cache)."""
+
+    def __init__(self, ttl: float = 300.0, allowlist: Optional[Iterable[str]] = None, use_annotations: bool = True,
+                 ttls: Optional[Dict[str, float]] = None, max_entries: int = 1024):
+        """Initialize the cache.
+        
+        Args:
+            ttl: Default seconds a result stays valid
+            allowlist: Tool names that are always cacheable
+            use_annotations: Also cache tools annotated with `readOnlyHint: true`
+            ttls: Per-tool TTL overrides by tool name
+            max_entries: Maximum cached results (least recently used are dropped)
+        """
+        self.ttl = ttl
+        self.allowlist = set(allowlist or ())
+        self.use_annotations = use_annotations
+        self.ttls = dict(ttls or {})
+        self.max_entries = max_entries
+        self.metrics = CacheMetrics()
+        self._entries: "OrderedDict[Tuple[str, str, str], Tuple[float, ToolInvocationResult]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, str, str], asyncio.Future] = {}
+
+    def is_cacheable(self, tool_name: str, tool: Optional[ToolDef] = None) -> bool:
+        """Whether results of this tool may be cached.
+        
+        Args:
+            tool_name: Name the tool is called by
+            tool: Its ToolDef, if known (for annotations)
+            
+        Returns:
+            True if the tool is allowlisted or annotated read-only
+        """
+        if tool_name in self.allowlist:
+            return True
+        if not self.use_annotations or tool is None:
+            return False
+        annotations = (tool.metadata or {}).get("annotations") or {}
+        return annotations.get("readOnlyHint") is True
+
+    def invalidate(self, endpoint: Optional[str] = None, tool_name: Optional[str] = None):
+        """Drop cached results, optionally only for one endpoint and/or tool."""
+        for key in [key for key in self._entries
+                    if (endpoint is None or key[0] == endpoint) and (tool_name is None or key[1] == tool_name)]:
+            del self._entries[key]
+
+    async def get_or_call(self, endpoint: str, tool_name: str, kwargs: Dict[str, Any],
+                          call: Callable[[], Awaitable[ToolInvocationResult]]) -> ToolInvocationResult:
+        """Return a cached result, join an identical in-flight call, or run `call`.
+        
+        Error results are returned but not cached.
+        
+        Args:
+            endpoint: Endpoint that owns the tool
+            tool_name: Tool name
+            kwargs: Tool arguments
+            call: Coroutine function performing the real invocation
+            
+        Returns:
+            ToolInvocationResult
+        """
+        key = (endpoint, tool_name, canonical_arguments(kwargs))
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, result = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.metrics.hits += 1
+                return result
+            del self._entries[key]
+            self.metrics.expired += 1
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.metrics.coalesced += 1
+            return await asyncio.shield(inflight)  # A cancelled waiter must not cancel the shared call
+
+        self.metrics.misses += 1
+        task = asyncio.ensure_future(call())
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._finish(key, tool_name, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Tuple[str, str, str], tool_name: str, task: asyncio.Future):
+        """Store a finished call's result (successes only) and release its singleflight slot."""
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        result = task.result()
+        if result.error_code != 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttls.get(tool_name, self.ttl), result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,256 @@
+"""
+Multi-endpoint MCP tool router.
+
+`MCPRouter` fronts several MCP servers with the same interface as `MCPClient`
+(`list_tools`, `invoke_tool`, async context manager), so it can be handed to any
+LLM bridge. Tool listing fans out to all endpoints concurrently with a timeout,
+the catalogs are merged with name-collision handling, and each call is
+dispatched to the owning endpoint's pooled session.
+"""
+
+import asyncio
+import re
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+from .client import MCPClient, ToolDef, ToolInvocationResult
+
+# Provider tool names must match ^[a-zA-Z0-9_-]{1,64}$
+_TOOL_NAME_INVALID = re.compile(r"[^a-zA-Z0-9_-]")
+_MAX_TOOL_NAME = 64
+
+
+@dataclass
+class EndpointMetrics:
+    """Latency and error counters for one endpoint.
+    
+    Attributes:
+        calls: Completed requests (list_tools and invoke_tool)
+        errors: Requests that raised or returned an error result
+        timeouts: list_tools requests that hit the router's timeout
+        total_latency: Sum of request latencies in seconds
+        last_latency: Latency of the most recent request in seconds
+        last_error: Message of the most recent failure
+    """
+    calls: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    total_latency: float = 0.0
+    last_latency: float = 0.0
+    last_error: Optional[str] = None
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.calls if self.calls else 0.0
+
+    def record(self, latency: float, error: Optional[str] = None):
+        self.calls += 1
+        self.total_latency += latency
+        self.last_latency = latency
+        if error is not None:
+            self.errors += 1
+            self.last_error = error
+
+
+def endpoint_alias(endpoint: str) -> str:
+    """Derive a short tool-name-safe alias from an endpoint URL (host and port)."""
+    parsed = urlparse(endpoint)
+    alias = parsed.hostname or "mcp"
+    if parsed.port:
+        alias = f"{alias}_{parsed.port}"
+    return _TOOL_NAME_INVALID.sub("_", alias)
+
+
+class MCPRouter:
+    """Routes tool listing and invocation across several MCP endpoints.
+    
+    Use it like an MCPClient::
+
+        async with MCPRouter({"docs": "http://a:8000/sse", "search": "http://b:8000/sse"}) as router:
+            tools = await router.list_tools()
+            result = await router.invoke_tool("search", {"query": "..."})
+    
+    When two endpoints expose the same tool name, the endpoint that listed it
+    first keeps the plain name (the one configured first, if both answer in
+    the same listing) and the others are exposed as `<alias>__<name>`
+    (collision="prefix"), or dropped (collision="first").
+    
+    Routed names are sticky: once given to an endpoint's tool, a name is never
+    handed to another endpoint, even if the first owner drops out or an
+    endpoint configured earlier answers later. The route map is stored with
+    the cached catalog (see `route_map`/`restore_routes`), so names an LLM got
+    from a persisted catalog keep their owner across restarts; a cached name
+    whose owner no longer matches is rejected rather than sent elsewhere.
+    """
+
+    def __init__(self, endpoints: Union[Dict[str, Union[str, MCPClient]], List[Union[str, MCPClient]]],
+                 list_timeout: float = 10.0, collision: str = "prefix"):
+        """Initialize the router.
+        
+        Args:
+            endpoints: Endpoint URLs or MCPClients, either as a list or as an
+                {alias: endpoint} dict (aliases prefix colliding tool names)
+            list_timeout: Seconds to wait for each endpoint's tool list
+            collision: "prefix" or "first" (see class docstring)
+        """
+        if collision not in ("prefix", "first"):
+            raise ValueError(f"Unknown collision mode: {collision}")
+        items = list(endpoints.items()) if isinstance(endpoints, dict) else [(None, endpoint) for endpoint in endpoints]
+        if not items:
+            raise ValueError("MCPRouter needs at least one endpoint")
+
+        self.clients: Dict[str, MCPClient] = {}
+        self.aliases: Dict[str, str] = {}
+        for alias, endpoint in items:
+            client = endpoint if isinstance(endpoint, MCPClient) else MCPClient(endpoint)
+            self.clients[client.endpoint] = client
+            self.aliases[client.endpoint] = _TOOL_NAME_INVALID.sub("_", alias) if alias else endpoint_alias(client.endpoint)
+
+        self.endpoint = "mcp-router:" + ",".join(self.clients)  # Cache key for the merged catalog
+        self.list_timeout = list_timeout
+        self.collision = collision
+        self.metrics: Dict[str, EndpointMetrics] = {endpoint: EndpointMetrics() for endpoint in self.clients}
+        self._routes: Dict[str, Tuple[MCPClient, str]] = {}  # exposed name -> (client, server-side name), never reassigned
+        self._names: Dict[Tuple[str, str], Optional[str]] = {}  # (endpoint, server-side name) -> exposed name (None: hidden)
+        self._conflicts: Dict[str, str] = {}  # Restored names now owned by another endpoint -> their cached owner
+        self._last_tools: Dict[str, List[ToolDef]] = {}  # Last good tool list per endpoint
+
+    async def __aenter__(self) -> "MCPRouter":
+        for client in self.clients.values():
+            await client.__aenter__()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    @property
+    def pooled(self) -> bool:
+        return all(client.pooled for client in self.clients.values())
+
+    def add_tools_changed_listener(self, listener: Callable[[], None]):
+        """Register a callback for tool list changes on any endpoint."""
+        for client in self.clients.values():
+            client.add_tools_changed_listener(listener)
+
+    async def close(self):
+        """Close every endpoint's pooled session."""
+        await asyncio.gather(*(client.close() for client in self.clients.values()), return_exceptions=True)
+
+    async def _list_endpoint(self, endpoint: str, client: MCPClient) -> List[ToolDef]:
+        """List one endpoint's tools, falling back to its last good list on error or timeout."""
+        start = time.perf_counter()
+        try:
+            tools = await asyncio.wait_for(client.list_tools(), timeout=self.list_timeout)
+        except asyncio.TimeoutError:
+            self.metrics[endpoint].timeouts += 1
+            self.metrics[endpoint].record(time.perf_counter() - start, f"list_tools timed out after {self.list_timeout}s")
+            print(f"Warning: {endpoint} did not list its tools within {self.list_timeout}s; using its last known tools")
+            return self._last_tools.get(endpoint, [])
+        except Exception as e:
+            self.metrics[endpoint].record(time.perf_counter() - start, str(e))
+            print(f"Warning: could not list tools from {endpoint}: {e}")
+            return self._last_tools.get(endpoint, [])
+        self.metrics[endpoint].record(time.perf_counter() - start)
+        self._last_tools[endpoint] = tools
+        return tools
+
+    async def list_tools(self) -> List[ToolDef]:
+        """List the merged tools of all endpoints.
+        
+        Endpoints are queried concurrently; one that fails or exceeds
+        `list_timeout` contributes its last known tools instead of stalling
+        the whole catalog.
+        
+        Returns:
+            List of ToolDef objects; `name` is the routed name, `identifier`
+            the server-side name and `metadata["endpoint"]` the owner
+        """
+        endpoints = list(self.clients)
+        results = await asyncio.gather(*(self._list_endpoint(endpoint, self.clients[endpoint]) for endpoint in endpoints))
+
+        listed = [(endpoint, tool) for endpoint, tools in zip(endpoints, results) for tool in tools]
+        # Names already routed keep their owner; new tools are named in configured endpoint order
+        for endpoint, tool in listed:
+            if (endpoint, tool.name) not in self._names:
+                self._names[(endpoint, tool.name)] = self._assign_name(endpoint, tool.name)
+
+        merged: List[ToolDef] = []
+        for endpoint, tool in listed:
+            name = self._names[(endpoint, tool.name)]
+            if name is None:
+                continue
+            metadata = dict(tool.metadata or {}, endpoint=endpoint)
+            merged.append(replace(tool, name=name, identifier=tool.name, metadata=metadata))
+        return merged
+
+    def _assign_name(self, endpoint: str, server_name: str) -> Optional[str]:
+        """Pick the routed name for a tool seen for the first time (None if it is hidden)."""
+        name = server_name
+        if name in self._routes:
+            if self.collision == "first":
+                print(f"Warning: tool '{server_name}' from {endpoint} hidden by another endpoint")
+                return None
+            name = f"{self.aliases[endpoint]}__{server_name}"[:_MAX_TOOL_NAME]
+            if name in self._routes:
+                print(f"Warning: tool '{server_name}' from {endpoint} collides even with its prefix; skipped")
+                return None
+        self._routes[name] = (self.clients[endpoint], server_name)
+        return name
+
+    def route_map(self) -> Dict[str, List[str]]:
+        """Return the routes assigned so far as {routed name: [endpoint, server-side name]}."""
+        return {name: [client.endpoint, server_name] for name, (client, server_name) in self._routes.items()}
+
+    def restore_routes(self, routes: Dict[str, List[str]]):
+        """Adopt a route map saved with a cached catalog (see ToolCatalogCache).
+        
+        Names this router has not assigned yet get their cached owner. A cached
+        name that is already routed to a different endpoint is recorded as a
+        conflict: invoking it fails instead of reaching the wrong server.
+        """
+        for name, (endpoint, server_name) in routes.items():
+            if endpoint not in self.clients:
+                continue  # Endpoint no longer configured
+            current = self._routes.get(name)
+            if current is None and (endpoint, server_name) not in self._names:
+                self._routes[name] = (self.clients[endpoint], server_name)
+                self._names[(endpoint, server_name)] = name
+            elif current is not None and (current[0].endpoint, current[1]) != (endpoint, server_name):
+                self._conflicts[name] = endpoint
+
+    def route(self, tool_name: str) -> Optional[Tuple[str, str]]:
+        """Return (endpoint, server-side tool name) for a routed tool name, if known."""
+        target = self._routes.get(tool_name)
+        return (target[0].endpoint, target[1]) if target else None
+
+    async def invoke_tool(self, tool_name: str, kwargs: Dict[str, Any]) -> ToolInvocationResult:
+        """Invoke a tool on the endpoint that owns it
+        
+        Args:
+            tool_name: Routed tool name (as returned by list_tools)
+            kwargs: Dictionary of parameters to pass to the tool
+            
+        Returns:
+            ToolInvocationResult containing the tool's response
+        """
+        if not self._routes:
+            await self.list_tools()
+        if tool_name in self._conflicts:
+            return ToolInvocationResult(
+                content=f"Tool '{tool_name}' from a cached catalog belonged to {self._conflicts[tool_name]}, "
+                        f"but that name is now routed elsewhere; refresh the tool list", error_code=1)
+        target = self._routes.get(tool_name)
+        if target is None:
+            return ToolInvocationResult(content=f"Unknown tool: {tool_name}", error_code=1)
+
+        client, server_name = target
+        metrics = self.metrics[client.endpoint]
+        start = time.perf_counter()
+        try:
+            result = await client.invoke_tool(server_name, kwargs)
+        except Exception as e:
+            metrics.record(time.perf_counter() - start, str(e))
+            raise
+        metrics.record(time.perf_counter() - start, result.content[:200] if result.error_code else None)
+        return result
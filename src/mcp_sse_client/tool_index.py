@@ -0,0 +1,162 @@
+"""
+Local tool retrieval for shrinking the tool list sent to the LLM.
+
+`BM25ToolIndex` ranks ToolDefs against a query with Okapi BM25 over the tool
+name, description and parameter names/descriptions. `ToolPrefilter` keeps one
+index per catalog version and picks the top-k tools for a query, falling back
+to the full tool list when the match is weak.
+"""
+
+import math
+import re
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from .client import ToolDef
+
+_WORD = re.compile(r"[A-Za-z0-9]+")
+_CAMEL = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+_STOPWORDS = frozenset(
+    "a an and are as at be by can for from get give how i in into is it me my of on or please show "
+    "some tell that the this to up use what when where which with you your".split()
+)
+_NAME_WEIGHT = 3  # Tool names are short and precise: count their terms several times
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with snake/camel case split, stopwords dropped and plurals folded."""
+    tokens = []
+    for word in _WORD.findall(_CAMEL.sub(" ", text or "")):
+        word = word.lower()
+        if word in _STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        tokens.append(word)
+    return tokens
+
+
+def _tool_terms(tool: ToolDef) -> List[str]:
+    terms = tokenize(tool.name.replace("_", " ").replace("-", " ")) * _NAME_WEIGHT
+    terms += tokenize(tool.description)
+    for param in tool.parameters:
+        terms += tokenize(param.name.replace("_", " "))
+        terms += tokenize(param.description)
+    return terms
+
+
+class BM25ToolIndex:
+    """Okapi BM25 index over a fixed list of tools."""
+
+    def __init__(self, tools: List[ToolDef], k1: float = 1.5, b: float = 0.75):
+        """Build the index.
+        
+        Args:
+            tools: Tools to index (positions are kept, see rank)
+            k1: BM25 term-frequency saturation
+            b: BM25 length normalization
+        """
+        self.tools = tools
+        self.k1 = k1
+        self.b = b
+        self._term_freqs: List[Counter] = [Counter(_tool_terms(tool)) for tool in tools]
+        self._lengths = [sum(freqs.values()) for freqs in self._term_freqs]
+        self._avg_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+        doc_freq: Counter = Counter()
+        for freqs in self._term_freqs:
+            doc_freq.update(freqs.keys())
+        count = len(tools)
+        self._idf: Dict[str, float] = {
+            term: math.log(1 + (count - df + 0.5) / (df + 0.5)) for term, df in doc_freq.items()
+        }
+        # Inverted index: term -> [(tool position, term frequency)]
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        for position, freqs in enumerate(self._term_freqs):
+            for term, freq in freqs.items():
+                self._postings.setdefault(term, []).append((position, freq))
+
+    def rank(self, query: str, k: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Score tools against a query.
+        
+        Args:
+            query: User query
+            k: Return only the k best (None: every tool with a positive score)
+            
+        Returns:
+            (tool position, score) pairs, best first
+        """
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            idf = self._idf.get(term)
+            if idf is None:
+                continue
+            for position, freq in self._postings[term]:
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[position] / self._avg_length)
+                scores[position] = scores.get(position, 0.0) + idf * freq * (self.k1 + 1) / (freq + norm)
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:k] if k is not None else ranked
+
+
+@dataclass
+class PrefilterResult:
+    """Tools chosen for one query.
+    
+    Attributes:
+        indices: Positions of the chosen tools in the full tool list, in list order
+        scores: BM25 score per chosen position (empty on fallback)
+        fallback: True if the full list was kept because the match was weak
+    """
+    indices: List[int]
+    scores: Dict[int, float]
+    fallback: bool
+
+
+class ToolPrefilter:
+    """Picks the top-k tools per query, with an index built once per catalog version."""
+
+    def __init__(self, top_k: int = 8, min_score: float = 2.0, min_tools: int = 16, max_indexes: int = 8):
+        """Initialize the prefilter.
+        
+        Args:
+            top_k: Tools to keep per query
+            min_score: Fall back to all tools when the best score is below this
+            min_tools: Catalogs with at most this many tools are never filtered
+            max_indexes: Catalog versions to keep indexes for
+        """
+        self.top_k = top_k
+        self.min_score = min_score
+        self.min_tools = min_tools
+        self.max_indexes = max_indexes
+        self._indexes: "OrderedDict[str, BM25ToolIndex]" = OrderedDict()
+
+    def index_for(self, tools: List[ToolDef], version: str) -> BM25ToolIndex:
+        """Return the index for a catalog version, building it on first use."""
+        index = self._indexes.get(version)
+        if index is None:
+            index = BM25ToolIndex(tools)
+            self._indexes[version] = index
+            if len(self._indexes) > self.max_indexes:
+                self._indexes.popitem(last=False)
+        else:
+            self._indexes.move_to_end(version)
+        return index
+
+    def select(self, query: str, tools: List[ToolDef], version: str) -> PrefilterResult:
+        """Choose the tools to send for a query.
+        
+        Args:
+            query: User query
+            tools: Full tool list
+            version: Catalog version (content hash) of `tools`
+            
+        Returns:
+            PrefilterResult with tool positions in their original order
+        """
+        everything = PrefilterResult(indices=list(range(len(tools))), scores={}, fallback=True)
+        if len(tools) <= max(self.min_tools, self.top_k):
+            return everything
+        ranked = self.index_for(tools, version).rank(query, self.top_k)
+        if not ranked or ranked[0][1] < self.min_score:
+            return everything
+        scores = dict(ranked)
+        return PrefilterResult(indices=sorted(scores), scores=scores, fallback=False)
@@ -0,0 +1,3 @@
+from .chat_server import ChatServer
+
+__all__ = ['ChatServer']
@@ -0,0 +1,181 @@
+import asyncio
+import json
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+from aiohttp import web
+from ..features.controllers import MainController
+
+class ChatServer:
+    """OpenAI-compatible HTTP front end for MainController.
+
+    Exposes `/v1/chat/completions` (plain and `stream: true`) and `/v1/models`.
+    Requests carrying a session id (`X-Session-Id` header or the `user` field)
+    are routed to a per-session ChatManager, so the server keeps the
+    conversation and only the last user message of the request is used.
+    Requests without a session id are forwarded statelessly. Everything runs on
+    one asyncio loop and shares the controller's pooled APIClient.
+    """
+    def __init__(self, controller: MainController):
+        self.controller = controller
+        self.settings = controller.settings
+        self._session_locks: Dict[str, asyncio.Lock] = {}
+
+    def create_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self.handle_chat_completions)
+        app.router.add_get("/v1/models", self.handle_models)
+        app.on_startup.append(self._on_startup)
+        app.on_cleanup.append(self._on_cleanup)
+        return app
+
+    async def _on_startup(self, app: web.Application):
+        # Hot-reload settings.json (model, provider, rate limit) while serving
+        self._settings_watch_task = asyncio.ensure_future(self.settings.watch())
+
+    async def _on_cleanup(self, app: web.Application):
+        self._settings_watch_task.cancel()
+        await self.controller.aclose()
+
+    # --- Handlers ---
+
+    async def handle_models(self, request: web.Request) -> web.Response:
+        model = self._default_model()
+        return web.json_response({
+            "object": "list",
+            "data": [{"id": model, "object": "model", "created": 0, "owned_by": "openai-personal-cli"}]
+        })
+
+    async def handle_chat_completions(self, request: web.Request) -> web.StreamResponse:
+        try:
+            body = await request.json()
+        except json.JSONDecodeError:
+            return self._error_response(400, "Request body must be valid JSON", "invalid_request_error")
+
+        messages = body.get("messages") if isinstance(body, dict) else None
+        if not isinstance(messages, list) or not messages:
+            return self._error_response(400, "'messages' must be a non-empty list", "invalid_request_error")
+
+        session_id = request.headers.get("X-Session-Id") or body.get("user")
+        stream = bool(body.get("stream"))
+
+        if session_id:
+            user_input = self._last_user_content(messages)
+            if user_input is None:
+                return self._error_response(400, "Session requests need a final user message with text content", "invalid_request_error")
+            lock = self._session_lock(str(session_id))
+            async with lock: # Keep each session's history consistent under concurrent requests
+                chat_manager = self.controller.get_session_chat_manager(str(session_id))
+                model = self._default_model()
+                if stream:
+                    return await self._stream(request, model, chat_manager.stream_response(user_input))
+                content = await chat_manager.get_response(user_input)
+        else:
+            model = str(body.get("model") or self._default_model())
+            temperature_setting = body.get("temperature")
+            temperature = float(temperature_setting) if isinstance(temperature_setting, (float, int)) else self.settings.snapshot.chat_temperature
+            api_client = self.controller.api_client
+            if stream:
+                return await self._stream(request, model, api_client.chat_completion_stream(messages, model, temperature))
+            response_json = await api_client.chat_completion(messages, model, temperature)
+            if response_json is None:
+                return self._error_response(502, "Upstream provider request failed", "upstream_error")
+            return web.json_response(response_json) # Already in OpenAI format
+
+        if content is None:
+            return self._error_response(502, "Upstream provider request failed", "upstream_error")
+        return web.json_response(self._completion_body(model, content))
+
+    # --- Helpers ---
+
+    async def _stream(self, request: web.Request, model: str, deltas) -> web.StreamResponse:
+        """Relay content deltas as OpenAI `chat.completion.chunk` server-sent events.
+
+        The status line is sent only once the first delta (or the end of the
+        stream) arrives, so an upstream failure before that becomes a 502. A
+        failure after streaming started is reported as an `error` event.
+        """
+        deltas = deltas.__aiter__()
+        try:
+            first: Optional[str] = await deltas.__anext__()
+        except StopAsyncIteration:
+            first = None # Empty reply
+        except Exception as e:
+            return self._error_response(502, f"Upstream provider request failed: {e}", "upstream_error")
+
+        response = web.StreamResponse(headers={
+            "Content-Type": "text/event-stream",
+            "Cache-Control": "no-cache",
+        })
+        await response.prepare(request)
+
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+
+        async def send(delta: Dict[str, Any], finish_reason: Optional[str] = None):
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+            }
+            await response.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+
+        await send({"role": "assistant"})
+        if first is not None:
+            await send({"content": first})
+            while True:
+                try:
+                    delta = await deltas.__anext__()
+                except StopAsyncIteration:
+                    break
+                except Exception as e:
+                    error = {"error": {"message": f"Upstream stream failed: {e}", "type": "upstream_error"}}
+                    await response.write(f"data: {json.dumps(error, ensure_ascii=False)}\n\n".encode("utf-8"))
+                    await response.write_eof()
+                    return response
+                await send({"content": delta})
+        await send({}, finish_reason="stop")
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+    def _completion_body(self, model: str, content: str) -> Dict[str, Any]:
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }]
+        }
+
+    def _error_response(self, status: int, message: str, error_type: str) -> web.Response:
+        return web.json_response({"error": {"message": message, "type": error_type}}, status=status)
+
+    def _last_user_content(self, messages: List[Any]) -> Optional[str]:
+        for message in reversed(messages):
+            if isinstance(message, dict) and message.get("role") == "user":
+                content = message.get("content")
+                return content if isinstance(content, str) else None
+        return None
+
+    def _session_lock(self, session_id: str) -> asyncio.Lock:
+        lock = self._session_locks.get(session_id)
+        if lock is None:
+            # Drop locks of sessions the controller has already evicted
+            if len(self._session_locks) > self.controller.max_sessions:
+                self._session_locks = {
+                    sid: l for sid, l in self._session_locks.items()
+                    if sid in self.controller.sessions or l.locked()
+                }
+            lock = asyncio.Lock()
+            self._session_locks[session_id] = lock
+        return lock
+
+    def _default_model(self) -> str:
+        return self.settings.snapshot.chat_model
@@ -1,45 +1,73 @@
-import markdown
-from markdown.extensions.fenced_code import FencedCodeExtension
-from markdown.extensions.tables import TableExtension
-from markdown.extensions.footnotes import FootnoteExtension
-from markdown.extensions.attr_list import AttrListExtension
-from markdown.extensions.def_list import DefListExtension
-from markdown.extensions.abbr import AbbrExtension
-from markdown.extensions.admonition import AdmonitionExtension
-from markdown.extensions.meta import MetaExtension
-from markdown.extensions.sane_lists import SaneListExtension
-from markdown.extensions.smarty import SmartyExtension
-from markdown.extensions.toc import TocExtension
-from markdown.extensions.codehilite import CodeHiliteExtension
-from mdx_math import MathExtension
 import re
 import html
+from typing import TYPE_CHECKING, Optional
+from ..core.disk_cache import DiskCache
+
+if TYPE_CHECKING:
+    import markdown
 
 class TextFormatter:
     """Utility class for text formatting with comprehensive Markdown and LaTeX support."""
+
+    # Optional shared cache of rendered HTML (set by the application at startup)
+    render_cache: Optional[DiskCache] = None
+
+    # Markdown converter, built on first use and reused (reset) for every conversion
+    _markdown: Optional['markdown.Markdown'] = None
+
+    @staticmethod
+    def _get_markdown() -> 'markdown.Markdown':
+        """Build the Markdown converter lazily; the extensions are slow to import."""
+        if TextFormatter._markdown is None:
+            import markdown
+            from markdown.extensions.fenced_code import FencedCodeExtension
+            from markdown.extensions.tables import TableExtension
+            from markdown.extensions.footnotes import FootnoteExtension
+            from markdown.extensions.attr_list import AttrListExtension
+            from markdown.extensions.def_list import DefListExtension
+            from markdown.extensions.abbr import AbbrExtension
+            from markdown.extensions.admonition import AdmonitionExtension
+            from markdown.extensions.meta import MetaExtension
+            from markdown.extensions.sane_lists import SaneListExtension
+            from markdown.extensions.smarty import SmartyExtension
+            from markdown.extensions.toc import TocExtension
+            from markdown.extensions.codehilite import CodeHiliteExtension
+            from mdx_math import MathExtension
+
+            # Initialize Markdown with comprehensive extensions
+            TextFormatter._markdown = markdown.Markdown(extensions=[
+                'markdown.extensions.extra',  # Includes tables, attr_list, def_list, fenced_code, footnotes, abbr, md_in_html
+                FencedCodeExtension(),
+                TableExtension(),
+                FootnoteExtension(),
+                AttrListExtension(),
+                DefListExtension(),
+                AbbrExtension(),
+                AdmonitionExtension(),
+                MetaExtension(),
+                SaneListExtension(),
+                SmartyExtension(),
+                TocExtension(permalink=True),
+                CodeHiliteExtension(guess_lang=True),
+                MathExtension(enable_dollar_delimiter=True),  # Enable $...$ for inline math
+            ])
+        return TextFormatter._markdown
     
     @staticmethod
     def format_text(text: str) -> str:
         """Convert markdown and LaTeX text to HTML with full feature support.
         Returns ONLY the core HTML content, without CSS or MathJax scripts.
         """
-        # Initialize Markdown with comprehensive extensions
-        md = markdown.Markdown(extensions=[
-            'markdown.extensions.extra',  # Includes tables, attr_list, def_list, fenced_code, footnotes, abbr, md_in_html
-            FencedCodeExtension(),
-            TableExtension(),
-            FootnoteExtension(),
-            AttrListExtension(),
-            DefListExtension(),
-            AbbrExtension(),
-            AdmonitionExtension(),
-            MetaExtension(),
-            SaneListExtension(),
-            SmartyExtension(),
-            TocExtension(permalink=True),
-            CodeHiliteExtension(guess_lang=True),
-            MathExtension(enable_dollar_delimiter=True),  # Enable $...$ for inline math
-        ])
+        cache = TextFormatter.render_cache
+        cache_key = DiskCache.make_key(text) if cache is not None else None
+        if cache is not None and cache_key is not None:
+            cached = cache.get("render", cache_key)
+            if cached is not None:
+                return cached
+
+        # Reuse the shared converter; reset() clears per-document state (footnotes, TOC, meta)
+        md = TextFormatter._get_markdown()
+        md.reset()
         
         # Pre-process LaTeX equations to protect them from markdown processing
         text = TextFormatter._protect_latex(text)
@@ -53,6 +81,9 @@ class TextFormatter:
         # REMOVED CSS and MathJax script embedding
         # The surrounding HTML structure (head, body, scripts, styles)
         # should be handled by the component displaying the content (e.g., MainWindow).
+
+        if cache is not None and cache_key is not None:
+            cache.set("render", cache_key, html_content)
         
         return html_content # Return only the core HTML content
 
@@ -0,0 +1,38 @@
+import os
+import re
+import subprocess
+import sys
+
+# Startup import budget for the GUI entry module, measured with `python -X importtime`.
+# The window (QtWebEngine), the Markdown extensions and the openai package must load on first use only.
+IMPORT_BUDGET_MS = float(os.environ.get("IMPORT_BUDGET_MS", "1000"))
+DEFERRED_MODULES = ("PyQt6.QtWebEngineWidgets", "PyQt6.QtWebEngineCore", "markdown", "mdx_math", "openai")
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+def profile_import(module: str):
+    """Import `module` in a fresh interpreter; return ({module: cumulative µs}, import order)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)", line)
+        if match:
+            cumulative[match.group(2)] = int(match.group(1))
+    return cumulative, result
+
+def test_gui_import_time():
+    cumulative, result = profile_import("src.gui.app")
+    assert "src.gui.app" in cumulative, result.stderr[-2000:]
+    loaded = [name for name in cumulative if name.split(".")[0] in DEFERRED_MODULES or name in DEFERRED_MODULES]
+    assert not loaded, f"imported at startup instead of on first use: {loaded}"
+    total_ms = cumulative["src.gui.app"] / 1000
+    assert total_ms <= IMPORT_BUDGET_MS, f"import src.gui.app took {total_ms:.0f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)"
+
+if __name__ == "__main__":
+    cumulative, _ = profile_import("src.gui.app")
+    for name, micros in sorted(cumulative.items(), key=lambda item: item[1], reverse=True)[:15]:
+        print(f"{micros / 1000:8.1f} ms  {name}")
+    test_gui_import_time()
+    print(f"OK: within {IMPORT_BUDGET_MS:.0f} ms, no deferred modules loaded")